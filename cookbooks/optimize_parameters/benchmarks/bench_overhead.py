@@ -0,0 +1,143 @@
+"""
+Measure the local overhead of OptimizeParameters: instance construction, and
+the work of a call around the LLM request (prompt, function definition,
+parsing), against building everything per instance and per call.
+
+No requests are sent: construction needs no network, and calls go to a fake
+chat model that answers with a canned function call.
+
+Usage (from the cookbooks directory of this repo):
+    python3 optimize_parameters/benchmarks/bench_overhead.py --instances 20 --calls 500
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+# Add the cookbooks directory to the Python path
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Construction only needs the keys to be set
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_groq import ChatGroq
+from langchain_openai import ChatOpenAI
+
+from optimize_parameters.optimize import OptimizeParameters, function_calling_chain
+from optimize_parameters.prompts import TAVILY_PARAMETER_PROMPT
+from optimize_parameters.schemas import TavilySearchParameters
+
+INSTRUCTION = "Find the latest research on protein folding from nature.com"
+
+ARGUMENTS = json.dumps(
+    {"query": "protein folding research", "include_domains": ["nature.com"]}
+)
+
+
+def construct_per_instance(provider: str) -> None:
+    """Build the clients and runnables of one instance from scratch, as before pooling."""
+    if provider == "groq":
+        llm = ChatGroq(
+            model="gemma2-9b-it",
+            temperature=0,
+            max_tokens=None,
+            timeout=2,
+            max_retries=0,
+            api_key=os.environ["GROQ_API_KEY"],
+        )
+        fallback_llm = ChatOpenAI(
+            model="gpt-4o-mini", temperature=0, api_key=os.environ["OPENAI_API_KEY"]
+        )
+        llm.with_structured_output(TavilySearchParameters).with_fallbacks(
+            [function_calling_chain(fallback_llm)]
+        )
+    else:
+        llm = ChatOpenAI(
+            model="gpt-4o-mini", temperature=0, api_key=os.environ["OPENAI_API_KEY"]
+        )
+        function_calling_chain(llm)
+
+
+def call_per_call_schema(llm, instruction: str) -> TavilySearchParameters:
+    """One call building the schema and function definition, as before precomputing them."""
+    prompt = TAVILY_PARAMETER_PROMPT.format(instruction=instruction)
+    function_def = {
+        "name": "optimize_tavily_parameters",
+        "description": "Optimize parameters for a Tavily API search based on a natural language instruction",
+        "parameters": TavilySearchParameters.model_json_schema(),
+    }
+    response = llm.invoke(
+        prompt,
+        functions=[function_def],
+        function_call={"name": "optimize_tavily_parameters"},
+    )
+    function_args = json.loads(response.additional_kwargs["function_call"]["arguments"])
+    return TavilySearchParameters(**function_args)
+
+
+def timed(func, repeat: int) -> float:
+    """Mean seconds per call of func over repeat calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OptimizeParameters overhead benchmark"
+    )
+    parser.add_argument("--instances", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"Construction ({args.instances} instances, mean per instance):")
+    for provider, model in [("groq", "gemma2-9b-it"), ("openai", "gpt-4o-mini")]:
+        before = timed(lambda: construct_per_instance(provider), args.instances)
+        # The first instance creates the shared clients and runnables
+        first = timed(lambda: OptimizeParameters(model=model, provider=provider), 1)
+        after = timed(
+            lambda: OptimizeParameters(model=model, provider=provider), args.instances
+        )
+        print(
+            f"  {provider:6}  per instance: {before * 1000:7.2f} ms"
+            f"  first shared: {first * 1000:7.2f} ms"
+            f"  next shared: {after * 1000:7.2f} ms  ({before / after:.0f}x)"
+        )
+
+    reply = AIMessage(
+        content="",
+        additional_kwargs={
+            "function_call": {
+                "name": "optimize_tavily_parameters",
+                "arguments": ARGUMENTS,
+            }
+        },
+    )
+    fake_llm = GenericFakeChatModel(messages=itertools.repeat(reply))
+    optimizer = OptimizeParameters(
+        model="gpt-4o-mini", provider="openai", use_cache=False, use_rules=False
+    )
+    optimizer.chain = function_calling_chain(fake_llm)
+
+    before = timed(lambda: call_per_call_schema(fake_llm, INSTRUCTION), args.calls)
+    after = timed(lambda: optimizer.optimize_parameters(INSTRUCTION), args.calls)
+    print(
+        f"\nCall overhead without the LLM request ({args.calls} calls, mean per call):"
+    )
+    print(
+        f"  per-call schema: {before * 1e6:7.0f} us"
+        f"  precomputed: {after * 1e6:7.0f} us  ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Report how often the rule-based parameter extractor skips the LLM, and how
+well its parameters agree with the LLM's on a fixture set of instructions.
+
+By default the rules are scored against LLM labels recorded with --record,
+so agreement measures how often the rules give the LLM's answer. The
+hand-written labels of the fixture (--reference schema) follow the same schema
+descriptions the rules were written from, so scoring against them only checks
+the rules for regressions. With --live, the LLM labels the instructions during
+the run instead and its latency is compared (needs the provider's API key).
+
+Usage (from the cookbooks directory of this repo):
+    python3 optimize_parameters/benchmarks/bench_rules.py --record --provider groq --model gemma2-9b-it
+    python3 optimize_parameters/benchmarks/bench_rules.py --min-confidence 0.8
+    python3 optimize_parameters/benchmarks/bench_rules.py --reference schema
+    python3 optimize_parameters/benchmarks/bench_rules.py --live --provider openai --model gpt-4o-mini
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add the cookbooks directory to the Python path
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from optimize_parameters.rules import DEFAULT, extract_parameters
+
+FIXTURES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "instructions.jsonl"
+)
+
+# LLM labels of the fixture instructions, written by --record
+LLM_LABELS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "llm_labels.jsonl"
+)
+
+# Fields compared with the reference (the query is free text)
+FIELDS = [
+    "include_domains",
+    "exclude_domains",
+    "include_images",
+    "include_image_descriptions",
+    "topic",
+    "time_range",
+]
+
+
+def normalize(parameters: dict) -> dict:
+    """Compare domain lists as sets and missing fields as their defaults."""
+    return {
+        "include_domains": sorted(parameters.get("include_domains") or []),
+        "exclude_domains": sorted(parameters.get("exclude_domains") or []),
+        "include_images": bool(parameters.get("include_images")),
+        "include_image_descriptions": bool(
+            parameters.get("include_image_descriptions")
+        ),
+        "topic": parameters.get("topic") or "general",
+        "time_range": parameters.get("time_range"),
+    }
+
+
+def label_with_llm(rows, provider: str, model: str):
+    """Replace the reference parameters with the LLM output, timing each call."""
+    from optimize_parameters.optimize import OptimizeParameters
+
+    optimizer = OptimizeParameters(
+        model=model, provider=provider, use_cache=False, use_rules=False
+    )
+    latencies = []
+    for row in rows:
+        start = time.perf_counter()
+        parameters = optimizer.optimize_parameters(row["instruction"])
+        latencies.append(time.perf_counter() - start)
+        row["expected"] = parameters.model_dump()
+    return latencies
+
+
+def record_llm_labels(rows, provider: str, model: str, path: str) -> None:
+    """Label the instructions with the LLM and save the labels for later runs."""
+    label_with_llm(rows, provider, model)
+    with open(path, "w") as f:
+        for row in rows:
+            label = {
+                "instruction": row["instruction"],
+                "provider": provider,
+                "model": model,
+                "expected": row["expected"],
+            }
+            f.write(json.dumps(label) + "\n")
+    print(f"Recorded {len(rows)} {provider}/{model} labels to {path}")
+
+
+def load_llm_labels(rows, path: str) -> str:
+    """
+    Replace the reference parameters with recorded LLM labels.
+
+    Returns:
+        str: The provider and model that recorded the labels
+    """
+    with open(path) as f:
+        labels = {
+            label["instruction"]: label
+            for label in (json.loads(line) for line in f if line.strip())
+        }
+    missing = [row["instruction"] for row in rows if row["instruction"] not in labels]
+    if missing:
+        sys.exit(
+            f"{len(missing)} fixture instructions have no LLM label in {path} "
+            f"(e.g. {missing[0]!r}), run with --record to relabel"
+        )
+    for row in rows:
+        row["expected"] = labels[row["instruction"]]["expected"]
+    return ", ".join(
+        sorted({f"{label['provider']}/{label['model']}" for label in labels.values()})
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based parameter benchmark")
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    parser.add_argument("--llm-labels", default=LLM_LABELS)
+    parser.add_argument("--reference", choices=["llm", "schema"], default="llm")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--provider", default="groq")
+    parser.add_argument("--model", default="gemma2-9b-it")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.fixtures) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    if args.record:
+        record_llm_labels(rows, args.provider, args.model, args.llm_labels)
+        return
+
+    llm_latencies = None
+    if args.live:
+        llm_latencies = label_with_llm(rows, args.provider, args.model)
+        reference = f"{args.provider}/{args.model} (live)"
+    elif args.reference == "llm":
+        if not os.path.exists(args.llm_labels):
+            parser.error(
+                f"no recorded LLM labels at {args.llm_labels}: record them with "
+                "--record (needs the provider's API key), or pass --reference "
+                "schema to check the rules against the hand-written labels"
+            )
+        reference = f"{load_llm_labels(rows, args.llm_labels)} (recorded)"
+    else:
+        reference = "hand-written schema labels (regression check, not LLM agreement)"
+
+    rule_latencies = []
+    handled = agreed = 0
+    field_agreed = dict.fromkeys(FIELDS, 0)
+    # Field decisions of the rule answers: (count, agreed), by what decided them
+    decisions = {"cue": [0, 0], "default": [0, 0]}
+    all_default = 0
+    all_field_agreed = dict.fromkeys(FIELDS, 0)
+    for row in rows:
+        start = time.perf_counter()
+        result = extract_parameters(row["instruction"])
+        rule_latencies.append(time.perf_counter() - start)
+
+        actual = normalize(result.parameters.model_dump())
+        expected = normalize(row["expected"])
+        mismatches = [field for field in FIELDS if actual[field] != expected[field]]
+        for field in FIELDS:
+            all_field_agreed[field] += field not in mismatches
+
+        is_handled = result.confidence >= args.min_confidence
+        if is_handled:
+            handled += 1
+            agreed += not mismatches
+            for field in FIELDS:
+                field_agreed[field] += field not in mismatches
+                source = (
+                    "default" if result.field_confidence[field] == DEFAULT else "cue"
+                )
+                decisions[source][0] += 1
+                decisions[source][1] += field not in mismatches
+            all_default += all(
+                result.field_confidence[field] == DEFAULT for field in FIELDS
+            )
+        if args.verbose or (is_handled and mismatches):
+            marker = "!!" if is_handled and mismatches else "  "
+            route = "rules" if is_handled else "llm  "
+            print(
+                f"{marker} {route} {result.confidence:.2f} {row['instruction']}"
+                + (f"  mismatches: {', '.join(mismatches)}" if mismatches else "")
+            )
+            if mismatches and args.verbose:
+                for field in mismatches:
+                    print(f"       {field}: {actual[field]!r} != {expected[field]!r}")
+
+    print(f"\nInstructions: {len(rows)}, min confidence: {args.min_confidence}")
+    print(f"Reference: {reference}")
+    print(f"Answered by rules: {handled} ({handled / len(rows):.0%}), LLM calls saved")
+    print(f"Agreement of rule answers (all fields): {agreed / max(handled, 1):.3f}")
+    # Defaults agree whenever the reference has no value either, so they
+    # inflate the agreement of the rule answers
+    total_decisions = max(sum(count for count, _ in decisions.values()), 1)
+    print("Field decisions of rule answers (agreement):")
+    for source, (count, source_agreed) in decisions.items():
+        print(
+            f"  by {source:8} {count:4} ({count / total_decisions:.0%})"
+            f"  agreement {source_agreed / max(count, 1):.3f}"
+        )
+    print(f"Rule answers with every field at its default: {all_default}")
+    print("Per-field agreement (rule answers / all instructions):")
+    for field in FIELDS:
+        print(
+            f"  {field:27} {field_agreed[field] / max(handled, 1):.3f}"
+            f" / {all_field_agreed[field] / len(rows):.3f}"
+        )
+    print(f"Rules median latency: {statistics.median(rule_latencies) * 1e6:.0f} us")
+    if llm_latencies:
+        llm_median = statistics.median(llm_latencies)
+        # Instructions the rules answer skip the LLM call
+        mixed = sorted(
+            rule if rule_handled else rule + llm
+            for rule, llm, rule_handled in zip(
+                rule_latencies,
+                llm_latencies,
+                [
+                    extract_parameters(row["instruction"]).confidence
+                    >= args.min_confidence
+                    for row in rows
+                ],
+            )
+        )
+        print(f"LLM median latency: {llm_median * 1000:.0f} ms")
+        print(f"Rules + LLM median latency: {statistics.median(mixed) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Two-tier cache of optimized Tavily search parameters.
+
+Agents send many instructions that only differ in the entity they are about
+("latest news about Tesla", "latest news about Nvidia"). The first tier is an
+exact-match LRU on the normalized instruction. The second tier finds a cached
+instruction with the same template by nearest-neighbour search over local
+hashing embeddings, and reuses its parameters with the entity substituted
+into the query.
+
+The system prompt gives the LLM today's date, so cached parameters (e.g. a
+time range or the year in a query) are only valid on the day they were
+chosen: the cache is emptied when the date changes.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from optimize_parameters.prompts import current_date
+from optimize_parameters.schemas import TavilySearchParameters
+
+# Words, numbers and domain names of an instruction
+_token_pattern = re.compile(r"[\w][\w'.&-]*[\w]|[\w]")
+
+# Placeholder of entity-like tokens in the template embedding
+_SLOT = "<slot>"
+
+# Weight of the entities themselves in the template embedding
+ENTITY_WEIGHT = 0.2
+
+
+@dataclass
+class CacheHit:
+    """
+    Parameters served from the cache.
+
+    Attributes:
+        parameters: Parameters for the instruction
+        tier: "exact" for an exact-match hit, "semantic" for a template hit
+        similarity: Cosine similarity of the instruction templates
+        substitution: (cached entity, new entity) substituted into the query
+            of a semantic hit, or None for an exact hit
+    """
+
+    parameters: TavilySearchParameters
+    tier: str
+    similarity: float = 1.0
+    substitution: Optional[Tuple[str, str]] = None
+
+
+def tokenize(instruction: str) -> List[str]:
+    """Split an instruction into words, numbers and domain names."""
+    return _token_pattern.findall(instruction)
+
+
+def normalize_instruction(instruction: str) -> str:
+    """Normalize an instruction for exact matching (case, spacing, punctuation)."""
+    return " ".join(tokenize(instruction.lower()))
+
+
+def is_entity(token: str, position: int) -> bool:
+    """Capitalized words (except the first word) and numbers are entity-like."""
+    return any(c.isdigit() for c in token) or (position > 0 and token[0].isupper())
+
+
+def embed_instruction(tokens: List[str], dim: int) -> np.ndarray:
+    """
+    Embed the template of an instruction with feature hashing.
+
+    Entity-like tokens are masked, so instructions with the same template
+    embed close together whatever entity they are about. The entities
+    themselves are kept with a small weight, which ranks instructions that
+    share entities first (e.g. "top 10 ..." against "top 20 ...").
+
+    Args:
+        tokens: Tokens of the instruction
+        dim: Dimension of the embedding
+
+    Returns:
+        np.ndarray: L2-normalized embedding
+    """
+    words = [
+        _SLOT if is_entity(token, position) else token.lower()
+        for position, token in enumerate(tokens)
+    ]
+    features = [(word, 1.0) for word in words]
+    features += [(f"{a} {b}", 1.0) for a, b in zip(words, words[1:])]
+    features += [
+        (token.lower(), ENTITY_WEIGHT)
+        for token, word in zip(tokens, words)
+        if word == _SLOT
+    ]
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in features:
+        hashed = zlib.crc32(feature.encode("utf-8"))
+        # The sign bit halves the bias of colliding features
+        vector[hashed % dim] += weight if hashed & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def find_slot(
+    cached_tokens: List[str], tokens: List[str], max_slot_tokens: int
+) -> Optional[Tuple[str, str]]:
+    """
+    Find the one entity two instructions of the same template differ in.
+
+    Args:
+        cached_tokens: Tokens of the cached instruction
+        tokens: Tokens of the new instruction
+        max_slot_tokens: Longest entity, in tokens
+
+    Returns:
+        Optional[Tuple[str, str]]: (cached entity, new entity), or None if
+            the instructions differ in anything but one entity
+    """
+    prefix = 0
+    while (
+        prefix < min(len(cached_tokens), len(tokens))
+        and cached_tokens[prefix].lower() == tokens[prefix].lower()
+    ):
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < min(len(cached_tokens), len(tokens)) - prefix
+        and cached_tokens[-1 - suffix].lower() == tokens[-1 - suffix].lower()
+    ):
+        suffix += 1
+
+    cached_slot = cached_tokens[prefix : len(cached_tokens) - suffix]
+    slot = tokens[prefix : len(tokens) - suffix]
+    for span in (cached_slot, slot):
+        if not 0 < len(span) <= max_slot_tokens:
+            return None
+        # The span must start and end with an entity-like token
+        if not (is_entity(span[0], prefix) and is_entity(span[-1], prefix + 1)):
+            return None
+    return " ".join(cached_slot), " ".join(slot)
+
+
+def substitute_slot(
+    parameters: TavilySearchParameters, substitution: Tuple[str, str]
+) -> Optional[TavilySearchParameters]:
+    """
+    Reuse cached parameters for another entity.
+
+    Args:
+        parameters: Parameters of the cached instruction
+        substitution: (cached entity, new entity)
+
+    Returns:
+        Optional[TavilySearchParameters]: Parameters with the entity replaced
+            in the query, or None if the parameters cannot be reused (the
+            entity is not in the query, or domains were chosen for it)
+    """
+    cached_entity, entity = substitution
+    pattern = re.compile(r"\b%s\b" % re.escape(cached_entity), re.IGNORECASE)
+    query, count = pattern.subn(lambda _: entity, parameters.query)
+    if not count:
+        return None
+    compact_entity = re.sub(r"\W", "", cached_entity.lower())
+    for domain in (parameters.include_domains or []) + (
+        parameters.exclude_domains or []
+    ):
+        if compact_entity in re.sub(r"\W", "", domain.lower()):
+            return None
+    return parameters.model_copy(update={"query": query}, deep=True)
+
+
+class ParameterCache:
+    """
+    Exact-match LRU plus template nearest-neighbour cache of parameters.
+
+    Template lookups are a brute-force NumPy matrix product over the cached
+    embeddings, which takes microseconds for tens of thousands of entries.
+    Entries only live until the date in the prompt changes. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        similarity_threshold: float = 0.8,
+        dim: int = 256,
+        max_slot_tokens: int = 5,
+        candidates: int = 8,
+    ):
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Entries kept in each tier (least recently used, or
+                oldest for the template tier, are evicted)
+            similarity_threshold: Minimum cosine similarity of two templates
+            dim: Dimension of the template embeddings
+            max_slot_tokens: Longest entity substituted, in tokens
+            candidates: Nearest templates checked per lookup
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.dim = dim
+        self.max_slot_tokens = max_slot_tokens
+        self.candidates = candidates
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[str, TavilySearchParameters]" = OrderedDict()
+        self._embeddings = np.zeros((max_entries, dim), dtype=np.float32)
+        self._entries: List[Optional[Tuple[List[str], TavilySearchParameters]]] = [
+            None
+        ] * max_entries
+        self._size = 0
+        self._next = 0
+        # Prompt date the cached parameters were chosen with
+        self._date = current_date()
+
+    def get(self, instruction: str) -> Optional[CacheHit]:
+        """
+        Look up the parameters of an instruction.
+
+        Args:
+            instruction: The natural language instruction
+
+        Returns:
+            Optional[CacheHit]: The cached parameters, or None on a miss
+        """
+        key = normalize_instruction(instruction)
+        today = current_date()
+        with self._lock:
+            self._expire(today)
+            parameters = self._exact.get(key)
+            if parameters is not None:
+                self._exact.move_to_end(key)
+                self.exact_hits += 1
+                return CacheHit(parameters.model_copy(deep=True), "exact")
+
+            hit = self._get_similar(tokenize(instruction))
+            if hit is not None:
+                self.semantic_hits += 1
+            else:
+                self.misses += 1
+            return hit
+
+    def _get_similar(self, tokens: List[str]) -> Optional[CacheHit]:
+        """Find a cached instruction with the same template and reuse its parameters."""
+        if not self._size:
+            return None
+        similarities = self._embeddings[: self._size] @ embed_instruction(
+            tokens, self.dim
+        )
+        count = min(self.candidates, self._size)
+        nearest = np.argpartition(-similarities, count - 1)[:count]
+        for index in nearest[np.argsort(-similarities[nearest])]:
+            similarity = float(similarities[index])
+            if similarity < self.similarity_threshold:
+                break
+            cached_tokens, cached_parameters = self._entries[index]
+            substitution = find_slot(cached_tokens, tokens, self.max_slot_tokens)
+            if substitution is None:
+                continue
+            parameters = substitute_slot(cached_parameters, substitution)
+            if parameters is not None:
+                return CacheHit(parameters, "semantic", similarity, substitution)
+        return None
+
+    def put(
+        self,
+        instruction: str,
+        parameters: TavilySearchParameters,
+        date: Optional[str] = None,
+    ) -> None:
+        """
+        Cache the parameters the LLM chose for an instruction.
+
+        Args:
+            instruction: The natural language instruction
+            parameters: Optimized parameters for the instruction
+            date: Date in the prompt the parameters were chosen with (today if
+                None); parameters chosen on another day are not cached
+        """
+        key = normalize_instruction(instruction)
+        tokens = tokenize(instruction)
+        parameters = parameters.model_copy(deep=True)
+        today = current_date()
+        with self._lock:
+            self._expire(today)
+            if date is not None and date != today:
+                return
+            self._exact[key] = parameters
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+            self._embeddings[self._next] = embed_instruction(tokens, self.dim)
+            self._entries[self._next] = (tokens, parameters)
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def _expire(self, today: str) -> None:
+        """Remove every cached entry if they were chosen before ``today``."""
+        if today != self._date:
+            self._clear()
+            self._date = today
+
+    def _clear(self) -> None:
+        self._exact.clear()
+        self._entries = [None] * self.max_entries
+        self._size = 0
+        self._next = 0
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._clear()
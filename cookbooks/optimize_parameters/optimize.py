@@ -4,21 +4,144 @@ Main implementation of the TavilySearchTool.
 
 import json
 import os
-from typing import Optional
+import threading
+from typing import Dict, List, Optional, Tuple, Union
 
+import groq
 from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_groq import ChatGroq
 
 # from tavily import TavilyClient
 from langchain_openai import ChatOpenAI
 
-from optimize_parameters.prompts import TAVILY_PARAMETER_PROMPT
+from optimize_parameters.cache import ParameterCache
+from optimize_parameters.prompts import TAVILY_PARAMETER_PROMPT, current_date
+from optimize_parameters.rules import extract_parameters
 from optimize_parameters.schemas import (
     TavilySearchParameters,
 )
 
 load_dotenv()
 
+# Groq errors that fall back to OpenAI. Groq is called without retries and a 2s
+# timeout, so under load it times out, is rate limited or overloaded (5xx)
+# rather than slow
+FALLBACK_ERRORS = (
+    groq.APIConnectionError,
+    groq.RateLimitError,
+    groq.InternalServerError,
+)
+
+# Function definition for OpenAI function calling, built once: generating the
+# JSON schema takes longer than the rest of a call's local work
+OPTIMIZE_FUNCTION = {
+    "name": "optimize_tavily_parameters",
+    "description": "Optimize parameters for a Tavily API search based on a natural language instruction",
+    "parameters": TavilySearchParameters.model_json_schema(),
+}
+
+# Chat models and their parameter runnables, shared by every OptimizeParameters
+# instance by (provider, model, API key). Each model holds its HTTP connection
+# pool, creating a Groq client takes ~100ms, and structured output regenerates
+# the JSON schema
+_chat_models: Dict[Tuple[str, str, str], BaseChatModel] = {}
+_parameter_chains: Dict[Tuple[str, str, str], Runnable] = {}
+_chat_models_lock = threading.RLock()
+
+
+def get_chat_model(provider: str, model: str, api_key: str) -> BaseChatModel:
+    """
+    Get the shared chat model of a provider, creating it on first use.
+
+    Args:
+        provider: Model provider - either "openai" or "groq"
+        model: Model name to use
+        api_key: The provider API key
+
+    Returns:
+        BaseChatModel: The chat model
+    """
+    key = (provider, model, api_key)
+    with _chat_models_lock:
+        if key not in _chat_models:
+            if provider == "groq":
+                _chat_models[key] = ChatGroq(
+                    model=model,
+                    temperature=0,
+                    max_tokens=None,
+                    timeout=2,
+                    max_retries=0,
+                    api_key=api_key,
+                )
+            else:
+                _chat_models[key] = ChatOpenAI(
+                    model=model, temperature=0, api_key=api_key
+                )
+        return _chat_models[key]
+
+
+def get_parameter_chain(provider: str, model: str, api_key: str) -> Runnable:
+    """
+    Get the shared runnable from a prompt to TavilySearchParameters of a chat model.
+
+    Groq models use structured output, OpenAI models use function calling.
+
+    Args:
+        provider: Model provider - either "openai" or "groq"
+        model: Model name to use
+        api_key: The provider API key
+
+    Returns:
+        Runnable: Runnable from a prompt to TavilySearchParameters
+    """
+    key = (provider, model, api_key)
+    with _chat_models_lock:
+        if key not in _parameter_chains:
+            llm = get_chat_model(provider, model, api_key)
+            if provider == "groq":
+                _parameter_chains[key] = llm.with_structured_output(
+                    TavilySearchParameters
+                )
+            else:
+                _parameter_chains[key] = function_calling_chain(llm)
+        return _parameter_chains[key]
+
+
+def parse_function_call(response: AIMessage) -> TavilySearchParameters:
+    """
+    Parse the parameters from an OpenAI function call.
+
+    Args:
+        response: The LLM response with the function call
+
+    Returns:
+        TavilySearchParameters: The parameters
+    """
+    # Extract and parse the function arguments
+    function_args = json.loads(response.additional_kwargs["function_call"]["arguments"])
+
+    # Convert to a Pydantic model
+    return TavilySearchParameters(**function_args)
+
+
+def function_calling_chain(llm: ChatOpenAI) -> Runnable:
+    """
+    Create a runnable that asks an OpenAI model for the parameters with function calling.
+
+    Args:
+        llm: The OpenAI chat model
+
+    Returns:
+        Runnable: Runnable from a prompt to TavilySearchParameters
+    """
+    return llm.bind(
+        functions=[OPTIMIZE_FUNCTION],
+        function_call={"name": OPTIMIZE_FUNCTION["name"]},
+    ) | RunnableLambda(parse_function_call)
+
 
 class OptimizeParameters:
     """
@@ -30,6 +153,12 @@ class OptimizeParameters:
         model: str = "gemma2-9b-it",
         provider: str = "groq",
         tavily_api_key: Optional[str] = None,
+        cache: Optional[ParameterCache] = None,
+        use_cache: bool = True,
+        fallback_model: Optional[str] = "gpt-4o-mini",
+        max_concurrency: int = 10,
+        use_rules: bool = True,
+        min_rule_confidence: float = 0.8,
     ):
         """
         Initialize the TavilySearchTool.
@@ -38,9 +167,19 @@ class OptimizeParameters:
             model: Model name to use - must be a supported CHAT model by the provider (e.g., "gpt-4o-mini", "gemma2-9b-it")
             provider: Model provider - either "openai" or "groq"
             tavily_api_key: The Tavily API key (defaults to TAVILY_API_KEY env var)
+            cache: Cache of optimized parameters, e.g. shared by several tools (defaults to a new cache)
+            use_cache: Whether to serve repeated and same-template instructions from the cache
+            fallback_model: OpenAI model used when Groq times out or is rate limited (None disables the fallback, which also needs OPENAI_API_KEY)
+            max_concurrency: Maximum number of concurrent LLM calls of a batch
+            use_rules: Whether to extract the parameters of simple instructions with rules instead of the LLM
+            min_rule_confidence: Minimum confidence of the rules to skip the LLM (see optimize_parameters.rules)
         """
         self.model = model
         self.provider = provider.lower()
+        self.cache = (cache or ParameterCache()) if use_cache else None
+        self.max_concurrency = max_concurrency
+        self.use_rules = use_rules
+        self.min_rule_confidence = min_rule_confidence
         # self.tavily_api_key = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
         # Initialize the appropriate LLM client based on provider
         if self.provider == "groq":
@@ -48,20 +187,25 @@ class OptimizeParameters:
             if not groq_api_key:
                 raise ValueError("GROQ_API_KEY environment variable not set")
 
-            self.llm = ChatGroq(
-                model=model,
-                temperature=0,
-                max_tokens=None,
-                timeout=2,
-                max_retries=0,
-                api_key=groq_api_key,
-            )
+            self.llm = get_chat_model("groq", model, groq_api_key)
+            # Use structured output for Groq models
+            self.chain = get_parameter_chain("groq", model, groq_api_key)
+
+            # Groq fails fast (no retries, 2s timeout), so fall back to OpenAI
+            openai_api_key = os.getenv("OPENAI_API_KEY")
+            if fallback_model and openai_api_key:
+                self.chain = self.chain.with_fallbacks(
+                    [get_parameter_chain("openai", fallback_model, openai_api_key)],
+                    exceptions_to_handle=FALLBACK_ERRORS,
+                )
         elif self.provider == "openai":
             openai_api_key = os.getenv("OPENAI_API_KEY")
             if not openai_api_key:
                 raise ValueError("OPENAI_API_KEY environment variable not set")
 
-            self.llm = ChatOpenAI(model=model, temperature=0, api_key=openai_api_key)
+            self.llm = get_chat_model("openai", model, openai_api_key)
+            # Use function calling for OpenAI models
+            self.chain = get_parameter_chain("openai", model, openai_api_key)
         else:
             raise ValueError(
                 f"Unsupported provider: {provider}. Use 'openai' or 'groq'"
@@ -71,45 +215,156 @@ class OptimizeParameters:
         """
         Optimize Tavily search parameters based on a natural language instruction.
 
+        Simple instructions (a named site, an explicit period, news or finance
+        keywords) are answered by rules, and instructions seen before, or
+        differing from one seen before only in the entity they are about
+        ("latest news about X"), from the cache, without calling the LLM.
+
         Args:
             instruction: The natural language instruction
 
         Returns:
             TavilySearchParameters: Optimized parameters for the Tavily API
         """
-        # Create the prompt with the instruction
-        prompt = TAVILY_PARAMETER_PROMPT.format(instruction=instruction)
+        hit = self._answer_locally(instruction)
+        if hit is not None:
+            return hit
 
-        # Determine which prompting approach to use based on the provider
-        if self.provider == "groq":
-            # Use structured output for Groq models
-            response = self.llm.with_structured_output(TavilySearchParameters).invoke(
-                prompt
-            )
-            return response
-        else:
-            # Use function calling for OpenAI models
-            function_schema = TavilySearchParameters.model_json_schema()
-            function_def = {
-                "name": "optimize_tavily_parameters",
-                "description": "Optimize parameters for a Tavily API search based on a natural language instruction",
-                "parameters": function_schema,
-            }
-
-            # Call the LLM with function calling
-            response = self.llm.invoke(
-                prompt,
-                functions=[function_def],
-                function_call={"name": "optimize_tavily_parameters"},
+        date = current_date()
+        parameters = self.chain.invoke(self._prompt(instruction, date))
+        self._put_cached(instruction, parameters, date)
+        return parameters
+
+    async def aoptimize_parameters(self, instruction: str) -> TavilySearchParameters:
+        """
+        Optimize Tavily search parameters without blocking the event loop.
+
+        Args:
+            instruction: The natural language instruction
+
+        Returns:
+            TavilySearchParameters: Optimized parameters for the Tavily API
+        """
+        hit = self._answer_locally(instruction)
+        if hit is not None:
+            return hit
+
+        date = current_date()
+        parameters = await self.chain.ainvoke(self._prompt(instruction, date))
+        self._put_cached(instruction, parameters, date)
+        return parameters
+
+    def optimize_parameters_batch(
+        self, instructions: List[str]
+    ) -> List[Union[TavilySearchParameters, Exception]]:
+        """
+        Optimize the parameters of many instructions concurrently.
+
+        Args:
+            instructions: The natural language instructions
+
+        Returns:
+            List[Union[TavilySearchParameters, Exception]]: Optimized parameters,
+                or the error raised for that instruction, in input order
+        """
+        results, pending = self._start_batch(instructions)
+        if pending:
+            date = current_date()
+            prompts = [self._prompt(instruction, date) for instruction in pending]
+            outputs = self.chain.batch(
+                prompts,
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True,
             )
+            self._finish_batch(results, pending, outputs, date)
+        return [results[instruction] for instruction in instructions]
+
+    async def aoptimize_parameters_batch(
+        self, instructions: List[str]
+    ) -> List[Union[TavilySearchParameters, Exception]]:
+        """
+        Optimize the parameters of many instructions concurrently, without blocking the event loop.
+
+        Args:
+            instructions: The natural language instructions
 
-            # Extract and parse the function arguments
-            function_args = json.loads(
-                response.additional_kwargs["function_call"]["arguments"]
+        Returns:
+            List[Union[TavilySearchParameters, Exception]]: Optimized parameters,
+                or the error raised for that instruction, in input order
+        """
+        results, pending = self._start_batch(instructions)
+        if pending:
+            date = current_date()
+            prompts = [self._prompt(instruction, date) for instruction in pending]
+            outputs = await self.chain.abatch(
+                prompts,
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True,
             )
+            self._finish_batch(results, pending, outputs, date)
+        return [results[instruction] for instruction in instructions]
+
+    def _prompt(self, instruction: str, date: str) -> str:
+        """Create the prompt with the instruction and the date."""
+        return TAVILY_PARAMETER_PROMPT.format(
+            instruction=instruction, current_date=date
+        )
+
+    def _answer_locally(self, instruction: str) -> Optional[TavilySearchParameters]:
+        """Answer an instruction with the rules or the cache, if enabled and confident."""
+        if self.use_rules:
+            result = extract_parameters(instruction)
+            if result.confidence >= self.min_rule_confidence:
+                return result.parameters
+        if self.cache is None:
+            return None
+        hit = self.cache.get(instruction)
+        return hit.parameters if hit is not None else None
 
-            # Convert to a Pydantic model
-            return TavilySearchParameters(**function_args)
+    def _put_cached(
+        self, instruction: str, parameters: TavilySearchParameters, date: str
+    ) -> None:
+        """Cache the parameters the LLM chose for an instruction, if enabled."""
+        if self.cache is not None:
+            self.cache.put(instruction, parameters, date)
+
+    def _start_batch(
+        self, instructions: List[str]
+    ) -> Tuple[Dict[str, Union[TavilySearchParameters, Exception]], List[str]]:
+        """
+        Answer what the rules and the cache can of a batch.
+
+        Args:
+            instructions: The natural language instructions
+
+        Returns:
+            Tuple: Results by instruction, and the distinct instructions that
+                need the LLM
+        """
+        results = {}
+        pending = []
+        for instruction in instructions:
+            if instruction in results or instruction in pending:
+                continue
+            hit = self._answer_locally(instruction)
+            if hit is not None:
+                results[instruction] = hit
+            else:
+                pending.append(instruction)
+        return results, pending
+
+    def _finish_batch(
+        self,
+        results: Dict[str, Union[TavilySearchParameters, Exception]],
+        pending: List[str],
+        outputs: List[Union[TavilySearchParameters, Exception]],
+        date: str,
+    ) -> None:
+        """Record the LLM outputs of a batch and cache the successful ones."""
+        for instruction, output in zip(pending, outputs):
+            results[instruction] = output
+            if not isinstance(output, Exception):
+                self._put_cached(instruction, output, date)
 
     # def search_tavily(self, parameters: TavilySearchParameters) -> Dict[str, Any]:
     #     """
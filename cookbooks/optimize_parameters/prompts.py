@@ -25,18 +25,24 @@ Please optimize the following search instruction for the Tavily API:
 Analyze this instruction and determine the most effective Tavily API parameters to use.
 """
 
+
+def current_date() -> str:
+    """
+    Today's date for the system prompt.
+
+    It is read each time the prompt is formatted, so long-running workers
+    never carry the date they were started on.
+    """
+    return datetime.now().strftime("%Y-%m-%d")
+
+
 # Complete prompt template for Tavily parameter optimization
 TAVILY_PARAMETER_PROMPT = ChatPromptTemplate.from_messages(
     [
-        (
-            "system",
-            TAVILY_PARAMETER_SYSTEM_PROMPT.format(
-                current_date=datetime.now().strftime("%Y-%m-%d")
-            ),
-        ),
+        ("system", TAVILY_PARAMETER_SYSTEM_PROMPT),
         ("human", TAVILY_PARAMETER_HUMAN_PROMPT),
     ]
-)
+).partial(current_date=current_date)
 
 # # System prompt for post-processing search results
 # TAVILY_POSTPROCESSING_SYSTEM_PROMPT = """
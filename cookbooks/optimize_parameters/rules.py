@@ -0,0 +1,420 @@
+"""
+Rule-based Tavily parameter extraction for instructions that need no LLM.
+
+Most fields of TavilySearchParameters follow simple rules written out in their
+descriptions (a domain is named, a period is mentioned, images are asked for).
+The rules below apply them with compiled patterns and report how confident
+they are, so that only instructions they cannot resolve go to the LLM.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from optimize_parameters.schemas import TavilySearchParameters
+
+# Confidence of a field set by an explicit cue in the instruction
+EXPLICIT = 1.0
+
+# Confidence of a field left at its default because the instruction has no cue
+DEFAULT = 0.9
+
+# Confidence of a field set by a single keyword without a corroborating cue
+# ("sports car", "farmers market"), below the default minimum of OptimizeParameters
+WEAK = 0.6
+
+# Confidence of the query of an instruction in which no field has an explicit
+# cue. The rules only copy the instruction into the query, so instructions
+# without a field decision to skip still go to the LLM to rewrite their query
+NO_CUE = 0.5
+
+# Confidence of a field whose cue the rules cannot resolve (e.g. an
+# organization named without its domain, or "latest" without a period)
+AMBIGUOUS = 0.4
+
+_TLDS = (
+    "com|org|net|gov|edu|int|mil|io|ai|co|dev|app|info|news|tv|me|"
+    "uk|us|eu|de|fr|es|it|nl|ch|se|no|jp|cn|in|ca|au|br|il|kr|sg"
+)
+
+_domain_pattern = re.compile(
+    r"\b(?:site:)?((?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+(?:%s))\b(?![.\w])" % _TLDS,
+    re.IGNORECASE,
+)
+
+# Words shortly before a domain that exclude it. The window stops at commas
+# and conjunctions, which start another clause
+_exclusion_pattern = re.compile(
+    r"\b(?:not|except|excluding|exclude|without|avoid|avoiding|other than|"
+    r"nothing|no|ignore|ignoring)\b(?:\s+(?!(?:and|or|but)\b)[\w.]+){0,3}\s*$",
+    re.IGNORECASE,
+)
+
+# Text between two domains of one list ("twitter.com or facebook.com")
+_domain_list_separator_pattern = re.compile(r"\s*(?:,|and|or|,\s*and|,\s*or)\s*")
+
+# An organization named after "from"/"on"/"by" without its domain
+_organization_pattern = re.compile(
+    r"\b(?:from|on|by|at|via)\s+(?:the\s+)?([A-Z][\w&'-]*(?:\s+[A-Z][\w&'-]*)*)"
+)
+
+_time_range_patterns = [
+    (
+        "day",
+        re.compile(
+            r"\b(?:today|tonight|this morning|yesterday|"
+            r"(?:past|last)\s+(?:24 hours|day))\b(?!\s+(?:of|in)\b)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "week",
+        re.compile(
+            r"\b(?:this week|(?:past|last)\s+(?:week|7 days|few days|couple of days))\b"
+            r"(?!\s+(?:of|in)\b)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "month",
+        re.compile(
+            r"\b(?:this month|(?:past|last)\s+(?:month|30 days|few weeks|couple of weeks))\b"
+            r"(?!\s+(?:of|in)\b)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "year",
+        re.compile(
+            r"\b(?:this year|(?:past|last)\s+(?:year|12 months|few months))\b"
+            r"(?!\s+(?:of|in)\b)",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+# Recency words the schema leaves to judgement ("latest" may or may not mean a period)
+_recency_pattern = re.compile(
+    r"\b(?:latest|recent|recently|newest|current|currently|upcoming|"
+    r"right now|these days|(?:19|20)\d{2})\b",
+    re.IGNORECASE,
+)
+
+# Topic keywords. One keyword alone is weak evidence ("farmers market", "sports
+# car", "government grants"), so a topic is only explicit with two distinct cues
+_finance_pattern = re.compile(
+    r"\b(?:stocks?|share price|stock market|earnings|revenue|profits?|"
+    r"quarterly results|investors?|investments?|investing|ipo|dividends?|"
+    r"valuation|crypto(?:currenc(?:y|ies))?|bitcoin|ethereum|forex|"
+    r"exchange rates?|interest rates?|inflation|gdp|economy|economic|recession|"
+    r"treasur(?:y|ies)|federal reserve|nasdaq|s&p 500|dow jones|etfs?|"
+    r"funding round|market cap)\b|\$[A-Z]{1,5}\b",
+    re.IGNORECASE,
+)
+
+# Words that corroborate a finance keyword but do not imply finance alone
+_finance_corroboration_pattern = re.compile(
+    r"\b(?:prices?|trading|traded|analysts?|quarterly|forecasts?|outlook|"
+    r"shares|markets?|bonds?|portfolio|performance|movement)\b",
+    re.IGNORECASE,
+)
+
+_news_pattern = re.compile(
+    r"\b(?:elections?|politics|political|president(?:ial)?|prime minister|"
+    r"senate|congress|parliament|minister|war|ceasefire|protests?|summit|"
+    r"legislation|supreme court|tournament|championship|world cup|olympics|"
+    r"nba|nfl|mlb|nhl|premier league|fifa|super bowl|playoffs|breaking news)\b",
+    re.IGNORECASE,
+)
+
+# Words that corroborate a news keyword but do not imply news alone
+_news_corroboration_pattern = re.compile(
+    r"\b(?:news|headlines|results|votes?|voting|campaign|candidates?|debate|"
+    r"bill|reform|government|sports?|match|game|scores?|final|highlights|"
+    r"schedule|standings|coverage|announced|today|yesterday)\b",
+    re.IGNORECASE,
+)
+
+# "News" without a politics, sports or finance cue is left to judgement
+_generic_news_pattern = re.compile(r"\b(?:news|headlines)\b", re.IGNORECASE)
+
+_image_nouns = (
+    r"(?:images?|pictures?|photos?|photographs?|pics|visuals?|diagrams?|"
+    r"illustrations?|infographics?|screenshots?)"
+)
+
+_images_pattern = re.compile(r"\b%s\b" % _image_nouns, re.IGNORECASE)
+
+# Image nouns phrased as a request for images ("photos of", "with pictures"),
+# rather than as the subject of the search ("stock photo licensing")
+_image_request_pattern = re.compile(
+    r"^\s*(?:\w+\s+){0,2}%s\b|\b%s\s+(?:of|from|about|showing)\b|"
+    r"\b(?:with|show me|include|including|and)\s+(?:\w+\s+)?%s\b"
+    % (_image_nouns, _image_nouns, _image_nouns),
+    re.IGNORECASE,
+)
+
+# Appearance questions may or may not want images ("what a healthy diet looks like")
+_appearance_pattern = re.compile(r"\b(?:looks?|looked) like\b", re.IGNORECASE)
+
+_no_images_pattern = re.compile(
+    r"\b(?:no|without|not|don't|dont|skip)\s+(?:\w+\s+)?"
+    r"(?:images?|pictures?|photos?|visuals?)\b",
+    re.IGNORECASE,
+)
+
+_image_descriptions_pattern = re.compile(
+    r"\b(?:describe|descriptions?|described|captions?|captioned|alt text)\b",
+    re.IGNORECASE,
+)
+
+# Request phrasing that does not belong in the query
+_request_pattern = re.compile(
+    r"^\s*(?:please\s+)?(?:(?:can|could|would) you\s+)?(?:please\s+)?"
+    r"(?:find(?: me)?|search(?: for)?|look up|look for|get(?: me)?|show me|"
+    r"give me|tell me(?: about)?|fetch|retrieve|research)\s+",
+    re.IGNORECASE,
+)
+
+# A domain to search named before the subject ("search nytimes.com for ...")
+_leading_domain_pattern = re.compile(
+    r"^\s*(?:please\s+)?(?:search|check|look (?:on|at|through)|browse)\s+"
+    r"(?:on\s+)?(?:site:)?(?:[a-z0-9-]+\.)+(?:%s)\b\s+(?:for|about|on)\s+" % _TLDS,
+    re.IGNORECASE,
+)
+
+# Conjunctions and punctuation left at the end of a query by removed domains
+_trailing_conjunction_pattern = re.compile(
+    r"(?:[\s,;:]*\b(?:and|or|but)\b)+[\s,;:]*$", re.IGNORECASE
+)
+
+_domain_clause_pattern = re.compile(
+    r"\s*,?\s*\b(?:but\s+)?(?:(?:not|only|nothing|excluding|except)\s+)?"
+    r"(?:from|on|at|via|using|in)?\s*(?:site:)?"
+    r"(?:[a-z0-9-]+\.)+(?:%s)\b(?:\s*(?:,|and|or)\s*(?:[a-z0-9-]+\.)+(?:%s)\b)*"
+    % (_TLDS, _TLDS),
+    re.IGNORECASE,
+)
+
+# Instructions longer than this need the LLM to condense them into a query
+MAX_QUERY_WORDS = 25
+
+
+@dataclass
+class RuleResult:
+    """
+    Parameters extracted by the rules.
+
+    Attributes:
+        parameters: The extracted parameters
+        confidence: Confidence of the least confident field
+        field_confidence: Confidence of each field
+    """
+
+    parameters: TavilySearchParameters
+    confidence: float
+    field_confidence: Dict[str, float]
+
+
+def extract_domains(instruction: str) -> Tuple[List[str], List[str], float]:
+    """
+    Find the domains an instruction restricts results to or excludes.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        Tuple[List[str], List[str], float]: Included domains, excluded domains
+            and the confidence of both
+    """
+    include_domains = []
+    exclude_domains = []
+    target = None
+    previous_end = None
+    for match in _domain_pattern.finditer(instruction):
+        domain = match.group(1).lower().removeprefix("www.")
+        between = instruction[previous_end : match.start()] if previous_end else ""
+        # The next domain of a list ("not twitter.com or facebook.com") shares
+        # the target of the first
+        if target is None or not _domain_list_separator_pattern.fullmatch(between):
+            before = instruction[max(0, match.start() - 40) : match.start()]
+            target = (
+                exclude_domains
+                if _exclusion_pattern.search(before)
+                else include_domains
+            )
+        if domain not in target:
+            target.append(domain)
+        previous_end = match.end()
+
+    # An organization named without its domain needs the LLM to find the domain
+    without_domains = _domain_pattern.sub(" ", instruction)
+    if _organization_pattern.search(without_domains):
+        return include_domains, exclude_domains, AMBIGUOUS
+    if include_domains or exclude_domains:
+        return include_domains, exclude_domains, EXPLICIT
+    return include_domains, exclude_domains, DEFAULT
+
+
+def extract_time_range(instruction: str) -> Tuple[Optional[str], float]:
+    """
+    Find the period an instruction mentions.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        Tuple[Optional[str], float]: The time range and its confidence
+    """
+    periods = {
+        period
+        for period, pattern in _time_range_patterns
+        if pattern.search(instruction)
+    }
+    if len(periods) > 1:
+        return None, AMBIGUOUS
+    if periods:
+        return periods.pop(), EXPLICIT
+    if _recency_pattern.search(instruction):
+        return None, AMBIGUOUS
+    return None, DEFAULT
+
+
+def extract_topic(instruction: str) -> Tuple[str, float]:
+    """
+    Find the search category of an instruction.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        Tuple[str, float]: The topic and its confidence
+    """
+    finance_cues = _distinct_matches(_finance_pattern, instruction)
+    news_cues = _distinct_matches(_news_pattern, instruction)
+    if finance_cues and news_cues:
+        return "general", AMBIGUOUS
+    # Corroborating words are looked for outside the keywords ("market cap")
+    if finance_cues:
+        finance_cues |= _distinct_matches(
+            _finance_corroboration_pattern, _finance_pattern.sub(" ", instruction)
+        )
+        return "finance", EXPLICIT if len(finance_cues) > 1 else WEAK
+    if news_cues:
+        news_cues |= _distinct_matches(
+            _news_corroboration_pattern, _news_pattern.sub(" ", instruction)
+        )
+        return "news", EXPLICIT if len(news_cues) > 1 else WEAK
+    if _generic_news_pattern.search(instruction):
+        return "general", AMBIGUOUS
+    return "general", DEFAULT
+
+
+def _distinct_matches(pattern: re.Pattern, instruction: str) -> Set[str]:
+    """Distinct matches of a keyword pattern, ignoring case."""
+    return {match.lower() for match in pattern.findall(instruction)}
+
+
+def extract_images(instruction: str) -> Tuple[bool, bool, float]:
+    """
+    Find whether an instruction asks for images and their descriptions.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        Tuple[bool, bool, float]: include_images, include_image_descriptions
+            and the confidence of both
+    """
+    if _no_images_pattern.search(instruction):
+        return False, False, EXPLICIT
+    if not _images_pattern.search(instruction):
+        if _appearance_pattern.search(instruction):
+            return False, False, WEAK
+        return False, False, DEFAULT
+    # Image descriptions only work with images
+    include_image_descriptions = bool(_image_descriptions_pattern.search(instruction))
+    if _image_request_pattern.search(instruction):
+        return True, include_image_descriptions, EXPLICIT
+    return True, include_image_descriptions, WEAK
+
+
+def extract_query(instruction: str) -> Tuple[str, float]:
+    """
+    Turn an instruction into a search query.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        Tuple[str, float]: The query and its confidence
+    """
+    query = _leading_domain_pattern.sub("", instruction)
+    query = _request_pattern.sub("", query)
+    # A domain removed from the middle of the query may take words of the
+    # subject with it, which the LLM has to sort out
+    removed_mid_sentence = any(
+        query[match.end() :].strip(" ,.;:!?")
+        for match in _domain_clause_pattern.finditer(query)
+        if match.group().strip()
+    )
+    query = _domain_clause_pattern.sub("", query)
+    query = _trailing_conjunction_pattern.sub("", query)
+    query = " ".join(query.split()).strip(" ,.;:!?")
+    if not query:
+        return instruction.strip(), AMBIGUOUS
+    sentences = [s for s in re.split(r"[.!?]\s+", instruction.strip()) if s]
+    if (
+        removed_mid_sentence
+        or len(query.split()) > MAX_QUERY_WORDS
+        or len(sentences) > 1
+    ):
+        return query, AMBIGUOUS
+    return query, DEFAULT
+
+
+def extract_parameters(instruction: str) -> RuleResult:
+    """
+    Extract Tavily search parameters from an instruction with rules.
+
+    Args:
+        instruction: The natural language instruction
+
+    Returns:
+        RuleResult: The parameters and how confident the rules are in them
+    """
+    query, query_confidence = extract_query(instruction)
+    include_domains, exclude_domains, domains_confidence = extract_domains(instruction)
+    time_range, time_range_confidence = extract_time_range(instruction)
+    topic, topic_confidence = extract_topic(instruction)
+    include_images, include_image_descriptions, images_confidence = extract_images(
+        instruction
+    )
+
+    if EXPLICIT not in (
+        domains_confidence,
+        time_range_confidence,
+        topic_confidence,
+        images_confidence,
+    ):
+        query_confidence = min(query_confidence, NO_CUE)
+
+    field_confidence = {
+        "query": query_confidence,
+        "include_domains": domains_confidence,
+        "exclude_domains": domains_confidence,
+        "include_images": images_confidence,
+        "include_image_descriptions": images_confidence,
+        "topic": topic_confidence,
+        "time_range": time_range_confidence,
+    }
+    parameters = TavilySearchParameters(
+        query=query,
+        include_domains=include_domains,
+        exclude_domains=exclude_domains,
+        include_images=include_images,
+        include_image_descriptions=include_image_descriptions,
+        topic=topic,
+        time_range=time_range,
+    )
+    return RuleResult(parameters, min(field_confidence.values()), field_confidence)
@@ -0,0 +1,224 @@
+"""
+Concurrent crawling of several sites with the Tavily crawl API.
+
+A crawl can take a minute, so crawling the sites one after another takes the
+sum of their latencies. crawl_many runs them concurrently, at most a few at a
+time per API key, and yields each site's result as soon as it completes, so
+multi-site research takes about as long as its slowest site.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TAVILY_CRAWL_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com") + "/crawl"
+
+# Default crawls in flight per API key, shared by every crawl_many call in the process
+DEFAULT_MAX_CONCURRENCY_PER_KEY = 4
+
+# Crawl concurrency caps, by API key
+_key_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_key_semaphores_lock = threading.Lock()
+
+
+@dataclass
+class CrawlOutcome:
+    """
+    The result of crawling one site.
+
+    Attributes:
+        url: The crawled URL
+        response: The crawl API response, or {"url", "status": "error",
+            "results": []} if the crawl failed
+        latency: Seconds from the start of the crawl request to its result
+            (None if the crawl never started)
+        error: Why the crawl failed, or None if it succeeded
+    """
+
+    url: str
+    response: Dict[str, Any] = field(default_factory=dict)
+    latency: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the crawl succeeded."""
+        return self.error is None
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        """The crawled pages."""
+        return self.response.get("results") or []
+
+
+def key_semaphore(api_key: str, max_concurrency: int) -> threading.BoundedSemaphore:
+    """
+    Get the concurrency cap of an API key, creating it on first use.
+
+    Args:
+        api_key: The Tavily API key
+        max_concurrency: Crawls in flight for the key (only used on first use)
+
+    Returns:
+        threading.BoundedSemaphore: The cap shared by every crawl with the key
+    """
+    with _key_semaphores_lock:
+        if api_key not in _key_semaphores:
+            _key_semaphores[api_key] = threading.BoundedSemaphore(max_concurrency)
+        return _key_semaphores[api_key]
+
+
+def crawl_site(
+    client: httpx.Client,
+    url: str,
+    params: Dict[str, Any],
+    api_key: str,
+    semaphore: threading.BoundedSemaphore,
+    stop: Optional[threading.Event] = None,
+) -> CrawlOutcome:
+    """
+    Crawl one site, waiting for a free slot of the API key.
+
+    Args:
+        client: HTTP client
+        url: URL to start the crawl from
+        params: Crawl API parameters besides the URL
+        api_key: The Tavily API key
+        semaphore: Concurrency cap of the API key
+        stop: Set when the crawl is no longer wanted; checked once a slot is
+            free, so an abandoned site never sends a request
+
+    Returns:
+        CrawlOutcome: The crawl result, or the error that stopped it
+    """
+    with semaphore:
+        if stop is not None and stop.is_set():
+            return CrawlOutcome(
+                url, {"url": url, "status": "error", "results": []}, error="Cancelled"
+            )
+        start = time.perf_counter()
+        try:
+            response = client.post(
+                TAVILY_CRAWL_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={"url": url, **params},
+            )
+            if response.status_code == 200:
+                return CrawlOutcome(url, response.json(), time.perf_counter() - start)
+            error = f"{response.status_code} {response.text}"
+        except (httpx.HTTPError, ValueError) as e:
+            # Network errors, timeouts and malformed response bodies
+            error = f"{type(e).__name__}: {e}"
+        return CrawlOutcome(
+            url,
+            {"url": url, "status": "error", "results": []},
+            time.perf_counter() - start,
+            error,
+        )
+
+
+def crawl_many(
+    urls: List[str],
+    params: Optional[Dict[str, Any]] = None,
+    api_key: Optional[str] = None,
+    max_concurrency_per_key: int = DEFAULT_MAX_CONCURRENCY_PER_KEY,
+    timeout: Optional[float] = None,
+    request_timeout: float = 180,
+) -> Iterator[CrawlOutcome]:
+    """
+    Crawl several sites concurrently, yielding each result as it completes.
+
+    Sites that fail or are still crawling at the timeout are yielded as
+    errors after the completed ones, so the results of the sites that
+    finished are never lost.
+
+    Args:
+        urls: URLs to start the crawls from
+        params: Crawl API parameters for every site (e.g. limit, max_depth,
+            extract_depth, select_paths)
+        api_key: The Tavily API key (defaults to TAVILY_API_KEY env var)
+        max_concurrency_per_key: Crawls in flight per API key, across all
+            crawl_many calls (set by the first call with the key)
+        timeout: Seconds to wait for all crawls (None waits for every site)
+        request_timeout: Seconds to wait for one crawl request
+
+    Yields:
+        CrawlOutcome: The result of each site, in order of completion
+    """
+    api_key = api_key or os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        raise ValueError("TAVILY_API_KEY environment variable not set")
+    params = params or {}
+    semaphore = key_semaphore(api_key, max_concurrency_per_key)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    client = httpx.Client(timeout=request_timeout)
+    # Sites beyond the cap wait in the executor's queue, where a timeout can
+    # still cancel them. Other crawl_many calls may hold slots of the key, so
+    # a worker can still wait on the semaphore; the stop event keeps it from
+    # crawling once the sites are abandoned
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(urls), max_concurrency_per_key))
+    )
+    stop = threading.Event()
+    try:
+        futures = {
+            executor.submit(
+                crawl_site, client, url, params, api_key, semaphore, stop
+            ): url
+            for url in urls
+        }
+        pending = set(futures)
+        while pending:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                yield future.result()
+
+        # Report the sites still crawling at the timeout
+        for future in pending:
+            future.cancel()
+            yield CrawlOutcome(
+                futures[future],
+                {"url": futures[future], "status": "error", "results": []},
+                error=f"Timed out after {timeout}s",
+            )
+    finally:
+        # Do not wait for crawls abandoned by a timeout or an early exit
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        client.close()
+
+
+def format_latency_report(outcomes: List[CrawlOutcome]) -> str:
+    """
+    Summarize the per-site latency and pages of crawl outcomes.
+
+    Args:
+        outcomes: The crawl outcomes
+
+    Returns:
+        str: One line per site, slowest first
+    """
+    lines = []
+    for outcome in sorted(outcomes, key=lambda o: -(o.latency or 0)):
+        latency = (
+            f"{outcome.latency:6.1f}s" if outcome.latency is not None else "     -"
+        )
+        status = f"{len(outcome.results)} pages" if outcome.ok else outcome.error
+        lines.append(f"{latency}  {outcome.url}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,143 @@
+"""
+End-to-end benchmark of the job search agent against the local mock server.
+
+Runs ``run_job_search_agent`` one company at a time and the batch path
+(``arun_job_search_batch``) with bounded concurrency, each in its own
+process with a cold cache, and reports throughput, per-company tail latency
+and peak RSS. No network access or API credits are needed.
+
+The mock enforces no quota, so the LLM rate limiter is opened up by default
+(``--rpm``/``--tpm`` restore realistic quotas).
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_agent.py --companies 20 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BENCHMARK_DIR)
+
+from mock_server import add_mock_arguments, mock_config_from_args, start_mock_server
+
+MODES = ("single", "batch")
+
+
+def run_worker(args: argparse.Namespace) -> dict:
+    """
+    Run one benchmark mode in this process against the mock at ``args.base_url``.
+
+    Returns:
+        dict: Throughput, latency percentiles, errors and peak RSS
+    """
+    os.environ.update(
+        {
+            "TAVILY_API_URL": args.base_url,
+            "OPENAI_BASE_URL": f"{args.base_url}/v1",
+            "TAVILY_API_KEY": "mock",
+            "OPENAI_API_KEY": "mock",
+            "JOB_SEARCH_CACHE_DIR": tempfile.mkdtemp(prefix="bench_agent_"),
+        }
+    )
+
+    # Add the job_search directory to the Python path
+    sys.path.append(os.path.dirname(BENCHMARK_DIR))
+
+    from src.agents.agent import arun_job_search_batch, run_job_search_agent
+    from src.utils import rate_limiter
+    from src.utils.metrics import get_metrics
+
+    rate_limiter._llm_rate_limiter = rate_limiter.TokenBucketRateLimiter(
+        args.rpm, args.tpm
+    )
+    companies = [f"Company {i}" for i in range(args.companies)]
+    errors = 0
+
+    start = time.perf_counter()
+    if args.worker == "single":
+        for company in companies:
+            result = run_job_search_agent(company, args.stream)
+            errors += bool(result.get("error"))
+    else:
+
+        async def run_batch() -> int:
+            failed = 0
+            async for result in arun_job_search_batch(
+                companies, args.concurrency, streaming=args.stream
+            ):
+                failed += bool(result.get("error"))
+            return failed
+
+        errors = asyncio.run(run_batch())
+    elapsed = time.perf_counter() - start
+
+    latency = next(
+        row
+        for row in get_metrics().summary()["observations"]
+        if row["metric"] == "company_seconds"
+    )
+    return {
+        "mode": args.worker,
+        "companies": args.companies,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": args.companies / elapsed * 60,
+        "p50": latency["p50"],
+        "p95": latency["p95"],
+        "p99": latency["p99"],
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end agent benchmark")
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--rpm", type=float, default=1_000_000)
+    parser.add_argument("--tpm", type=float, default=1_000_000_000)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    _, base_url = start_mock_server(mock_config_from_args(args))
+    print(
+        f"Mock: {args.max_pages} pages per crawl, LLM latency {args.llm_latency}s, "
+        f"jitter {args.jitter:.0%}, 429 rate {args.rate_429:.0%}"
+    )
+    print(
+        f"\n{'Mode':8}{'Companies':>10}{'Errors':>8}{'Companies/min':>15}"
+        f"{'p50 (s)':>9}{'p95 (s)':>9}{'p99 (s)':>9}{'Peak RSS':>11}"
+    )
+    for mode in args.modes:
+        # Each mode runs in a fresh process so peak RSS is measured per mode
+        command = [sys.executable, os.path.abspath(__file__), *sys.argv[1:]]
+        command += ["--worker", mode, "--base-url", base_url]
+        output = subprocess.run(
+            command, capture_output=True, text=True, check=True
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{row['mode']:8}{row['companies']:>10}{row['errors']:>8}"
+            f"{row['throughput']:>15.1f}{row['p50']:>9.2f}{row['p95']:>9.2f}"
+            f"{row['p99']:>9.2f}{row['peak_rss_mb']:>8.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare blind ``content[:4000]`` truncation with relevance windowing on the
+crawled pages of a saved result file.
+
+Reports tokens sent per page and how many job-relevant terms (requirements,
+benefits, location, ...) survive in the text sent to the LLM.
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_content_window.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add the job_search directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.config import MAX_CONTENT_TOKENS
+from src.utils.content_window import _relevance_pattern, count_tokens, window_content
+
+RESULTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "results",
+    "job_search_results.json",
+)
+
+
+def relevant_terms(text: str) -> int:
+    """Count job-relevant terms in a text."""
+    return len(_relevance_pattern.findall(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content windowing benchmark")
+    parser.add_argument("--results", default=RESULTS)
+    parser.add_argument("--max-tokens", type=int, default=MAX_CONTENT_TOKENS)
+    args = parser.parse_args()
+
+    with open(args.results) as f:
+        pages = json.load(f)["crawl_result"]["raw_content"]
+
+    rows = []
+    start = time.perf_counter()
+    for content in pages.values():
+        windowed = window_content(content, args.max_tokens)
+        truncated = content[:4000]
+        total_terms = relevant_terms(content) or 1
+        rows.append(
+            (
+                count_tokens(truncated),
+                count_tokens(windowed),
+                relevant_terms(truncated) / total_terms,
+                relevant_terms(windowed) / total_terms,
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    columns = list(zip(*rows))
+    print(f"Pages: {len(rows)}, budget: {args.max_tokens} tokens")
+    print(f"{'':24}{'content[:4000]':>16}{'windowed':>12}")
+    print(
+        f"{'Mean tokens per page':24}{statistics.mean(columns[0]):16.0f}"
+        f"{statistics.mean(columns[1]):12.0f}"
+    )
+    print(f"{'Total tokens':24}{sum(columns[0]):16,}{sum(columns[1]):12,}")
+    print(
+        f"{'Relevant terms kept':24}{statistics.mean(columns[2]):16.1%}"
+        f"{statistics.mean(columns[3]):12.1%}"
+    )
+    print(f"Windowing time: {elapsed / len(rows) * 1e3:.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
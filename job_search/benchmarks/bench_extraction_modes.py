@@ -0,0 +1,122 @@
+"""
+Compare single-posting and multi-posting extraction on the crawled pages of a
+saved result file (or on the labeled page fixtures).
+
+Always reports how many LLM requests each mode plans for the pages. With
+``--live`` both modes are run against the configured OpenAI endpoint (set
+``OPENAI_BASE_URL`` to use a mock server) with a cold extraction cache, and
+the jobs extracted per LLM call are reported.
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_extraction_modes.py [--live]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Start from a cold extraction cache so every page costs an LLM call
+os.environ["JOB_SEARCH_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_extraction_")
+
+# Add the job_search directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.extract import (
+    dedupe_postings,
+    extract_pages_multi,
+    extract_with_rate_limit,
+    pack_pages,
+)
+from src.models.schema import ExtractionStats
+from src.utils.config import LLM_MAX_CONCURRENCY, MULTI_MAX_CONTENT_TOKENS
+from src.utils.content_window import window_content
+from src.utils.event_loop import run_sync
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(
+    os.path.dirname(BENCHMARK_DIR), "results", "job_search_results.json"
+)
+FIXTURES = os.path.join(BENCHMARK_DIR, "fixtures", "labeled_pages.jsonl")
+
+
+def load_pages(path: str):
+    """Load ``(url, raw content)`` pairs from a result file or a JSONL fixture."""
+    if path.endswith(".jsonl"):
+        with open(path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [(row["url"], row["raw_content"]) for row in rows if row["is_job"]]
+    with open(path) as f:
+        raw_content = json.load(f)["crawl_result"]["raw_content"]
+    return [(url, content) for url, content in raw_content.items() if content]
+
+
+async def run_single(pages, search_query):
+    """Extract one posting per page, one request per page."""
+    stats = ExtractionStats()
+    semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    job_postings = await asyncio.gather(
+        *(
+            extract_with_rate_limit(url, content, search_query, semaphore, stats)
+            for url, content in pages
+        )
+    )
+    return [jp for jp in job_postings if jp is not None], stats
+
+
+async def run_multi(pages, search_query):
+    """Extract every posting per page, batching small pages."""
+    stats = ExtractionStats()
+    semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    postings_by_url = await extract_pages_multi(pages, search_query, semaphore, stats)
+    job_postings = [jp for url, _ in pages for jp in postings_by_url.get(url, [])]
+    return dedupe_postings(job_postings), stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction mode benchmark")
+    parser.add_argument(
+        "--pages", default=RESULTS, help="Result JSON or labeled JSONL file"
+    )
+    parser.add_argument("--query", default="Wiz careers")
+    parser.add_argument(
+        "--live", action="store_true", help="Send the requests to the LLM"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.pages):
+        args.pages = FIXTURES
+    pages = load_pages(args.pages)
+
+    batches = pack_pages(
+        [
+            (url, window_content(content, MULTI_MAX_CONTENT_TOKENS))
+            for url, content in pages
+        ]
+    )
+    print(f"Pages: {len(pages)} from {os.path.basename(args.pages)}")
+    print(f"Planned requests: single {len(pages)}, multi {len(batches)}")
+    print(
+        f"Pages per multi request: {len(pages) / max(len(batches), 1):.1f} "
+        f"(largest batch {max((len(b) for b in batches), default=0)})"
+    )
+
+    if not args.live:
+        return
+
+    print(f"\n{'Mode':8}{'LLM calls':>11}{'Jobs':>7}{'Jobs/call':>11}{'Time':>9}")
+    for mode, run in (("single", run_single), ("multi", run_multi)):
+        start = time.perf_counter()
+        job_postings, stats = run_sync(run(pages, args.query))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:8}{stats.llm_calls:11}{len(job_postings):7}"
+            f"{len(job_postings) / max(stats.llm_calls, 1):11.2f}{elapsed:8.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark LLM client construction against the shared client registry, and
+report connection reuse of the shared async HTTP client.
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_llm_registry.py --calls 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the job_search directory and this directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# The clients are never used against the real API
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_openai import ChatOpenAI
+
+from src.utils.event_loop import run_sync
+from src.utils.llm import get_llm, get_llm_stats
+from src.utils.transport import get_transport
+from stub_server import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM client registry benchmark")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    # Per-call construction, as get_llm() used to do
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        ChatOpenAI(model="gpt-4o", temperature=0.0, request_timeout=60)
+    fresh = (time.perf_counter() - start) / args.calls
+
+    # Registry lookups
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        get_llm()
+    shared = (time.perf_counter() - start) / args.calls
+
+    print(f"ChatOpenAI() per call: {fresh * 1e3:8.3f} ms")
+    print(f"get_llm() per call:    {shared * 1e3:8.3f} ms")
+
+    # Connection reuse of the shared async client on the shared event loop
+    server, base_url = start_stub_server()
+    client = get_transport().async_client()
+
+    async def send_all():
+        await asyncio.gather(
+            *(client.post(f"{base_url}/chat", json={}) for _ in range(args.calls))
+        )
+
+    try:
+        run_sync(send_all())
+    finally:
+        server.shutdown()
+
+    stats = get_llm_stats()
+    print(
+        f"Async requests: {stats['async_requests']}, "
+        f"connections opened: {stats['async_connections']}, "
+        f"reuse rate: {stats['connection_reuse_rate']:.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Report precision and recall of the page pre-filter against a labeled fixture
+set, and its throughput.
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_page_filter.py --min-score 0.5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add the job_search directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.config import PAGE_FILTER_MIN_SCORE
+from src.utils.page_classifier import score_page
+
+FIXTURES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "labeled_pages.jsonl"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page pre-filter benchmark")
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--min-score", type=float, default=PAGE_FILTER_MIN_SCORE)
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.fixtures) as f:
+        pages = [json.loads(line) for line in f if line.strip()]
+
+    true_positives = false_positives = false_negatives = 0
+    start = time.perf_counter()
+    scores = [score_page(page["url"], page["raw_content"]) for page in pages]
+    elapsed = time.perf_counter() - start
+
+    for page, score in zip(pages, scores):
+        kept = score >= args.min_score
+        if kept and page["is_job"]:
+            true_positives += 1
+        elif kept:
+            false_positives += 1
+        elif page["is_job"]:
+            false_negatives += 1
+        if args.verbose or kept != page["is_job"]:
+            marker = "  " if kept == page["is_job"] else "!!"
+            print(f"{marker} {score:.2f} job={page['is_job']!s:5} {page['url']}")
+
+    precision = true_positives / max(true_positives + false_positives, 1)
+    recall = true_positives / max(true_positives + false_negatives, 1)
+    kept = true_positives + false_positives
+
+    print(f"\nPages: {len(pages)}, min score: {args.min_score}")
+    print(f"Precision: {precision:.3f}")
+    print(f"Recall:    {recall:.3f}")
+    print(f"LLM calls: {kept} of {len(pages)} pages")
+    print(f"Throughput: {len(pages) / elapsed:,.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
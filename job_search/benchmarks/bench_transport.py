@@ -0,0 +1,104 @@
+"""
+Benchmark unpooled async POSTs against the pooled HTTP transport.
+
+Both sides send the same concurrent requests on the shared event loop. The
+baseline client keeps no connections alive, so every request opens a new
+one; the transport sends them through ``HTTPTransport.apost``, the per-host
+pooled clients that ``atavily_post`` uses in production.
+
+Against the local stub (plain HTTP on loopback) a new connection costs
+almost nothing, so the two are close; the reused connections save a TCP
+and TLS handshake per request against a remote HTTPS endpoint (``--url``).
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/bench_transport.py --requests 500 --workers 8
+    python3 job_search/benchmarks/bench_transport.py --requests 50 --url https://example.com/
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+# Add the job_search directory and this directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.event_loop import run_sync
+from src.utils.transport import HTTPTransport
+from stub_server import start_stub_server
+
+PAYLOAD = {"url": "https://example.com/careers", "limit": 5}
+
+
+async def run(
+    send: Callable[..., Awaitable[httpx.Response]],
+    url: str,
+    num_requests: int,
+    workers: int,
+) -> float:
+    """
+    Send ``num_requests`` POSTs, at most ``workers`` at a time.
+
+    Returns:
+        float: Requests per second
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def send_one() -> None:
+        async with semaphore:
+            response = await send(url, json=PAYLOAD)
+        response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send_one() for _ in range(num_requests)))
+    return num_requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP transport benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Stub server latency in seconds"
+    )
+    parser.add_argument(
+        "--url", help="POST to this endpoint instead of the local stub server"
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = args.url
+    else:
+        server, base_url = start_stub_server(args.latency)
+        url = f"{base_url}/crawl"
+
+    # Built once, so only the connection setup differs from the transport
+    unpooled = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=0))
+    try:
+        bare = run_sync(run(unpooled.post, url, args.requests, args.workers))
+        transport = HTTPTransport(max_concurrency_per_host=args.workers)
+        pooled = run_sync(run(transport.apost, url, args.requests, args.workers))
+    finally:
+        run_sync(unpooled.aclose())
+        if server is not None:
+            server.shutdown()
+
+    stats = transport.connection_stats()
+    print(f"Target: {url}")
+    print(f"httpx.AsyncClient (new connection per call): {bare:8.1f} req/s")
+    print(f"HTTPTransport.apost (pooled per-host):       {pooled:8.1f} req/s")
+    print(
+        f"Transport connections opened: {stats['async_connections']} for "
+        f"{stats['async_requests']} requests"
+    )
+    print(f"Speedup: {pooled / bare:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Local stand-in for the Tavily and OpenAI APIs used by the offline benchmarks.
+
+Replays recorded ``/search`` and ``/crawl`` responses and answers chat
+completions with plausible structured output, with configurable latency,
+jitter and injected 429 responses. Point the agent at it with::
+
+    TAVILY_API_URL=http://127.0.0.1:8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+
+Usage (from the root directory of this repo):
+    python3 job_search/benchmarks/mock_server.py --port 8765 --rate-429 0.02
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Recorded crawl of a real careers site, replayed for every crawl request
+RECORDED_CRAWL = os.path.join(
+    os.path.dirname(BENCHMARK_DIR), "results", "job_search_results.json"
+)
+
+# Labeled pages, used when no recorded crawl is available
+FIXTURE_PAGES = os.path.join(BENCHMARK_DIR, "fixtures", "labeled_pages.jsonl")
+
+_url_line_pattern = re.compile(r"^URL: (\S+)", re.MULTILINE)
+_page_pattern = re.compile(
+    r"^URL: (\S+)\s*\n\s*Content:\s*\n(.*?)(?=^--- Page |\Z)",
+    re.MULTILINE | re.DOTALL,
+)
+_search_result_pattern = re.compile(r"^- (\S+)", re.MULTILINE)
+_location_pattern = re.compile(
+    r"\b(Remote|Hybrid|New York|London|Tel Aviv|San Francisco|Berlin|Paris|"
+    r"Toronto|Singapore|Tokyo|Sydney|Amsterdam)\b"
+)
+
+
+@dataclass
+class MockConfig:
+    """Latency and fault injection settings of the mock server."""
+
+    search_latency: float = 0.5  # Seconds per /search request
+    crawl_latency: float = 2.0  # Seconds before the first crawled page
+    crawl_page_latency: float = 0.05  # Seconds between crawled pages
+    llm_latency: float = 0.8  # Seconds per chat completion
+    jitter: float = 0.3  # Latencies vary uniformly by this fraction
+    rate_429: float = 0.0  # Fraction of requests answered with 429
+    retry_after: float = 0.2  # Retry-After of injected 429 responses
+    max_pages: int = 20  # Pages per crawl
+
+
+def load_corpus(max_pages: int) -> List[Tuple[str, str]]:
+    """
+    Load the recorded pages replayed by ``/crawl``.
+
+    Args:
+        max_pages (int): Maximum number of pages to keep
+
+    Returns:
+        List[Tuple[str, str]]: ``(url path, raw content)`` pairs
+    """
+    if os.path.exists(RECORDED_CRAWL):
+        with open(RECORDED_CRAWL) as f:
+            raw_content = json.load(f)["crawl_result"]["raw_content"]
+        pages = list(raw_content.items())
+    else:
+        with open(FIXTURE_PAGES) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        pages = [(row["url"], row["raw_content"]) for row in rows]
+
+    corpus = []
+    for url, content in pages[:max_pages]:
+        parsed = urlparse(url)
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        corpus.append((path, content))
+    return corpus
+
+
+def first_line(content: str) -> str:
+    """Use the first substantial line of a page as its job title."""
+    for line in content.splitlines():
+        line = line.strip(" #*\t")
+        if len(line) > 3 and not line.startswith(("[", "!")):
+            return line[:80]
+    return "Unknown"
+
+
+def make_posting(url: str, content: str) -> Dict[str, object]:
+    """Build the job posting the mock LLM extracts from a page."""
+    location = _location_pattern.search(content)
+    return {
+        "title": first_line(content),
+        "location": location.group(0) if location else "Unknown",
+        "url": url,
+        "benefits": ["Health insurance"] if "benefit" in content.lower() else [],
+    }
+
+
+def complete(prompt: str) -> str:
+    """
+    Answer a prompt of the job search agent like the model would.
+
+    Args:
+        prompt (str): Text of the user message
+
+    Returns:
+        str: Completion text
+    """
+    if "Select the single best domain" in prompt:
+        urls = _search_result_pattern.findall(prompt)
+        return urls[0] if urls else ""
+    if "--- Page " in prompt:
+        postings = [
+            make_posting(url, content) for url, content in _page_pattern.findall(prompt)
+        ]
+        return json.dumps({"job_postings": postings})
+    if "structured job posting" in prompt:
+        url = _url_line_pattern.search(prompt)
+        content = prompt.split("Content:", 1)[-1]
+        return json.dumps(make_posting(url.group(1) if url else "", content))
+    return "OK"
+
+
+def make_handler(config: MockConfig, corpus: List[Tuple[str, str]]):
+    """
+    Build the request handler of the mock server.
+
+    Args:
+        config (MockConfig): Latency and fault injection settings
+        corpus (List[Tuple[str, str]]): Pages replayed by ``/crawl``
+
+    Returns:
+        type: A ``BaseHTTPRequestHandler`` subclass
+    """
+
+    def sleep(latency: float) -> None:
+        if latency > 0:
+            time.sleep(latency * (1 + random.uniform(-config.jitter, config.jitter)))
+
+    class MockHandler(BaseHTTPRequestHandler):
+        # Keep-alive requires HTTP/1.1 and an explicit Content-Length
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_chunk(self, data: bytes) -> None:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            if random.random() < config.rate_429:
+                self.send_json(
+                    429,
+                    {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                    {"Retry-After": str(config.retry_after)},
+                )
+                return
+
+            if self.path.endswith("/search"):
+                self.search(body)
+            elif self.path.endswith("/crawl"):
+                self.crawl(body)
+            elif self.path.endswith("/chat/completions"):
+                self.chat_completion(body)
+            else:
+                self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def search(self, body: Dict) -> None:
+            sleep(config.search_latency)
+            slug = re.sub(r"[^a-z0-9]+", "", body.get("query", "").lower())
+            slug = slug.removesuffix("careers") or "company"
+            urls = [
+                f"https://www.{slug}.example.com/careers",
+                f"https://www.linkedin.com/company/{slug}/jobs",
+                f"https://www.glassdoor.com/{slug}-jobs",
+            ]
+            results = [{"url": url, "title": url, "content": ""} for url in urls]
+            self.send_json(200, {"query": body.get("query"), "results": results})
+
+        def crawl(self, body: Dict) -> None:
+            base = urlparse(body.get("url", "https://example.com"))
+            origin = f"{base.scheme or 'https'}://{base.netloc or 'example.com'}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            sleep(config.crawl_latency)
+            self.send_chunk(
+                b'{"base_url": %s, "results": [' % json.dumps(origin).encode()
+            )
+            pages = corpus[: body.get("limit") or len(corpus)]
+            for i, (path, content) in enumerate(pages):
+                page = {"url": origin + path, "raw_content": content}
+                self.send_chunk(
+                    (", " if i else "").encode() + json.dumps(page).encode()
+                )
+                sleep(config.crawl_page_latency)
+            self.send_chunk(b'], "response_time": 1.0}')
+            self.wfile.write(b"0\r\n\r\n")
+
+        def chat_completion(self, body: Dict) -> None:
+            prompt = "\n".join(
+                message.get("content") or ""
+                for message in body.get("messages", [])
+                if isinstance(message.get("content"), str)
+            )
+            content = complete(prompt)
+            sleep(config.llm_latency)
+            self.send_json(
+                200,
+                {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": len(prompt) // 4 + 1,
+                        "completion_tokens": len(content) // 4 + 1,
+                        "total_tokens": (len(prompt) + len(content)) // 4 + 2,
+                    },
+                },
+            )
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockHandler
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-response."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def start_mock_server(
+    config: Optional[MockConfig] = None, port: int = 0
+) -> Tuple[MockServer, str]:
+    """
+    Start the mock server in a background thread.
+
+    Args:
+        config (Optional[MockConfig]): Latency and fault injection settings
+        port (int): Port to listen on (0 picks a free port)
+
+    Returns:
+        Tuple[MockServer, str]: The server and its base URL
+    """
+    config = config or MockConfig()
+    handler = make_handler(config, load_corpus(config.max_pages))
+    server = MockServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``MockConfig`` settings as command line options."""
+    defaults = MockConfig()
+    for name, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(value), default=value
+        )
+
+
+def mock_config_from_args(args: argparse.Namespace) -> MockConfig:
+    """Build a ``MockConfig`` from options added by ``add_mock_arguments``."""
+    return MockConfig(**{name: getattr(args, name) for name in vars(MockConfig())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Tavily and OpenAI server")
+    parser.add_argument("--port", type=int, default=8765)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_mock_server(mock_config_from_args(args), args.port)
+    print(f"Mock server listening on {url}")
+    print(f"  TAVILY_API_URL={url}")
+    print(f"  OPENAI_BASE_URL={url}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
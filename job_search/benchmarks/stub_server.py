@@ -0,0 +1,75 @@
+"""
+Local stub of the Tavily API used by the benchmarks.
+
+Run it with a fixed latency to approximate a remote endpoint without spending
+API credits.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+def make_handler(latency: float):
+    """
+    Build a request handler that answers every POST with a canned crawl result.
+
+    Args:
+        latency (float): Seconds to sleep before answering each request
+
+    Returns:
+        type: A ``BaseHTTPRequestHandler`` subclass
+    """
+    body = json.dumps(
+        {
+            "base_url": "https://example.com/careers",
+            "results": [
+                {
+                    "url": f"https://example.com/careers/job/{i}",
+                    "raw_content": "Software Engineer - Remote",
+                }
+                for i in range(5)
+            ],
+        }
+    ).encode()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # Keep-alive requires HTTP/1.1 and an explicit Content-Length
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server on a free local port in a background thread.
+
+    Args:
+        latency (float): Seconds to sleep before answering each request
+
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: The server and its base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
@@ -1,18 +1,88 @@
-import json
-from typing import Any, Dict
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
+from pydantic import BaseModel
 
-from src.agents.crawl import crawl
-from src.agents.domain_search import domain_search
-from src.agents.extract import extract
-from src.models.schema import AgentState
+from src.agents.crawl import crawl, crawl_async
+from src.agents.domain_search import domain_search, domain_search_async
+from src.agents.extract import extract, extract_async
+from src.agents.incremental import (
+    incremental_extract,
+    incremental_extract_async,
+    load_company_state,
+)
+from src.agents.page_dedup import page_dedup
+from src.agents.page_filter import page_filter
+from src.agents.pipeline import crawl_and_extract, crawl_and_extract_async
+from src.models.schema import AgentState, CrawlResult
+from src.utils.checkpoint import checkpointed
+from src.utils.config import (
+    BATCH_CONCURRENCY,
+    PAGE_DEDUP_ENABLED,
+    PAGE_FILTER_ENABLED,
+    STREAMING_PIPELINE,
+)
+from src.utils.content_store import dump_crawl_result, release_contents
+from src.utils.event_loop import run_on_shared_loop
+from src.utils.metrics import get_metrics, instrumented
+from src.utils.result_sink import open_result_sink, with_postings_sink, write_json_file
+from src.utils.setup_logger import setup_logger
 
+logger = setup_logger("Agent")
 
-def create_job_search_agent():
+
+def wrap_node(
+    name: str,
+    func: Callable[[AgentState], Dict[str, Any]],
+    afunc: Optional[Callable[[AgentState], Awaitable[Dict[str, Any]]]] = None,
+    write_postings: bool = False,
+):
+    """
+    Time a node and checkpoint its output (see ``checkpointed``).
+
+    Args:
+        name (str): Name of the node in the graph
+        func (Callable[[AgentState], Dict[str, Any]]): The node function
+        afunc (Optional[Callable[[AgentState], Awaitable[Dict[str, Any]]]]):
+            Native async version of the node, used by ``agent.ainvoke``. It
+            runs on the shared event loop, so the nodes of many companies are
+            multiplexed on one thread with the pooled async clients
+        write_postings (bool): Also append the node's job postings to the
+            postings sink (see ``with_postings_sink``)
+
+    Returns:
+        The wrapped node function, or a ``RunnableLambda`` with both versions
+    """
+
+    def wrap(node_func):
+        node_func = instrumented(name, checkpointed(name, node_func))
+        return with_postings_sink(node_func) if write_postings else node_func
+
+    if afunc is None:
+        return wrap(func)
+    wrapped_afunc = wrap(afunc)
+
+    async def on_shared_loop(state: AgentState) -> Dict[str, Any]:
+        return await run_on_shared_loop(wrapped_afunc(state))
+
+    return RunnableLambda(wrap(func), afunc=on_shared_loop, name=name)
+
+
+def create_job_search_agent(
+    streaming: bool = STREAMING_PIPELINE, incremental: bool = False
+):
     """
     Create a LangGraph agent for job searching.
 
+    Args:
+        streaming (bool): Overlap crawling and extraction in a single streaming
+            node instead of running them as separate steps
+        incremental (bool): Reuse the company's previous run and extract only
+            new or changed pages (takes precedence over ``streaming``)
+
     Returns:
         StateGraph: LangGraph agent
     """
@@ -20,13 +90,24 @@ def create_job_search_agent():
     workflow = StateGraph(AgentState)
 
     # Add nodes to the graph
-    workflow.add_node("domain search", domain_search)
-    workflow.add_node("web crawl", crawl)
-    workflow.add_node("entity extraction", extract)
+    workflow.add_node(
+        "domain search",
+        wrap_node("domain search", domain_search, domain_search_async),
+    )
 
     # Define edges
-    # Start with domain search
-    workflow.set_entry_point("domain search")
+    if incremental:
+        # Skip the domain search when the previous run's domain is known
+        workflow.add_node("load state", wrap_node("load state", load_company_state))
+        workflow.set_entry_point("load state")
+        workflow.add_conditional_edges(
+            "load state",
+            lambda state: "known" if state.domain_search_result else "new",
+            {"known": "web crawl", "new": "domain search"},
+        )
+    else:
+        # Start with domain search
+        workflow.set_entry_point("domain search")
 
     # Define conditional edges
     def check_error(state: AgentState) -> str:
@@ -35,13 +116,58 @@ def create_job_search_agent():
             return "error"
         return "next"
 
+    if streaming and not incremental:
+        workflow.add_node(
+            "crawl and extract",
+            wrap_node(
+                "crawl and extract",
+                crawl_and_extract,
+                crawl_and_extract_async,
+                write_postings=True,
+            ),
+        )
+        workflow.add_conditional_edges(
+            "domain search", check_error, {"error": END, "next": "crawl and extract"}
+        )
+        workflow.add_edge("crawl and extract", END)
+        return workflow.compile()
+
+    workflow.add_node("web crawl", wrap_node("web crawl", crawl, crawl_async))
+    # Extracted postings are also appended to the postings sink, if any
+    if incremental:
+        extract_node = wrap_node(
+            "entity extraction",
+            incremental_extract,
+            incremental_extract_async,
+            write_postings=True,
+        )
+    else:
+        extract_node = wrap_node(
+            "entity extraction", extract, extract_async, write_postings=True
+        )
+    workflow.add_node("entity extraction", extract_node)
+
     # Add edges
     workflow.add_conditional_edges(
         "domain search", check_error, {"error": END, "next": "web crawl"}
     )
 
+    # Drop non-job pages, then collapse duplicate pages, between crawl and
+    # extraction
+    previous_node = "web crawl"
+    for name, func, enabled in [
+        ("page filter", page_filter, PAGE_FILTER_ENABLED),
+        ("page dedup", page_dedup, PAGE_DEDUP_ENABLED),
+    ]:
+        if not enabled:
+            continue
+        workflow.add_node(name, wrap_node(name, func))
+        workflow.add_conditional_edges(
+            previous_node, check_error, {"error": END, "next": name}
+        )
+        previous_node = name
     workflow.add_conditional_edges(
-        "web crawl", check_error, {"error": END, "next": "entity extraction"}
+        previous_node, check_error, {"error": END, "next": "entity extraction"}
     )
 
     # Extract is the final step
@@ -51,18 +177,27 @@ def create_job_search_agent():
     return workflow.compile()
 
 
-def run_job_search_agent(company_name: str) -> Dict[str, Any]:
+def run_job_search_agent(
+    company_name: str,
+    streaming: bool = STREAMING_PIPELINE,
+    incremental: bool = False,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     Run the job search agent for a given company.
 
     Args:
         company_name (str): Name of the company to search for
+        streaming (bool): Overlap crawling and extraction
+        incremental (bool): Extract only pages changed since the previous run
+        run_id (Optional[str]): Checkpoint node outputs under this run id, and
+            replay the nodes that already finished in it
 
     Returns:
         Dict[str, Any]: Results of the job search
     """
     # Create the agent
-    agent = create_job_search_agent()
+    agent = create_job_search_agent(streaming, incremental)
 
     # Save the workflow as a Mermaid PNG
     # agent.get_graph(xray=True).draw_mermaid_png(
@@ -72,88 +207,125 @@ def run_job_search_agent(company_name: str) -> Dict[str, Any]:
     # print("Workflow diagram saved as job_search_workflow.png")
 
     # Initialize the state
-    initial_state = AgentState(company_name=company_name)
+    initial_state = AgentState(company_name=company_name, run_id=run_id)
 
     # Run the agent
-    result = agent.invoke(initial_state)
+    with get_metrics().timer("company_seconds"):
+        result = agent.invoke(initial_state)
 
     # Return the result
     return result
 
 
+async def arun_job_search_batch(
+    company_names: Iterable[str],
+    concurrency: int = BATCH_CONCURRENCY,
+    agent: Optional[Any] = None,
+    streaming: bool = STREAMING_PIPELINE,
+    incremental: bool = False,
+    run_id: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the job search agent for many companies with a bounded worker pool.
+
+    The workflow is compiled once and shared by every run. Results are yielded
+    as soon as each company finishes, in completion order.
+
+    Args:
+        company_names (Iterable[str]): Names of the companies to search for
+        concurrency (int): Maximum number of companies processed at once
+        agent: Optional compiled agent (compiled here if not provided)
+        streaming (bool): Overlap crawling and extraction (if compiled here)
+        incremental (bool): Extract only changed pages (if compiled here)
+        run_id (Optional[str]): Checkpoint node outputs under this run id
+
+    Yields:
+        Dict[str, Any]: JSON-serializable result of one company's job search
+    """
+    if agent is None:
+        agent = create_job_search_agent(streaming, incremental)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(company_name: str) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await agent.ainvoke(
+                    AgentState(company_name=company_name, run_id=run_id)
+                )
+                serializable_result = serialize_result(result)
+                # The page bodies are in the serialized result now
+                release_contents(result.get("crawl_result"))
+            except Exception as e:
+                logger.error(f"Job search failed for {company_name}: {e}")
+                serializable_result = {"company_name": company_name, "error": str(e)}
+            elapsed = time.perf_counter() - start
+            get_metrics().observe("company_seconds", elapsed)
+            logger.info(f"Finished {company_name} in {elapsed:.1f}s")
+            return serializable_result
+
+    tasks = [asyncio.ensure_future(run_one(name)) for name in company_names]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def serialize_result(result: Any) -> Dict[str, Any]:
+    """
+    Convert an agent result to a JSON-serializable dictionary.
+
+    Args:
+        result (Any): Result returned by the agent, as a state dictionary or
+            an ``AgentState``
+
+    Returns:
+        Dict[str, Any]: JSON-serializable result
+    """
+    if isinstance(result, BaseModel):
+        result = dict(result)
+
+    serializable_result = {}
+    for key, value in result.items():
+        if isinstance(value, CrawlResult):
+            # Spilled page bodies are loaded back into raw_content
+            serializable_result[key] = dump_crawl_result(value)
+        elif isinstance(value, BaseModel):
+            serializable_result[key] = value.model_dump()
+        else:
+            serializable_result[key] = value
+    return serializable_result
+
+
 def save_results_to_file(
     result: Dict[str, Any], filename: str = "job_search_results.json"
 ) -> None:
     """
     Save the results to a file.
 
+    ``.json`` files hold one indented document; ``.jsonl`` and ``.jsonl.gz``
+    files get one row through a result sink. Either way the file is written
+    under a temporary name and renamed once complete. The nested state does
+    not fit Parquet's flat rows; write job postings to Parquet with a
+    postings sink instead.
+
     Args:
         result (Dict[str, Any]): Results to save
         filename (str): Name of the file to save to
-    """
-    # Debug: Print result type and attributes
-    # print(f"Result type: {type(result)}")
-
-    # Convert the result to a JSON-serializable format
-    serializable_result = {}
 
-    # Handle different result types
-    if isinstance(result, dict):
-        # print("Result is a dictionary")
-        # Convert any Pydantic models in the dictionary to dictionaries
-        for key, value in result.items():
-            if hasattr(value, "model_dump"):
-                serializable_result[key] = value.model_dump()
-            elif key == "domain_search_result" and value is not None:
-                serializable_result[key] = {
-                    "query": value.query,
-                }
-            elif key == "crawl_result" and value is not None:
-                serializable_result[key] = {
-                    "base_domain": value.base_domain,
-                    "links": value.links,
-                }
-            elif key == "extract_result" and value is not None:
-                serializable_result[key] = {
-                    "extracted_jobs": [job.model_dump() for job in value.extracted_jobs]
-                }
-            else:
-                serializable_result[key] = value
-    else:
-        print(f"Result attributes: {dir(result)}")
-        # Add company_name if available
-        if hasattr(result, "company_name"):
-            serializable_result["company_name"] = result.company_name
-        else:
-            serializable_result["company_name"] = "Unknown Company"
-
-        # Add error if available
-        if hasattr(result, "error"):
-            serializable_result["error"] = result.error
-
-        # Add domain search result if available
-        if hasattr(result, "domain_search_result") and result.domain_search_result:
-            serializable_result["domain_search_result"] = {
-                "query": result.domain_search_result.query,
-                "top_urls": result.domain_search_result.top_urls,
-                "selected_domain": result.domain_search_result.selected_domain,
-            }
-
-        # Add crawl result if available
-        if hasattr(result, "crawl_result") and result.crawl_result:
-            serializable_result["crawl_result"] = {
-                "domain": result.crawl_result.domain,
-                "links": result.crawl_result.links,
-            }
-
-        # Add extract result if available
-        if hasattr(result, "extract_result") and result.extract_result:
-            serializable_result["extract_result"] = {
-                "extracted_jobs": [
-                    job.model_dump() for job in result.extract_result.extracted_jobs
-                ],
-            }
-
-    # Save to file
-    with open(filename, "w") as f:
-        json.dump(serializable_result, f, indent=2)
+    Raises:
+        ValueError: If the file is a ``.parquet`` file
+    """
+    if filename.endswith(".parquet"):
+        raise ValueError(
+            f"Cannot save results to {filename}: use .json, .jsonl or .jsonl.gz"
+        )
+    serializable_result = serialize_result(result)
+    if filename.endswith(".json"):
+        write_json_file(filename, serializable_result)
+        return
+    with open_result_sink(filename) as sink:
+        sink.write(serializable_result)
@@ -1,21 +1,488 @@
-from typing import Any, Dict
-from urllib.parse import urlparse
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from src.utils.setup_logger import setup_logger
 
 logger = setup_logger("Crawl")
 
-import requests
-
-from src.models.schema import AgentState, CrawlResult
+from src.models.schema import (
+    AgentState,
+    CrawlResult,
+    CrawlSection,
+    CrawlSettings,
+    CrawlYield,
+)
 from src.utils.config import (
+    ADAPTIVE_CRAWL_ENABLED,
+    ADAPTIVE_CRAWL_LEVELS,
+    CONTENT_STORE_ENABLED,
+    CRAWL_SPLIT_DISCOVERY,
+    CRAWL_SPLIT_ENABLED,
+    CRAWL_SPLIT_MIN_LIMIT,
     DEFAULT_CRAWL_LIMIT,
     DEFAULT_EXTRACT_DEPTH,
-    TAVILY_API_KEY,
 )
+from src.utils.content_store import (
+    ContentStore,
+    load_content,
+    page_contents,
+    release_contents,
+)
+from src.utils.crawl_profiles import (
+    escalate,
+    get_crawl_profile_store,
+    learn_profile,
+    level_settings,
+    record_page,
+)
+from src.utils.crawl_sections import find_sections
+from src.utils.event_loop import run_sync
+from src.utils.json_stream import aiter_json_array_items
+from src.utils.metrics import get_metrics
+from src.utils.transport import atavily_post
 
+# Size of the response chunks parsed while streaming a crawl
+CRAWL_STREAM_CHUNK_SIZE = 64 * 1024
 
-def crawl(state: AgentState) -> Dict[str, Any]:
+# Settings of a crawl without adaptive escalation
+DEFAULT_CRAWL_SETTINGS = CrawlSettings(
+    limit=DEFAULT_CRAWL_LIMIT,
+    max_depth=2,
+    max_breadth=100,
+    extract_depth=DEFAULT_EXTRACT_DEPTH,
+)
+
+
+async def iter_crawl_pages(
+    selected_domain: str, settings: CrawlSettings = DEFAULT_CRAWL_SETTINGS
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Crawl a domain and yield each crawled page as soon as it is received.
+
+    Pages are parsed incrementally from the streamed response body, so the
+    first pages can be processed while the rest are still downloading.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+        settings (CrawlSettings): Scope and extraction depth of the crawl
+
+    Yields:
+        Dict[str, Any]: Crawled page with ``url`` and ``raw_content`` keys
+
+    Raises:
+        RuntimeError: If the API returns a non-200 status code
+    """
+    payload = {
+        "url": selected_domain,
+        "limit": settings.limit,
+        "max_depth": settings.max_depth,
+        "max_breadth": settings.max_breadth,
+        "extract_depth": settings.extract_depth,
+        "allow_external": True,
+        "categories": ["Careers"],
+    }
+    # Scope sub-crawls to their section of the site
+    if settings.select_paths:
+        payload["select_paths"] = settings.select_paths
+    if settings.select_domains:
+        payload["select_domains"] = settings.select_domains
+    response = await atavily_post("crawl", payload, stream=True)
+
+    try:
+        # Check if the request was successful
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"API returned status code {response.status_code}"
+            )
+
+        async def counted_chunks() -> AsyncIterator[bytes]:
+            """Count the bytes received from /crawl."""
+            metrics = get_metrics()
+            async for chunk in response.aiter_bytes(CRAWL_STREAM_CHUNK_SIZE):
+                metrics.increment("crawl_bytes_received", len(chunk))
+                yield chunk
+
+        async for page in aiter_json_array_items(counted_chunks(), "results"):
+            if "url" in page:
+                yield page
+    finally:
+        await response.aclose()
+
+
+async def crawl_round(
+    selected_domain: str, settings: CrawlSettings
+) -> Tuple[CrawlResult, CrawlYield]:
+    """
+    Run one crawl and measure its job-page yield.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+        settings (CrawlSettings): Scope and extraction depth of the crawl
+
+    Returns:
+        Tuple[CrawlResult, CrawlYield]: Crawled pages and their yield
+    """
+    # Extract links and raw content from the crawl result
+    links = []
+    raw_content_by_url = {}
+    content_handles = {}
+    crawl_yield = CrawlYield()
+    # Page bodies are spilled to disk as they arrive, keeping the state small
+    store = ContentStore() if CONTENT_STORE_ENABLED else None
+    try:
+        async for page in iter_crawl_pages(selected_domain, settings):
+            links.append(page["url"])
+            record_page(crawl_yield, page["url"], page.get("raw_content"))
+            # Store raw content for each URL
+            if "raw_content" not in page:
+                continue
+            if store is not None and page["raw_content"]:
+                content_handles[page["url"]] = store.put(page["raw_content"])
+            else:
+                raw_content_by_url[page["url"]] = page["raw_content"]
+    finally:
+        if store is not None:
+            store.close()
+
+    crawl_result = CrawlResult(
+        domain=selected_domain,
+        links=links,
+        raw_content=raw_content_by_url,
+        content_handles=content_handles,
+        settings=settings,
+    )
+    return crawl_result, crawl_yield
+
+
+def merge_crawl_results(
+    previous: Optional[CrawlResult], latest: CrawlResult
+) -> CrawlResult:
+    """
+    Merge an escalated crawl into the pages of the crawls before it.
+
+    Pages of the latest crawl win, since it was wider or extracted deeper.
+
+    Args:
+        previous (Optional[CrawlResult]): Merged result of the earlier crawls
+        latest (CrawlResult): Result of the latest crawl
+
+    Returns:
+        CrawlResult: Merged result
+    """
+    if previous is None:
+        return latest
+    latest_links = set(latest.links)
+    leftover = [url for url in previous.links if url not in latest_links]
+    if not leftover:
+        release_contents(previous, keep=latest)
+    return CrawlResult(
+        domain=latest.domain,
+        links=latest.links + leftover,
+        raw_content={
+            **{
+                url: previous.raw_content[url]
+                for url in leftover
+                if url in previous.raw_content
+            },
+            **latest.raw_content,
+        },
+        content_handles={
+            **{
+                url: previous.content_handles[url]
+                for url in leftover
+                if url in previous.content_handles
+            },
+            **latest.content_handles,
+        },
+        settings=latest.settings,
+    )
+
+
+def measure_yield(crawl_result: CrawlResult) -> CrawlYield:
+    """
+    Measure the job-page yield of crawled pages.
+
+    Args:
+        crawl_result (CrawlResult): Crawled pages
+
+    Returns:
+        CrawlYield: Yield of the pages
+    """
+    crawl_yield = CrawlYield()
+    contents = page_contents(crawl_result)
+    for url in crawl_result.links:
+        content = contents.get(url)
+        record_page(
+            crawl_yield, url, load_content(content) if content is not None else None
+        )
+    return crawl_yield
+
+
+def combine_crawl_results(
+    selected_domain: str,
+    settings: CrawlSettings,
+    crawl_results: List[CrawlResult],
+) -> CrawlResult:
+    """
+    Combine the pages of sub-crawls, deduplicated and capped at the page limit.
+
+    Args:
+        selected_domain (str): URL the crawl started from
+        settings (CrawlSettings): Settings of the whole crawl
+        crawl_results (List[CrawlResult]): Results to combine; the first
+            result crawling a URL wins
+
+    Returns:
+        CrawlResult: Combined result
+    """
+    links = []
+    raw_content = {}
+    content_handles = {}
+    seen = set()
+    for crawl_result in crawl_results:
+        for url in crawl_result.links:
+            if url in seen or len(links) >= settings.limit:
+                continue
+            seen.add(url)
+            links.append(url)
+            if url in crawl_result.raw_content:
+                raw_content[url] = crawl_result.raw_content[url]
+            if url in crawl_result.content_handles:
+                content_handles[url] = crawl_result.content_handles[url]
+    return CrawlResult(
+        domain=selected_domain,
+        links=links,
+        raw_content=raw_content,
+        content_handles=content_handles,
+        settings=settings,
+    )
+
+
+async def split_crawl_round(
+    selected_domain: str,
+    settings: CrawlSettings,
+    discovery: Optional[CrawlResult] = None,
+) -> Tuple[CrawlResult, CrawlYield]:
+    """
+    Run one crawl as parallel sub-crawls of the site's sections.
+
+    A single large crawl is one long request. When a shallow crawl of the site
+    shows clear sections (path prefixes or subdomains, see ``find_sections``),
+    each section is crawled by its own request scoped with ``select_paths`` or
+    ``select_domains``, and the pages are merged under the crawl's page limit.
+    Sites without sections are crawled in one request.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+        settings (CrawlSettings): Scope and extraction depth of the crawl
+        discovery (Optional[CrawlResult]): Earlier crawl of the site whose URLs
+            reveal its sections; a shallow crawl is run if not provided
+
+    Returns:
+        Tuple[CrawlResult, CrawlYield]: Crawled pages and their yield
+    """
+    # Only the pages of crawls run here are released; the caller owns the rest
+    owned_results = []
+    if discovery is None:
+        limit, max_depth, max_breadth = CRAWL_SPLIT_DISCOVERY
+        discovery, _ = await crawl_round(
+            selected_domain,
+            CrawlSettings(
+                limit=limit,
+                max_depth=max_depth,
+                max_breadth=max_breadth,
+                extract_depth=settings.extract_depth,
+            ),
+        )
+        owned_results.append(discovery)
+    # Discovered pages are kept if they were extracted as deep as this crawl's
+    reuse_discovery = (
+        discovery.settings is not None
+        and discovery.settings.extract_depth == settings.extract_depth
+    )
+    kept = discovery.links[: settings.limit] if reuse_discovery else []
+    sections = find_sections(
+        selected_domain, discovery.links, settings.limit - len(kept)
+    )
+    if not sections:
+        for partial_result in owned_results:
+            release_contents(partial_result)
+        return await crawl_round(selected_domain, settings)
+
+    logger.info(
+        f"Crawling {len(sections)} sections of {selected_domain} in parallel: "
+        + ", ".join(f"{section.url} (limit {section.limit})" for section in sections)
+    )
+    get_metrics().observe("crawl_sections", len(sections))
+
+    async def crawl_section(section: CrawlSection) -> Optional[CrawlResult]:
+        section_settings = settings.model_copy(
+            update={
+                "limit": section.limit,
+                "select_paths": section.select_paths,
+                "select_domains": section.select_domains,
+            }
+        )
+        try:
+            return (await crawl_round(section.url, section_settings))[0]
+        except Exception as e:
+            logger.warning(f"Sub-crawl of {section.url} failed: {e}")
+            return None
+
+    section_results = [
+        result
+        for result in await asyncio.gather(*map(crawl_section, sections))
+        if result is not None
+    ]
+    owned_results += section_results
+    if not section_results and not kept:
+        raise RuntimeError(f"Every sub-crawl of {selected_domain} failed")
+
+    crawl_result = combine_crawl_results(
+        selected_domain,
+        settings,
+        ([discovery] if reuse_discovery else []) + section_results,
+    )
+    # Pages cut by the page limit are not needed anymore
+    for partial_result in owned_results:
+        release_contents(partial_result, keep=crawl_result)
+    return crawl_result, measure_yield(crawl_result)
+
+
+async def run_crawl(
+    selected_domain: str,
+    settings: CrawlSettings,
+    previous: Optional[CrawlResult] = None,
+) -> Tuple[CrawlResult, CrawlYield]:
+    """
+    Run one crawl, split into parallel sub-crawls if it is large enough.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+        settings (CrawlSettings): Scope and extraction depth of the crawl
+        previous (Optional[CrawlResult]): Pages of an earlier crawl of the site,
+            reused to find its sections
+
+    Returns:
+        Tuple[CrawlResult, CrawlYield]: Crawled pages and their yield
+    """
+    if CRAWL_SPLIT_ENABLED and settings.limit >= CRAWL_SPLIT_MIN_LIMIT:
+        return await split_crawl_round(selected_domain, settings, previous)
+    return await crawl_round(selected_domain, settings)
+
+
+async def adaptive_crawl(selected_domain: str) -> CrawlResult:
+    """
+    Crawl with the cheapest settings whose job-page yield is good enough.
+
+    The first crawl uses the settings learned for the site, or the smallest
+    scope with basic extraction for a new site. While the yield justifies it
+    (see ``escalate``), the crawl is repeated with a wider scope or advanced
+    extraction. The settings it settles on are stored for the site's next run.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+
+    Returns:
+        CrawlResult: Pages of every crawl, the latest crawl's pages first
+    """
+    store = get_crawl_profile_store()
+    metrics = get_metrics()
+    # Profile store reads and commits run off the event loop
+    profile = await asyncio.to_thread(store.get, selected_domain)
+    if profile is not None:
+        level = min(profile.level, len(ADAPTIVE_CRAWL_LEVELS) - 1)
+        extract_depth = profile.extract_depth
+    else:
+        level, extract_depth = 0, "basic"
+
+    crawl_result = None
+    rounds = 0
+    while True:
+        settings = level_settings(level, extract_depth)
+        logger.info(
+            f"Crawling {selected_domain} (limit {settings.limit}, depth "
+            f"{settings.max_depth}, breadth {settings.max_breadth}, "
+            f"{settings.extract_depth} extraction)"
+        )
+        try:
+            round_result, crawl_yield = await run_crawl(
+                selected_domain, settings, crawl_result
+            )
+        except Exception as e:
+            if crawl_result is None:
+                raise
+            # Keep the pages of the earlier crawls
+            logger.warning(f"Escalated crawl of {selected_domain} failed: {e}")
+            break
+        rounds += 1
+        crawl_result = merge_crawl_results(crawl_result, round_result)
+        logger.info(
+            f"Crawled {crawl_yield.pages} pages, {crawl_yield.job_pages} look like "
+            f"job postings ({crawl_yield.thin_job_url_pages} of "
+            f"{crawl_yield.job_url_pages} posting URLs without posting content)"
+        )
+
+        next_settings = escalate(level, extract_depth, crawl_yield)
+        if next_settings is None:
+            await asyncio.to_thread(
+                store.set,
+                learn_profile(selected_domain, level, extract_depth, crawl_yield),
+            )
+            break
+        level, extract_depth = next_settings
+        metrics.increment("crawl_escalations")
+
+    metrics.observe("crawl_rounds", rounds)
+    return crawl_result
+
+
+def crawl_settings(selected_domain: str) -> CrawlSettings:
+    """
+    Get the settings of a single crawl of a site, without escalation.
+
+    Args:
+        selected_domain (str): URL to start crawling from
+
+    Returns:
+        CrawlSettings: The site's learned settings with adaptive crawling,
+            otherwise the default settings
+    """
+    if ADAPTIVE_CRAWL_ENABLED:
+        profile = get_crawl_profile_store().get(selected_domain)
+        if profile is not None:
+            level = min(profile.level, len(ADAPTIVE_CRAWL_LEVELS) - 1)
+            return level_settings(level, profile.extract_depth)
+    return DEFAULT_CRAWL_SETTINGS
+
+
+def update_crawl_profile(
+    selected_domain: str, settings: CrawlSettings, crawl_yield: CrawlYield
+) -> None:
+    """
+    Learn from a crawl that could not be escalated while it ran.
+
+    If the yield would have justified a larger or deeper crawl, the site's
+    next crawl starts with those settings.
+
+    Args:
+        selected_domain (str): URL the crawl started from
+        settings (CrawlSettings): Settings of the crawl
+        crawl_yield (CrawlYield): Yield of the crawl
+    """
+    scope = (settings.limit, settings.max_depth, settings.max_breadth)
+    if not ADAPTIVE_CRAWL_ENABLED or scope not in ADAPTIVE_CRAWL_LEVELS:
+        return
+    level, extract_depth = ADAPTIVE_CRAWL_LEVELS.index(scope), settings.extract_depth
+    next_settings = escalate(level, extract_depth, crawl_yield)
+    if next_settings is not None:
+        level, extract_depth = next_settings
+    get_crawl_profile_store().set(
+        learn_profile(selected_domain, level, extract_depth, crawl_yield)
+    )
+
+
+async def crawl_async(state: AgentState) -> Dict[str, Any]:
     """
     Crawl the selected domain to find job postings.
 
@@ -32,64 +499,22 @@ def crawl(state: AgentState) -> Dict[str, Any]:
     selected_domain = state.domain_search_result.selected_domain
 
     try:
-        # Extract the base domain from selected_domain
-        parsed_url = urlparse(selected_domain)
-        base_domain_parts = parsed_url.netloc.split(".")
-
-        if len(base_domain_parts) >= 2:
-            main_domain = ".".join(base_domain_parts[-2:])
-        else:
-            main_domain = parsed_url.netloc
-
         # Call Tavily API for crawling
-        logger.info(f"Crawling {selected_domain}")
-        
-        response = requests.post(
-            "https://api.tavily.com/crawl",
-            headers={"Authorization": f"Bearer {TAVILY_API_KEY}"},
-            json={
-                "url": selected_domain,
-                "limit": DEFAULT_CRAWL_LIMIT,
-                "max_depth": 2,
-                "max_breadth": 100,
-                "extract_depth": DEFAULT_EXTRACT_DEPTH,
-                "allow_external": True,
-                "categories": ["Careers"],
-            },
-        )
-
-        # Check if the request was successful
-        if response.status_code != 200:
-            return {
-                "error": f"Error in crawling: API returned status code {response.status_code}"
-            }
+        if ADAPTIVE_CRAWL_ENABLED:
+            crawl_result = await adaptive_crawl(selected_domain)
+        else:
+            logger.info(f"Crawling {selected_domain}")
+            crawl_result, _ = await run_crawl(selected_domain, DEFAULT_CRAWL_SETTINGS)
 
-        # Parse the response
-        crawl_result_data = response.json()
-
-        # Extract links and raw content from the crawl result
-        links = []
-        raw_content_by_url = {}
-        if "results" in crawl_result_data:
-            pages = crawl_result_data["results"]
-            for page in pages:
-                if "url" in page:
-                    links.append(page["url"])
-                    # Store raw content for each URL
-                    if "raw_content" in page:
-                        raw_content_by_url[page["url"]] = page["raw_content"]
-
-        logger.info(f"Crawled {len(links)} pages")
-        # print(links)
-
-        # Create CrawlResult
-        crawl_result = CrawlResult(
-            domain=selected_domain,
-            links=links,
-            raw_content=raw_content_by_url,
-        )
+        logger.info(f"Crawled {len(crawl_result.links)} pages")
 
         return {"crawl_result": crawl_result}
 
     except Exception as e:
         return {"error": f"Error in crawling: {str(e)}"}
+
+
+# Create a synchronous wrapper for compatibility
+# Runs on the shared event loop so the pooled connections are reused
+def crawl(state: AgentState) -> Dict[str, Any]:
+    return run_sync(crawl_async(state))
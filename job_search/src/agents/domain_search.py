@@ -1,16 +1,18 @@
+import asyncio
+from functools import lru_cache
 from typing import Any, Dict
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from tavily import TavilyClient
 
 from src.models.schema import AgentState, DomainSearchResult
-from src.utils.config import TAVILY_API_KEY, get_llm
+from src.utils.domain_cache import get_domain_cache, match_careers_url
+from src.utils.event_loop import run_sync
+from src.utils.llm import get_llm
 from src.utils.setup_logger import setup_logger
+from src.utils.transport import atavily_post
 
 logger = setup_logger("Domain Search")
-# Initialize Tavily client
-tavily_client = TavilyClient(TAVILY_API_KEY)
 
 # Prompt for domain selection
 DOMAIN_SELECTION_PROMPT = """
@@ -32,7 +34,13 @@ Select the single best domain URL from the list above.
 domain_selection_prompt = ChatPromptTemplate.from_template(DOMAIN_SELECTION_PROMPT)
 
 
-def get_top_urls(query: str, num_results: int = 3) -> list:
+@lru_cache(maxsize=None)
+def get_domain_selection_chain():
+    """Build the domain selection chain once and reuse it for every company."""
+    return domain_selection_prompt | get_llm() | StrOutputParser()
+
+
+async def search_top_urls(query: str, num_results: int = 3) -> list:
     """
     Perform a Tavily search and return the top URLs from the results.
 
@@ -42,24 +50,26 @@ def get_top_urls(query: str, num_results: int = 3) -> list:
 
     Returns:
         list: List of top URLs from the search results
+
+    Raises:
+        httpx.HTTPError: If the search request fails
     """
-    try:
-        # Execute search with Tavily
-        search_results = tavily_client.search(
-            query=query, search_depth="advanced", max_results=num_results
-        )
+    # Execute search with Tavily
+    response = await atavily_post(
+        "search",
+        {"query": query, "search_depth": "advanced", "max_results": num_results},
+    )
+    response.raise_for_status()
+    search_results = response.json()
 
-        # Extract URLs from results
-        top_urls = [result["url"] for result in search_results["results"][:num_results]]
-        logger.info(f"Top URLs: {top_urls}")
+    # Extract URLs from results
+    top_urls = [result["url"] for result in search_results["results"][:num_results]]
+    logger.info(f"Top URLs: {top_urls}")
 
-        return top_urls
-    except Exception as e:
-        print(f"Error performing Tavily search: {e}")
-        return []
+    return top_urls
 
 
-def select_best_domain(company_name: str, urls: list) -> str:
+async def select_best_domain(company_name: str, urls: list) -> str:
     """
     Use LLM to select the best domain for job crawling.
 
@@ -73,11 +83,8 @@ def select_best_domain(company_name: str, urls: list) -> str:
     # Format the search results for the prompt
     formatted_results = "\n".join([f"- {url}" for url in urls])
 
-    # Create the chain for domain selection
-    chain = domain_selection_prompt | get_llm() | StrOutputParser()
-
-    # Run the chain
-    result = chain.invoke(
+    # Run the shared domain selection chain
+    result = await get_domain_selection_chain().ainvoke(
         {"company_name": company_name, "search_results": formatted_results}
     )
 
@@ -91,10 +98,13 @@ def select_best_domain(company_name: str, urls: list) -> str:
     return urls[0] if urls else ""
 
 
-def domain_search(state: AgentState) -> Dict[str, Any]:
+async def domain_search_async(state: AgentState) -> Dict[str, Any]:
     """
     Search for domains related to the company and select the best one for job crawling.
 
+    Results (and searches that found nothing) are cached per company, and the
+    LLM selector is skipped when the top result is obviously a careers site.
+
     Args:
         state (AgentState): Current state of the agent
 
@@ -105,21 +115,50 @@ def domain_search(state: AgentState) -> Dict[str, Any]:
     search_query = f"{company_name} careers"
 
     try:
-        # Get top URLs from Tavily search
-        top_urls = get_top_urls(search_query)
+        cache = get_domain_cache()
+        if cache is not None:
+            # SQLite lookups and commits run off the event loop
+            cached_result, cached_error = await asyncio.to_thread(
+                cache.get, company_name
+            )
+            if cached_result is not None:
+                logger.info(f"Using cached domain {cached_result.selected_domain}")
+                return {"domain_search_result": cached_result}
+            if cached_error is not None:
+                return {"error": cached_error}
+
+        # Get top URLs from Tavily search (errors are not cached)
+        top_urls = await search_top_urls(search_query)
 
         if not top_urls:
-            return {"error": f"No URLs found for query: {search_query}"}
+            error = f"No URLs found for query: {search_query}"
+            if cache is not None:
+                await asyncio.to_thread(cache.set_error, company_name, error)
+            return {"error": error}
 
         # Select the best domain for job crawling
-        selected_domain = select_best_domain(company_name, top_urls)
+        selected_domain = match_careers_url(company_name, top_urls)
+        if selected_domain:
+            logger.info(f"Top result {selected_domain} is a careers site")
+        else:
+            selected_domain = await select_best_domain(company_name, top_urls)
 
         # Update the state
         domain_search_result = DomainSearchResult(
             query=search_query, top_urls=top_urls, selected_domain=selected_domain
         )
+        if cache is not None:
+            await asyncio.to_thread(
+                cache.set_result, company_name, domain_search_result
+            )
 
         return {"domain_search_result": domain_search_result}
 
     except Exception as e:
         return {"error": f"Error in domain search: {str(e)}"}
+
+
+# Create a synchronous wrapper for compatibility
+# Runs on the shared event loop so the pooled connections are reused
+def domain_search(state: AgentState) -> Dict[str, Any]:
+    return run_sync(domain_search_async(state))
@@ -1,18 +1,42 @@
 import asyncio
-from typing import Any, Dict
+import hashlib
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+import openai
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from tavily import TavilyClient
 from src.utils.setup_logger import setup_logger
 
 logger = setup_logger("Extract")
 
-from src.models.schema import AgentState, ExtractResult, JobPosting
-from src.utils.config import TAVILY_API_KEY, get_llm
-
-# Initialize Tavily client
-tavily_client = TavilyClient(TAVILY_API_KEY)
+from src.models.schema import (
+    AgentState,
+    ExtractionStats,
+    ExtractResult,
+    JobPosting,
+    JobPostingList,
+)
+from src.utils.config import (
+    DEFAULT_MODEL,
+    EXTRACTION_MODE,
+    LLM_COMPLETION_TOKENS,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    MAX_CONTENT_TOKENS,
+    MULTI_BATCH_MAX_PAGES,
+    MULTI_BATCH_TOKENS,
+    MULTI_MAX_CONTENT_TOKENS,
+)
+from src.utils.content_store import PageContent, load_content, page_contents
+from src.utils.content_window import count_tokens, window_content
+from src.utils.event_loop import run_sync
+from src.utils.extraction_cache import ExtractionCache, get_extraction_cache
+from src.utils.llm import get_llm
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import estimate_tokens, get_llm_rate_limiter
+from src.utils.transport import jittered_backoff
 
 # Create a parser for JobPosting
 job_posting_parser = PydanticOutputParser(pydantic_object=JobPosting)
@@ -43,6 +67,81 @@ job_extraction_prompt = ChatPromptTemplate.from_template(
     },
 )
 
+# Prompt size without the page content, used to budget tokens per call
+PROMPT_OVERHEAD_TOKENS = estimate_tokens(
+    JOB_EXTRACTION_PROMPT + job_posting_parser.get_format_instructions()
+)
+
+# Changes whenever the prompt, output schema or content budget changes,
+# invalidating cached extractions
+PROMPT_VERSION = hashlib.sha256(
+    (
+        JOB_EXTRACTION_PROMPT
+        + job_posting_parser.get_format_instructions()
+        + str(MAX_CONTENT_TOKENS)
+    ).encode()
+).hexdigest()[:16]
+
+# Create a parser for the postings of one or more pages
+job_posting_list_parser = PydanticOutputParser(pydantic_object=JobPostingList)
+
+# Prompt for extracting every job posting from a batch of pages
+MULTI_JOB_EXTRACTION_PROMPT = """
+You are an expert at extracting structured job posting information from raw HTML or text content.
+
+Below are the contents of {page_count} careers site pages related to the search query "{search_query}". A page may describe one job posting, list several job postings, or contain none. Extract every job posting you find with the following information:
+- Job title
+- Job location (city, country, or remote status)
+- Benefits
+- URL: the "URL:" line of the page the posting was found on, copied exactly
+
+{pages}
+
+{format_instructions}
+
+If any field is not available, use "Unknown" for that field. If no page contains a job posting, return an empty list.
+"""
+
+multi_job_extraction_prompt = ChatPromptTemplate.from_template(
+    template=MULTI_JOB_EXTRACTION_PROMPT,
+    partial_variables={
+        "format_instructions": job_posting_list_parser.get_format_instructions()
+    },
+)
+
+# Overhead of the multi-posting prompt and of each page header in it
+MULTI_PROMPT_OVERHEAD_TOKENS = estimate_tokens(
+    MULTI_JOB_EXTRACTION_PROMPT + job_posting_list_parser.get_format_instructions()
+)
+PAGE_HEADER_TOKENS = 40
+
+# Version of the multi-posting prompt, keying its cached per-page extractions
+MULTI_PROMPT_VERSION = hashlib.sha256(
+    (
+        MULTI_JOB_EXTRACTION_PROMPT
+        + job_posting_list_parser.get_format_instructions()
+        + str(MULTI_MAX_CONTENT_TOKENS)
+    ).encode()
+).hexdigest()[:16]
+
+# Errors worth retrying after a backoff
+RETRYABLE_LLM_ERRORS = (openai.RateLimitError, openai.APIConnectionError)
+
+
+@lru_cache(maxsize=None)
+def get_job_extraction_chain():
+    """Build the job extraction chain once and reuse it for every call."""
+    # Retries are handled by extract_with_rate_limit
+    return job_extraction_prompt | get_llm(max_retries=0) | job_posting_parser
+
+
+@lru_cache(maxsize=None)
+def get_multi_job_extraction_chain():
+    """Build the multi-posting extraction chain once and reuse it for every call."""
+    return (
+        multi_job_extraction_prompt | get_llm(max_retries=0) | job_posting_list_parser
+    )
+
 
 async def extract_entities_async(
     url: str, content: str, search_query: str
@@ -58,15 +157,11 @@ async def extract_entities_async(
     Returns:
         JobPosting: Structured job posting information
     """
-    # Create the chain for job extraction (use async compatible LLM)
-    llm = get_llm()  # Make sure get_llm returns an async-compatible model
-    chain = job_extraction_prompt | llm | job_posting_parser
-
-    # Run the chain asynchronously
-    result = await chain.ainvoke(
+    # Run the shared chain asynchronously
+    result = await get_job_extraction_chain().ainvoke(
         {
             "url": url,
-            "content": content[:4000],
+            "content": window_content(content, MAX_CONTENT_TOKENS),
             "search_query": search_query,
         }
     )
@@ -75,6 +170,327 @@ async def extract_entities_async(
     return result
 
 
+async def call_llm_with_retries(
+    label: str,
+    tokens: int,
+    semaphore: asyncio.Semaphore,
+    stats: ExtractionStats,
+    call: Callable[[], Awaitable[Any]],
+) -> Optional[Any]:
+    """
+    Run one LLM request under the concurrency cap and the shared rate limiter.
+
+    Rate-limit and connection errors are retried with jittered exponential
+    backoff. Every outcome is counted in ``stats``.
+
+    Args:
+        label (str): What is being extracted, for log messages
+        tokens (int): Estimated prompt and completion tokens of the request
+        semaphore (asyncio.Semaphore): Cap on in-flight extraction calls
+        stats (ExtractionStats): Counters updated in place
+        call (Callable[[], Awaitable[Any]]): Sends the request
+
+    Returns:
+        Optional[Any]: The parsed response, or None if it was dropped
+    """
+    rate_limiter = get_llm_rate_limiter()
+    metrics = get_metrics()
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            queued_at = time.perf_counter()
+            async with semaphore:
+                stats.rate_limit_wait_seconds += await rate_limiter.acquire(tokens)
+                # Time spent waiting for a concurrency slot and the rate limiter
+                metrics.observe(
+                    "extraction_wait_seconds", time.perf_counter() - queued_at
+                )
+                stats.llm_calls += 1
+                result = await call()
+        except RETRYABLE_LLM_ERRORS as e:
+            if attempt == LLM_MAX_RETRIES:
+                logger.warning(f"Dropping {label} after {attempt + 1} attempts: {e}")
+                break
+            response = getattr(e, "response", None)
+            retry_after = (
+                response.headers.get("retry-after") if response is not None else None
+            )
+            delay = jittered_backoff(attempt, retry_after=retry_after)
+            stats.retried += 1
+            logger.warning(f"Rate limited on {label}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            logger.warning(f"Dropping {label}: {e}")
+            break
+        else:
+            stats.succeeded += 1
+            return result
+
+    stats.dropped += 1
+    return None
+
+
+async def extract_with_rate_limit(
+    url: str,
+    content: PageContent,
+    search_query: str,
+    semaphore: asyncio.Semaphore,
+    stats: ExtractionStats,
+) -> Optional[JobPosting]:
+    """
+    Extract one job posting under the concurrency cap and the shared rate limiter.
+
+    Pages whose content was already extracted are served from the extraction
+    cache without an LLM call. Spilled page bodies are loaded again when the
+    request is sent, so pages waiting for a slot hold no content in memory.
+
+    Args:
+        url (str): URL of the job posting
+        content (PageContent): Raw content of the job posting page, or a
+            handle to it
+        search_query (str): Search query used to find the job posting
+        semaphore (asyncio.Semaphore): Cap on in-flight extraction calls
+        stats (ExtractionStats): Counters updated in place
+
+    Returns:
+        Optional[JobPosting]: The job posting, or None if it was dropped
+    """
+    text = load_content(content)
+    cache = get_extraction_cache()
+    if cache is not None:
+        cache_key = ExtractionCache.make_key(PROMPT_VERSION, DEFAULT_MODEL, url, text)
+        # SQLite lookups run off the event loop
+        cached_posting = await asyncio.to_thread(cache.get, cache_key)
+        if cached_posting is not None:
+            stats.cache_hits += 1
+            return cached_posting
+
+    tokens = (
+        PROMPT_OVERHEAD_TOKENS
+        + min(estimate_tokens(text), MAX_CONTENT_TOKENS)
+        + LLM_COMPLETION_TOKENS
+    )
+    del text
+    job_posting = await call_llm_with_retries(
+        url,
+        tokens,
+        semaphore,
+        stats,
+        lambda: extract_entities_async(url, load_content(content), search_query),
+    )
+    if job_posting is not None and cache is not None:
+        await asyncio.to_thread(cache.set, cache_key, job_posting)
+    return job_posting
+
+
+def pack_pages(pages: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    """
+    Group windowed pages into batches that each fit one multi-posting request.
+
+    Pages are packed greedily in crawl order until a batch reaches
+    ``MULTI_BATCH_TOKENS`` tokens or ``MULTI_BATCH_MAX_PAGES`` pages. A page
+    larger than the batch budget is sent on its own.
+
+    Args:
+        pages (List[Tuple[str, str]]): ``(url, windowed content)`` pairs
+
+    Returns:
+        List[List[Tuple[str, str]]]: Batches of ``(url, windowed content)`` pairs
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    batch: List[Tuple[str, str]] = []
+    batch_tokens = 0
+    for url, content in pages:
+        tokens = count_tokens(content) + PAGE_HEADER_TOKENS
+        if batch and (
+            batch_tokens + tokens > MULTI_BATCH_TOKENS
+            or len(batch) >= MULTI_BATCH_MAX_PAGES
+        ):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append((url, content))
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def extract_batch_async(
+    batch: List[Tuple[str, str]], search_query: str
+) -> Dict[str, List[JobPosting]]:
+    """
+    Extract every job posting from a batch of pages in one LLM request.
+
+    Each posting is attributed to the page named by its ``url``. Postings the
+    model attributes to a URL outside the batch are dropped, unless the batch
+    holds a single page.
+
+    Args:
+        batch (List[Tuple[str, str]]): ``(url, windowed content)`` pairs
+        search_query (str): Search query used to find the pages
+
+    Returns:
+        Dict[str, List[JobPosting]]: Job postings keyed by page URL
+    """
+    pages = "\n\n".join(
+        f"--- Page {i} ---\nURL: {url}\n\nContent:\n{content}"
+        for i, (url, content) in enumerate(batch, start=1)
+    )
+    result = await get_multi_job_extraction_chain().ainvoke(
+        {"page_count": len(batch), "pages": pages, "search_query": search_query}
+    )
+
+    postings_by_url: Dict[str, List[JobPosting]] = {url: [] for url, _ in batch}
+    for job_posting in result.job_postings:
+        url = job_posting.url.strip()
+        if url not in postings_by_url and len(batch) == 1:
+            url = batch[0][0]
+        if url not in postings_by_url:
+            logger.warning(f"Dropping posting with unknown page URL {url}")
+            continue
+        job_posting.url = url
+        postings_by_url[url].append(job_posting)
+    return postings_by_url
+
+
+async def extract_pages_multi(
+    pages: List[Tuple[str, PageContent]],
+    search_query: str,
+    semaphore: asyncio.Semaphore,
+    stats: ExtractionStats,
+) -> Dict[str, List[JobPosting]]:
+    """
+    Extract every job posting from a set of pages, batching small pages.
+
+    Listing pages yield all of their postings instead of one, and several
+    small pages share one LLM request, so fewer calls are spent per job.
+    Extractions are cached per page, so a cached page is never re-sent.
+
+    Args:
+        pages (List[Tuple[str, PageContent]]): ``(url, raw content)`` pairs,
+            where spilled contents are handles loaded one page at a time
+        search_query (str): Search query used to find the pages
+        semaphore (asyncio.Semaphore): Cap on in-flight extraction calls
+        stats (ExtractionStats): Counters updated in place
+
+    Returns:
+        Dict[str, List[JobPosting]]: Job postings keyed by page URL, without
+            the pages whose extraction was dropped
+    """
+    cache = get_extraction_cache()
+    postings_by_url: Dict[str, List[JobPosting]] = {}
+    cache_keys: Dict[str, str] = {}
+    uncached = []
+    for url, content in pages:
+        content = load_content(content)
+        if cache is not None:
+            cache_keys[url] = ExtractionCache.make_key(
+                MULTI_PROMPT_VERSION, DEFAULT_MODEL, url, content
+            )
+            cached = await asyncio.to_thread(cache.get, cache_keys[url], JobPostingList)
+            if cached is not None:
+                stats.cache_hits += 1
+                postings_by_url[url] = cached.job_postings
+                continue
+        uncached.append((url, window_content(content, MULTI_MAX_CONTENT_TOKENS)))
+
+    async def extract_batch(batch: List[Tuple[str, str]]) -> None:
+        tokens = (
+            MULTI_PROMPT_OVERHEAD_TOKENS
+            + sum(estimate_tokens(content) + PAGE_HEADER_TOKENS for _, content in batch)
+            + LLM_COMPLETION_TOKENS * len(batch)
+        )
+        label = batch[0][0] if len(batch) == 1 else f"batch of {len(batch)} pages"
+        result = await call_llm_with_retries(
+            label,
+            tokens,
+            semaphore,
+            stats,
+            lambda: extract_batch_async(batch, search_query),
+        )
+        if result is None:
+            return
+        for url, job_postings in result.items():
+            postings_by_url[url] = job_postings
+            if cache is not None:
+                await asyncio.to_thread(
+                    cache.set,
+                    cache_keys[url],
+                    JobPostingList(job_postings=job_postings),
+                )
+
+    await asyncio.gather(*(extract_batch(batch) for batch in pack_pages(uncached)))
+
+    return postings_by_url
+
+
+async def extract_pages(
+    pages: List[Tuple[str, PageContent]],
+    search_query: str,
+    semaphore: asyncio.Semaphore,
+    stats: ExtractionStats,
+) -> Dict[str, List[JobPosting]]:
+    """
+    Extract the job postings of a set of pages in the configured extraction mode.
+
+    Args:
+        pages (List[Tuple[str, PageContent]]): ``(url, raw content)`` pairs,
+            where spilled contents are handles loaded one page at a time
+        search_query (str): Search query used to find the pages
+        semaphore (asyncio.Semaphore): Cap on in-flight extraction calls
+        stats (ExtractionStats): Counters updated in place
+
+    Returns:
+        Dict[str, List[JobPosting]]: Job postings keyed by page URL, without
+            the pages whose extraction was dropped
+    """
+    if EXTRACTION_MODE == "multi":
+        # Read every posting per page, several small pages per request
+        return await extract_pages_multi(pages, search_query, semaphore, stats)
+
+    # Execute all tasks under the concurrency cap and rate limiter
+    job_postings = await asyncio.gather(
+        *(
+            extract_with_rate_limit(url, content, search_query, semaphore, stats)
+            for url, content in pages
+        )
+    )
+
+    # Filter out dropped extractions
+    return {
+        url: [job_posting]
+        for (url, _), job_posting in zip(pages, job_postings)
+        if job_posting is not None
+    }
+
+
+def dedupe_postings(job_postings: List[JobPosting]) -> List[JobPosting]:
+    """
+    Merge postings extracted more than once from the same page.
+
+    Postings are matched by page URL, title and location; the copy with the
+    most benefits is kept. Postings on different pages are never merged, since
+    distinct openings often share a title and location.
+
+    Args:
+        job_postings (List[JobPosting]): Extracted job postings
+
+    Returns:
+        List[JobPosting]: Job postings without duplicates, in first-seen order
+    """
+    unique: Dict[Tuple[str, str, str], JobPosting] = {}
+    for job_posting in job_postings:
+        key = (
+            job_posting.url.strip(),
+            job_posting.title.strip().lower(),
+            job_posting.location.strip().lower(),
+        )
+        if key not in unique or len(job_posting.benefits) > len(unique[key].benefits):
+            unique[key] = job_posting
+    return list(unique.values())
+
+
 async def extract_async(state: AgentState) -> Dict[str, Any]:
     """
     Extract job posting entities from the raw content of the crawled links.
@@ -101,36 +517,41 @@ async def extract_async(state: AgentState) -> Dict[str, Any]:
             search_query = state.domain_search_result.query
 
         # Process job postings from the raw content already available from crawl step
-        job_postings = []
-
-        # Access the raw content from the crawl result
-        raw_content_by_url = (
-            state.crawl_result.raw_content
-            if hasattr(state.crawl_result, "raw_content")
-            else {}
+        # Spilled page bodies are handles, loaded lazily during extraction
+        stats = ExtractionStats(
+            duplicates_skipped=len(state.crawl_result.duplicate_links)
+        )
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+        # Collect all URLs with content
+        pages = [
+            (url, content)
+            for url, content in page_contents(state.crawl_result).items()
+            if content
+        ]
+
+        postings_by_url = await extract_pages(pages, search_query, semaphore, stats)
+        job_postings = [
+            job_posting
+            for url, _ in pages
+            for job_posting in postings_by_url.get(url, [])
+        ]
+        if EXTRACTION_MODE == "multi":
+            job_postings = dedupe_postings(job_postings)
+
+        logger.info(
+            f"Extraction stats: {stats.llm_calls} LLM calls, "
+            f"{stats.succeeded} succeeded, {stats.retried} retried, "
+            f"{stats.dropped} dropped, {stats.cache_hits} from cache, "
+            f"{stats.duplicates_skipped} duplicate pages skipped, "
+            f"{stats.rate_limit_wait_seconds:.1f}s waiting on rate limits"
         )
-
-        # Create tasks for all URLs with content
-        tasks = []
-        for url in links:
-            if url in raw_content_by_url and raw_content_by_url[url]:
-                content = raw_content_by_url[url]
-                # Add task
-                task = extract_entities_async(url, content, search_query)
-                tasks.append(task)
-
-        # Execute all tasks concurrently
-        if tasks:
-            job_postings = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filter out exceptions
-            job_postings = [jp for jp in job_postings if not isinstance(jp, Exception)]
 
         if not job_postings:
             return {"error": "Failed to extract any job postings."}
 
         # Create ExtractResult
-        extract_result = ExtractResult(extracted_jobs=job_postings)
+        extract_result = ExtractResult(extracted_jobs=job_postings, stats=stats)
 
         logger.info(f"Extracted {len(job_postings)} job postings")
         return {"extract_result": extract_result}
@@ -144,5 +565,6 @@ async def extract_async(state: AgentState) -> Dict[str, Any]:
 
 
 # Create a synchronous wrapper for compatibility
+# Runs on the shared event loop so the pooled LLM connections are reused
 def extract(state: AgentState) -> Dict[str, Any]:
-    return asyncio.run(extract_async(state))
+    return run_sync(extract_async(state))
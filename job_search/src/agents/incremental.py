@@ -0,0 +1,209 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from src.agents.extract import dedupe_postings, extract_pages
+from src.models.schema import (
+    AgentState,
+    CompanyState,
+    DomainSearchResult,
+    ExtractionStats,
+    ExtractResult,
+    JobEvent,
+    JobPosting,
+    PageState,
+)
+from src.utils.company_state import content_hash, get_company_state_store
+from src.utils.config import EXTRACTION_MODE, LLM_MAX_CONCURRENCY
+from src.utils.content_store import PageContent, load_content, page_contents
+from src.utils.event_loop import run_sync
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Incremental")
+
+
+def load_company_state(state: AgentState) -> Dict[str, Any]:
+    """
+    Reuse the domain selected in the company's previous run, if there was one.
+
+    Args:
+        state (AgentState): Current state of the agent
+
+    Returns:
+        Dict[str, Any]: Updated state (empty on the first run)
+    """
+    company_state = get_company_state_store().get(state.company_name)
+    if company_state is None:
+        logger.info(f"No previous run for {state.company_name}")
+        return {}
+
+    logger.info(f"Reusing domain {company_state.domain} for {state.company_name}")
+    domain_search_result = DomainSearchResult(
+        query=f"{state.company_name} careers",
+        top_urls=[company_state.domain],
+        selected_domain=company_state.domain,
+    )
+    return {"domain_search_result": domain_search_result}
+
+
+def diff_postings(old: List[JobPosting], new: List[JobPosting]) -> List[JobEvent]:
+    """
+    Compare two runs' job postings and list what was added, removed or changed.
+
+    Postings are matched per URL: a page with one posting in both runs is
+    matched directly, so a retitled job counts as changed. Pages with several
+    postings (listings) are matched by title.
+
+    Args:
+        old (List[JobPosting]): Job postings of the previous run
+        new (List[JobPosting]): Job postings of the current run
+
+    Returns:
+        List[JobEvent]: Added and changed jobs in current order, then removed jobs
+    """
+    old_by_url: Dict[str, List[JobPosting]] = defaultdict(list)
+    new_by_url: Dict[str, List[JobPosting]] = defaultdict(list)
+    for job_posting in old:
+        old_by_url[job_posting.url].append(job_posting)
+    for job_posting in new:
+        new_by_url[job_posting.url].append(job_posting)
+
+    def key(job_posting: JobPosting) -> Tuple[str, str]:
+        if len(old_by_url[job_posting.url]) == len(new_by_url[job_posting.url]) == 1:
+            return job_posting.url, ""
+        return job_posting.url, job_posting.title.strip().lower()
+
+    old_by_key = {key(job_posting): job_posting for job_posting in old}
+    new_keys = set()
+    events = []
+    for job_posting in new:
+        new_keys.add(key(job_posting))
+        previous = old_by_key.get(key(job_posting))
+        if previous is None:
+            events.append(JobEvent(event="added", job_posting=job_posting))
+        elif previous != job_posting:
+            events.append(
+                JobEvent(event="changed", job_posting=job_posting, previous=previous)
+            )
+    for job_key, job_posting in old_by_key.items():
+        if job_key not in new_keys:
+            events.append(JobEvent(event="removed", job_posting=job_posting))
+    return events
+
+
+def hash_pages(pages: List[Tuple[str, PageContent]]) -> Dict[str, str]:
+    """Hash page contents, loading spilled page bodies one at a time."""
+    return {url: content_hash(load_content(content)) for url, content in pages}
+
+
+def flatten_postings(pages: Dict[str, PageState]) -> List[JobPosting]:
+    """List the job postings of stored pages, in page order."""
+    job_postings = [
+        job_posting
+        for page_state in pages.values()
+        for job_posting in page_state.job_postings
+    ]
+    if EXTRACTION_MODE == "multi":
+        job_postings = dedupe_postings(job_postings)
+    return job_postings
+
+
+async def incremental_extract_async(state: AgentState) -> Dict[str, Any]:
+    """
+    Extract job postings from new and changed pages only, and report changes.
+
+    Page contents are hashed and compared with the company's previous run.
+    Unchanged pages reuse their stored job postings, so the LLM work is
+    proportional to what changed on the site. Pages whose extraction fails
+    keep their previous state and are retried on the next run.
+
+    Args:
+        state (AgentState): Current state of the agent
+
+    Returns:
+        Dict[str, Any]: Updated state
+    """
+    # Check if crawl was successful
+    if not state.crawl_result:
+        return {"error": "Crawl result not available. Run crawl first."}
+
+    try:
+        # Store access and hashing run off the event loop, so a large recrawl
+        # does not stall the other companies of a batch
+        store = get_company_state_store()
+        previous = await asyncio.to_thread(store.get, state.company_name)
+        previous_pages = previous.pages if previous is not None else {}
+
+        search_query = state.domain_search_result.query
+        pages = [
+            (url, content)
+            for url, content in page_contents(state.crawl_result).items()
+            if content
+        ]
+        hashes = await asyncio.to_thread(hash_pages, pages)
+        changed_pages = [
+            (url, content)
+            for url, content in pages
+            if url not in previous_pages
+            or previous_pages[url].content_hash != hashes[url]
+        ]
+
+        stats = ExtractionStats(
+            duplicates_skipped=len(state.crawl_result.duplicate_links)
+        )
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        postings_by_url = await extract_pages(
+            changed_pages, search_query, semaphore, stats
+        )
+
+        current_pages = {}
+        for url, _ in pages:
+            if url in postings_by_url:
+                current_pages[url] = PageState(
+                    content_hash=hashes[url], job_postings=postings_by_url[url]
+                )
+            elif url in previous_pages:
+                current_pages[url] = previous_pages[url]
+
+        job_postings = flatten_postings(current_pages)
+        events = diff_postings(flatten_postings(previous_pages), job_postings)
+
+        await asyncio.to_thread(
+            store.set,
+            CompanyState(
+                company_name=state.company_name,
+                domain=state.domain_search_result.selected_domain,
+                pages=current_pages,
+                updated_at=time.time(),
+            ),
+        )
+
+        counts = {kind: 0 for kind in ("added", "removed", "changed")}
+        for event in events:
+            counts[event.event] += 1
+        logger.info(
+            f"Extracted {len(changed_pages)} new or changed pages of {len(pages)}: "
+            f"{counts['added']} added, {counts['removed']} removed, "
+            f"{counts['changed']} changed jobs"
+        )
+
+        extract_result = ExtractResult(
+            extracted_jobs=job_postings, stats=stats, events=events
+        )
+        if not job_postings:
+            return {
+                "extract_result": extract_result,
+                "error": "Failed to extract any job postings.",
+            }
+        return {"extract_result": extract_result}
+
+    except Exception as e:
+        logger.error(f"Error in incremental extraction: {str(e)}")
+        return {"error": f"Error in incremental extraction: {str(e)}"}
+
+
+# Create a synchronous wrapper for compatibility
+# Runs on the shared event loop so the pooled LLM connections are reused
+def incremental_extract(state: AgentState) -> Dict[str, Any]:
+    return run_sync(incremental_extract_async(state))
@@ -0,0 +1,76 @@
+from typing import Any, Dict
+
+from src.models.schema import AgentState, CrawlResult
+from src.utils.config import EXTRACTION_MODE
+from src.utils.content_store import load_content, page_contents
+from src.utils.metrics import get_metrics
+from src.utils.near_duplicates import DuplicateIndex
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Page Dedup")
+
+
+def page_dedup(state: AgentState) -> Dict[str, Any]:
+    """
+    Collapse crawled pages that are the same posting before extraction.
+
+    URL variants (tracking or locale parameters, trailing slashes) and pages
+    with identical or near-identical bodies (postings mirrored on an ATS) are
+    extracted once, from the first copy crawled.
+
+    Args:
+        state (AgentState): Current state of the agent
+
+    Returns:
+        Dict[str, Any]: Updated state
+    """
+    # Check if crawl was successful
+    if not state.crawl_result:
+        return {"error": "Crawl result not available. Run crawl first."}
+
+    crawl_result = state.crawl_result
+    contents = page_contents(crawl_result)
+    index = DuplicateIndex()
+    kept_links = []
+    duplicate_links = {}
+    for url in crawl_result.links:
+        # Spilled page bodies are loaded one at a time
+        content = load_content(contents[url]) if url in contents else None
+        duplicate_of = index.add(url, content)
+        if duplicate_of is None:
+            kept_links.append(url)
+        else:
+            duplicate_links[url] = duplicate_of
+            logger.debug(f"Skipping {url} (duplicate of {duplicate_of})")
+
+    if not duplicate_links:
+        return {}
+
+    get_metrics().increment("duplicate_pages", len(duplicate_links))
+    logger.info(
+        f"Collapsed {len(duplicate_links)} duplicate pages, "
+        + (
+            f"saving {len(duplicate_links)} LLM calls"
+            if EXTRACTION_MODE == "single"
+            else "keeping them out of the extraction batches"
+        )
+    )
+
+    deduplicated_crawl_result = CrawlResult(
+        domain=crawl_result.domain,
+        links=kept_links,
+        raw_content={
+            url: crawl_result.raw_content[url]
+            for url in kept_links
+            if url in crawl_result.raw_content
+        },
+        content_handles={
+            url: crawl_result.content_handles[url]
+            for url in kept_links
+            if url in crawl_result.content_handles
+        },
+        dropped_links=crawl_result.dropped_links,
+        duplicate_links={**crawl_result.duplicate_links, **duplicate_links},
+        settings=crawl_result.settings,
+    )
+    return {"crawl_result": deduplicated_crawl_result}
@@ -0,0 +1,70 @@
+from typing import Any, Dict
+
+from src.models.schema import AgentState, CrawlResult
+from src.utils.config import EXTRACTION_MODE, PAGE_FILTER_MIN_SCORE
+from src.utils.content_store import load_content, page_contents
+from src.utils.page_classifier import classify_page
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Page Filter")
+
+
+def page_filter(state: AgentState) -> Dict[str, Any]:
+    """
+    Drop crawled pages that are unlikely to be job postings before extraction.
+
+    Pages are scored locally from URL patterns and weighted keywords, so no
+    LLM call is spent on privacy policies, blog posts or culture pages. In
+    multi extraction mode, listing pages with several postings are kept.
+
+    Args:
+        state (AgentState): Current state of the agent
+
+    Returns:
+        Dict[str, Any]: Updated state
+    """
+    # Check if crawl was successful
+    if not state.crawl_result:
+        return {"error": "Crawl result not available. Run crawl first."}
+
+    crawl_result = state.crawl_result
+    contents = page_contents(crawl_result)
+    kept_links = []
+    dropped_links = []
+    for url in crawl_result.links:
+        # Spilled page bodies are loaded one at a time
+        content = load_content(contents[url]) if url in contents else None
+        keep, score = classify_page(
+            url, content, PAGE_FILTER_MIN_SCORE, EXTRACTION_MODE
+        )
+        if keep:
+            kept_links.append(url)
+        else:
+            dropped_links.append(url)
+            logger.debug(f"Dropping {url} (score {score:.2f})")
+
+    logger.info(
+        f"Kept {len(kept_links)} of {len(crawl_result.links)} pages for extraction"
+    )
+
+    if not kept_links:
+        return {"error": "No job posting pages found in crawl result."}
+
+    filtered_crawl_result = CrawlResult(
+        domain=crawl_result.domain,
+        links=kept_links,
+        raw_content={
+            url: crawl_result.raw_content[url]
+            for url in kept_links
+            if url in crawl_result.raw_content
+        },
+        content_handles={
+            url: crawl_result.content_handles[url]
+            for url in kept_links
+            if url in crawl_result.content_handles
+        },
+        dropped_links=crawl_result.dropped_links + dropped_links,
+        duplicate_links=crawl_result.duplicate_links,
+        settings=crawl_result.settings,
+    )
+    return {"crawl_result": filtered_crawl_result}
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from src.agents.crawl import crawl_settings, iter_crawl_pages, update_crawl_profile
+from src.agents.extract import (
+    dedupe_postings,
+    extract_pages_multi,
+    extract_with_rate_limit,
+)
+from src.models.schema import (
+    AgentState,
+    CrawlResult,
+    CrawlYield,
+    ExtractionStats,
+    ExtractResult,
+    JobPosting,
+)
+from src.utils.config import (
+    EXTRACTION_MODE,
+    LLM_MAX_CONCURRENCY,
+    PAGE_DEDUP_ENABLED,
+    PAGE_FILTER_ENABLED,
+    PAGE_FILTER_MIN_SCORE,
+    PIPELINE_QUEUE_SIZE,
+)
+from src.utils.crawl_profiles import record_page
+from src.utils.event_loop import run_sync
+from src.utils.metrics import get_metrics
+from src.utils.near_duplicates import DuplicateIndex
+from src.utils.page_classifier import classify_page
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Pipeline")
+
+# Marks the end of the crawl on the page queue
+_END_OF_CRAWL = None
+
+
+async def crawl_and_extract_async(state: AgentState) -> Dict[str, Any]:
+    """
+    Crawl the selected domain and extract job postings as pages arrive.
+
+    Pages are parsed incrementally from the crawl response and pushed onto a
+    bounded queue that extraction workers consume straight away, so crawl I/O
+    and LLM latency overlap. Page bodies are dropped once extracted and are
+    not kept in the returned ``CrawlResult``.
+
+    Args:
+        state (AgentState): Current state of the agent
+
+    Returns:
+        Dict[str, Any]: Updated state
+    """
+    # Check if domain search was successful
+    if not state.domain_search_result:
+        return {"error": "Domain search result not available. Run domain search first."}
+
+    selected_domain = state.domain_search_result.selected_domain
+    search_query = state.domain_search_result.query
+    # Pages are extracted as they arrive, so the crawl is not escalated; it
+    # uses the settings learned for the site, and its yield updates them
+    settings = await asyncio.to_thread(crawl_settings, selected_domain)
+    crawl_yield = CrawlYield()
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    stats = ExtractionStats()
+    links = []
+    dropped_links = []
+    duplicate_links = {}
+    duplicate_index = DuplicateIndex()
+    job_postings = []
+    crawl_error: Optional[Exception] = None
+    start = time.perf_counter()
+
+    async def produce() -> None:
+        """Stream crawled pages onto the queue."""
+        nonlocal crawl_error
+        try:
+            async for page in iter_crawl_pages(selected_domain, settings):
+                # Waits while the queue is full, applying back-pressure
+                await queue.put((time.perf_counter(), page))
+        except Exception as e:
+            crawl_error = e
+        finally:
+            for _ in range(LLM_MAX_CONCURRENCY):
+                await queue.put(_END_OF_CRAWL)
+
+    async def consume() -> None:
+        """Extract job postings from queued pages until the crawl ends."""
+        while True:
+            item = await queue.get()
+            if item is _END_OF_CRAWL:
+                return
+            queued_at, page = item
+            get_metrics().observe(
+                "pipeline_queue_wait_seconds", time.perf_counter() - queued_at
+            )
+            url = page["url"]
+            if not links and not dropped_links and not duplicate_links:
+                logger.info(
+                    f"First page received after {time.perf_counter() - start:.1f}s"
+                )
+            content = page.get("raw_content")
+            record_page(crawl_yield, url, content)
+            if PAGE_FILTER_ENABLED:
+                keep, _ = classify_page(
+                    url, content, PAGE_FILTER_MIN_SCORE, EXTRACTION_MODE
+                )
+                if not keep:
+                    dropped_links.append(url)
+                    continue
+            if PAGE_DEDUP_ENABLED:
+                duplicate_of = duplicate_index.add(url, content)
+                if duplicate_of is not None:
+                    duplicate_links[url] = duplicate_of
+                    stats.duplicates_skipped += 1
+                    continue
+            links.append(url)
+            if not content:
+                continue
+            if EXTRACTION_MODE == "multi":
+                # Pages are extracted as they arrive, so they are not batched
+                postings_by_url = await extract_pages_multi(
+                    [(url, content)], search_query, semaphore, stats
+                )
+                job_postings.extend(postings_by_url.get(url, []))
+                continue
+            job_posting: Optional[JobPosting] = await extract_with_rate_limit(
+                url, content, search_query, semaphore, stats
+            )
+            if job_posting is not None:
+                job_postings.append(job_posting)
+
+    logger.info(f"Crawling and extracting {selected_domain}")
+    await asyncio.gather(produce(), *(consume() for _ in range(LLM_MAX_CONCURRENCY)))
+
+    # Every received page is in exactly one of these, kept or skipped
+    pages_crawled = len(links) + len(dropped_links) + len(duplicate_links)
+    logger.info(
+        f"Crawled {pages_crawled} pages "
+        f"and extracted {len(job_postings)} job postings "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+    if crawl_error is not None and not pages_crawled:
+        return {"error": f"Error in crawling: {str(crawl_error)}"}
+    if crawl_error is not None:
+        logger.warning(f"Crawl ended early: {crawl_error}")
+    else:
+        await asyncio.to_thread(
+            update_crawl_profile, selected_domain, settings, crawl_yield
+        )
+
+    if dropped_links:
+        logger.info(f"Skipped {len(dropped_links)} non-job pages")
+    if duplicate_links:
+        get_metrics().increment("duplicate_pages", len(duplicate_links))
+        logger.info(f"Skipped {len(duplicate_links)} duplicate pages")
+
+    if EXTRACTION_MODE == "multi":
+        job_postings = dedupe_postings(job_postings)
+
+    crawl_result = CrawlResult(
+        domain=selected_domain,
+        links=links,
+        dropped_links=dropped_links,
+        duplicate_links=duplicate_links,
+        settings=settings,
+    )
+    if not job_postings:
+        return {
+            "crawl_result": crawl_result,
+            "error": "Failed to extract any job postings.",
+        }
+
+    extract_result = ExtractResult(extracted_jobs=job_postings, stats=stats)
+    return {"crawl_result": crawl_result, "extract_result": extract_result}
+
+
+# Create a synchronous wrapper for compatibility
+# Runs on the shared event loop so the pooled LLM connections are reused
+def crawl_and_extract(state: AgentState) -> Dict[str, Any]:
+    return run_sync(crawl_and_extract_async(state))
@@ -1,13 +1,160 @@
 import argparse
+import asyncio
+import csv
+import json
 import os
 import sys
+import time
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.agents.agent import run_job_search_agent, save_results_to_file
+from src.agents.agent import (
+    arun_job_search_batch,
+    run_job_search_agent,
+    save_results_to_file,
+)
+from src.utils.checkpoint import get_checkpoint_store
+from src.utils.config import BATCH_CONCURRENCY, METRICS_HOST, STREAMING_PIPELINE
+from src.utils.domain_cache import get_domain_cache
+from src.utils.extraction_cache import get_extraction_cache
+from src.utils.llm import get_llm_stats
+from src.utils.metrics import get_metrics
+from src.utils.result_sink import (
+    ResultSink,
+    open_postings_sink,
+    open_result_sink,
+    set_postings_sink,
+)
+
+
+def print_client_stats() -> None:
+    """Print LLM client reuse, HTTP connection reuse and cache stats for the run."""
+    stats = get_llm_stats()
+    print(
+        f"LLM clients constructed: {stats['constructions']} "
+        f"({stats['construction_seconds']:.3f}s), registry hits: {stats['hits']}"
+    )
+    print(
+        f"HTTP requests: {stats['async_requests']}, "
+        f"connections opened: {stats['async_connections']}, "
+        f"connection reuse rate: {stats['connection_reuse_rate']:.1%}"
+    )
+
+    cache = get_extraction_cache()
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(
+            f"Extraction cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.1%} hit rate, {cache_stats['entries']} entries)"
+        )
+
+    domain_cache = get_domain_cache()
+    if domain_cache is not None:
+        domain_stats = domain_cache.stats()
+        print(
+            f"Domain cache: {domain_stats['hits']} hits, "
+            f"{domain_stats['misses']} misses ({domain_stats['hit_rate']:.1%} hit rate)"
+        )
+
+
+def close_postings_sink(sink: Optional[ResultSink], finalize: bool = True) -> None:
+    """
+    Flush and close the job postings file.
+
+    Args:
+        sink (Optional[ResultSink]): Sink of the postings file, if any
+        finalize (bool): Rename the file into place; a failed run keeps the
+            postings written so far in ``<path>.partial``
+    """
+    if sink is None:
+        return
+    set_postings_sink(None)
+    sink.close(finalize=finalize)
+    path = sink.path if finalize else sink.partial_path
+    print(f"Job postings saved to {path} ({sink.rows_written} rows)")
+
+
+def load_companies(path: str) -> List[str]:
+    """
+    Load company names from a CSV or JSONL file.
+
+    CSV files use the ``company_name`` column if present, otherwise the first
+    column. JSONL files use the ``company_name`` key of each line.
+
+    Args:
+        path (str): Path to the companies file
+
+    Returns:
+        List[str]: Company names in file order
+    """
+    companies = []
+    with open(path, newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    companies.append(json.loads(line)["company_name"])
+        else:
+            rows = list(csv.reader(f))
+            column = 0
+            if rows and "company_name" in rows[0]:
+                column = rows[0].index("company_name")
+                rows = rows[1:]
+            companies = [row[column] for row in rows if row and row[column].strip()]
+    return [company.strip() for company in companies]
+
+
+async def run_batch(
+    companies: List[str],
+    output: str,
+    concurrency: int,
+    streaming: bool,
+    incremental: bool = False,
+    run_id: Optional[str] = None,
+) -> None:
+    """
+    Run the job search for many companies and stream results to a JSONL file.
+
+    Args:
+        companies (List[str]): Company names to search for
+        output (str): Path of the ``.jsonl`` or ``.jsonl.gz`` output file
+        concurrency (int): Maximum number of companies processed at once
+        streaming (bool): Overlap crawling and extraction
+        incremental (bool): Extract only pages changed since the previous run
+        run_id (Optional[str]): Checkpoint node outputs under this run id
+    """
+    start = time.perf_counter()
+    completed = 0
+    failed = 0
+
+    # Each result is written as soon as it finishes, so a killed run keeps
+    # every finished company in ``<output>.partial``; the file is renamed into
+    # place once the batch completes
+    with open_result_sink(output, buffer_rows=1) as sink:
+        print(f"Writing results to {sink.partial_path} until the batch completes")
+        async for result in arun_job_search_batch(
+            companies,
+            concurrency,
+            streaming=streaming,
+            incremental=incremental,
+            run_id=run_id,
+        ):
+            sink.write(result)
+            completed += 1
+            if result.get("error"):
+                failed += 1
+            print(f"[{completed}/{len(companies)}] {result['company_name']} done")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nBatch completed. Results saved to {output}")
+    print(f"Companies processed: {completed} ({failed} with errors)")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print(f"Throughput: {completed / elapsed * 60:.2f} companies/min")
+    print_client_stats()
 
 
 def main():
@@ -19,15 +166,100 @@ def main():
 
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Job Search Agent")
-    parser.add_argument("company_name", help="Name of the company to search for")
+    parser.add_argument(
+        "company_name", nargs="?", help="Name of the company to search for"
+    )
     parser.add_argument(
         "--output",
         "-o",
-        default="job_search/results/job_search_results.json",
-        help="Output file name or path",
+        help="Output file name or path (.json, .jsonl or .jsonl.gz)",
+    )
+    parser.add_argument(
+        "--postings-output",
+        help="Also append every extracted job posting, one row per posting, "
+        "to this .jsonl, .jsonl.gz or .parquet file",
+    )
+    parser.add_argument(
+        "--companies-file",
+        help="CSV or JSONL file of companies to search for in one batch",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help="Maximum number of companies processed at once in batch mode",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=STREAMING_PIPELINE,
+        help="Extract job postings while the crawl is still streaming in",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Extract only pages that changed since the previous run and "
+        "report added, removed and changed jobs",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint every node's output so the run can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume a checkpointed run, running only its unfinished nodes",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a p50/p95/p99 breakdown of node, HTTP and LLM timings",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Append every timing, size and token count to this JSONL file",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve metrics in the Prometheus text format on this port",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default=METRICS_HOST,
+        help="Interface the metrics port listens on (0.0.0.0 for remote scraping)",
     )
     args = parser.parse_args()
 
+    if args.metrics_file:
+        get_metrics().open_jsonl(args.metrics_file)
+    if args.metrics_port is not None:
+        get_metrics().serve_prometheus(args.metrics_port, args.metrics_host)
+
+    run_id = None
+    companies = None
+    if args.resume:
+        run = get_checkpoint_store().get_run(args.resume)
+        if run is None:
+            parser.error(f"No checkpointed run {args.resume}")
+        print(f"Resuming run {args.resume}")
+        run_id = args.resume
+        options = run["options"]
+        args.output = options["output"]
+        args.stream = options["stream"]
+        args.incremental = options["incremental"]
+        args.concurrency = options["concurrency"]
+        args.postings_output = options.get("postings_output")
+        if options["batch"]:
+            companies = run["companies"]
+        else:
+            args.company_name = run["companies"][0]
+    elif bool(args.company_name) == bool(args.companies_file):
+        parser.error("Provide either a company name or --companies-file")
+    elif args.companies_file:
+        companies = load_companies(args.companies_file)
+
     # Check if API keys are set
     if not os.getenv("TAVILY_API_KEY"):
         print("Error: TAVILY_API_KEY environment variable not set.")
@@ -37,14 +269,78 @@ def main():
         print("Error: OPENAI_API_KEY environment variable not set.")
         sys.exit(1)
 
+    if companies is not None:
+        args.output = args.output or "job_search/results/job_search_results.jsonl"
+    else:
+        args.output = args.output or "job_search/results/job_search_results.json"
+
+    # Validate before a checkpoint run is created for the arguments
+    if args.output.endswith(".parquet"):
+        parser.error(
+            "Results are written to a .json, .jsonl or .jsonl.gz file "
+            "(use --postings-output for Parquet)"
+        )
+    if companies is not None and args.output.endswith(".json"):
+        parser.error("Batch results are written to a .jsonl or .jsonl.gz file")
+
+    if args.checkpoint and run_id is None:
+        run_id = get_checkpoint_store().create_run(
+            companies if companies is not None else [args.company_name],
+            {
+                "output": args.output,
+                "stream": args.stream,
+                "incremental": args.incremental,
+                "concurrency": args.concurrency,
+                "postings_output": args.postings_output,
+                "batch": companies is not None,
+            },
+        )
+        print(f"Checkpointing run {run_id} (resume with --resume {run_id})")
+
+    postings_sink = None
+    if args.postings_output:
+        postings_sink = open_postings_sink(args.postings_output)
+        set_postings_sink(postings_sink)
+
+    if companies is not None:
+        print(f"Starting batch job search for {len(companies)} companies...")
+        try:
+            asyncio.run(
+                run_batch(
+                    companies,
+                    args.output,
+                    args.concurrency,
+                    args.stream,
+                    args.incremental,
+                    run_id,
+                )
+            )
+        except BaseException:
+            close_postings_sink(postings_sink, finalize=False)
+            raise
+        close_postings_sink(postings_sink)
+        if run_id:
+            get_checkpoint_store().finish_run(run_id)
+        if args.profile:
+            print(f"\n{get_metrics().format_profile()}")
+        return
+
     print(f"Starting job search for {args.company_name}...")
 
     try:
         # Run the agent
-        result = run_job_search_agent(args.company_name)
+        result = run_job_search_agent(
+            args.company_name, args.stream, args.incremental, run_id
+        )
 
         # Save the results to a file
         save_results_to_file(result, args.output)
+        close_postings_sink(postings_sink)
+
+        # The run is only finished once its results are saved, so a failed
+        # save can still be resumed
+        if run_id:
+            get_checkpoint_store().finish_run(run_id)
 
         print(f"Job search completed. Results saved to {args.output}")
 
@@ -73,13 +369,27 @@ def main():
                     print("\n")
                     print(f"    Benefits: {job.benefits}")
                     print("--------------------------------\n")
+        # Print the changes since the previous run
+        if args.incremental and result.get("extract_result"):
+            events = result["extract_result"].events
+            print(f"\nChanges since the previous run: {len(events)}")
+            for event in events:
+                job = event.job_posting
+                print(f"  [{event.event}] {job.title} - {job.location} ({job.url})")
+
         # Print error if available
         if isinstance(result, dict) and "error" in result:
             print(f"\nError: {result['error']}")
         elif hasattr(result, "error") and result.error:
             print(f"\nError: {result.error}")
 
+        print()
+        print_client_stats()
+        if args.profile:
+            print(f"\n{get_metrics().format_profile()}")
+
     except Exception as e:
+        close_postings_sink(postings_sink, finalize=False)
         print(f"Error: {str(e)}")
         sys.exit(1)
 
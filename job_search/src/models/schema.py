@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -11,6 +11,77 @@ class DomainSearchResult(BaseModel):
     selected_domain: str = Field(description="The selected domain for crawling")
 
 
+class ContentHandle(BaseModel):
+    """Location of a page body spilled to a content store file."""
+
+    path: str = Field(description="Path of the content store file")
+    offset: int = Field(description="Byte offset of the compressed body")
+    length: int = Field(description="Byte length of the compressed body")
+
+
+class CrawlSettings(BaseModel):
+    """Scope and extraction depth of one Tavily crawl."""
+
+    limit: int = Field(description="Maximum number of pages to crawl")
+    max_depth: int = Field(description="Maximum link depth from the start URL")
+    max_breadth: int = Field(description="Maximum links followed per page")
+    extract_depth: Literal["basic", "advanced"] = Field(
+        description="Tavily extraction depth of the page contents"
+    )
+    select_paths: List[str] = Field(
+        description="Regexes of the URL paths the crawl is restricted to",
+        default_factory=list,
+    )
+    select_domains: List[str] = Field(
+        description="Regexes of the domains the crawl is restricted to",
+        default_factory=list,
+    )
+
+
+class CrawlSection(BaseModel):
+    """Section of a careers site crawled by its own sub-crawl."""
+
+    url: str = Field(description="URL the sub-crawl starts from")
+    select_paths: List[str] = Field(
+        description="Regexes of the URL paths of the section", default_factory=list
+    )
+    select_domains: List[str] = Field(
+        description="Regexes of the domains of the section", default_factory=list
+    )
+    discovered_pages: int = Field(
+        description="Pages of the section found by the discovery crawl"
+    )
+    limit: int = Field(description="Page budget of the sub-crawl")
+
+
+class CrawlYield(BaseModel):
+    """Job-page yield of one crawl, measured with the local page classifier."""
+
+    pages: int = Field(default=0, description="Pages crawled")
+    job_pages: int = Field(default=0, description="Pages classified as job postings")
+    job_url_pages: int = Field(
+        default=0, description="Pages whose URL looks like a job posting"
+    )
+    thin_job_url_pages: int = Field(
+        default=0,
+        description="Job posting URLs whose content did not look like a posting",
+    )
+
+
+class CrawlProfile(BaseModel):
+    """Crawl settings learned for a careers site across runs."""
+
+    domain: str = Field(description="Host of the careers site")
+    level: int = Field(description="Index of the crawl scope in ADAPTIVE_CRAWL_LEVELS")
+    extract_depth: Literal["basic", "advanced"] = Field(
+        description="Extraction depth that worked for the site"
+    )
+    last_yield: CrawlYield = Field(description="Yield of the last crawl of the site")
+    updated_at: float = Field(
+        description="Time of the last crawl (seconds since epoch)"
+    )
+
+
 class CrawlResult(BaseModel):
     """Result from crawl step."""
 
@@ -20,6 +91,21 @@ class CrawlResult(BaseModel):
         description="Raw content of each crawled page keyed by URL",
         default_factory=dict,
     )
+    content_handles: Dict[str, ContentHandle] = Field(
+        description="Handles of page bodies spilled to disk, keyed by URL",
+        default_factory=dict,
+    )
+    dropped_links: List[str] = Field(
+        description="Crawled links skipped before extraction",
+        default_factory=list,
+    )
+    duplicate_links: Dict[str, str] = Field(
+        description="Crawled links not extracted, mapped to the page they duplicate",
+        default_factory=dict,
+    )
+    settings: Optional[CrawlSettings] = Field(
+        default=None, description="Settings of the (last) crawl that was run"
+    )
 
 
 class JobPosting(BaseModel):
@@ -31,18 +117,83 @@ class JobPosting(BaseModel):
     benefits: List[str] = Field(description="List of benefits")
 
 
+class JobPostingList(BaseModel):
+    """Every job posting found on one or more pages."""
+
+    job_postings: List[JobPosting] = Field(
+        description="Job postings found on the pages", default_factory=list
+    )
+
+
+class ExtractionStats(BaseModel):
+    """Counters for the LLM extraction fan-out."""
+
+    succeeded: int = Field(default=0, description="Extractions that succeeded")
+    retried: int = Field(default=0, description="Retries after rate-limit errors")
+    dropped: int = Field(default=0, description="Extractions that failed for good")
+    llm_calls: int = Field(default=0, description="LLM requests sent, with retries")
+    cache_hits: int = Field(default=0, description="Extractions served from cache")
+    duplicates_skipped: int = Field(
+        default=0, description="Duplicate pages not extracted, each saving a request"
+    )
+    rate_limit_wait_seconds: float = Field(
+        default=0.0, description="Total time spent waiting on the rate limiter"
+    )
+
+
+class JobEvent(BaseModel):
+    """Change to a company's job postings since its previous run."""
+
+    event: Literal["added", "removed", "changed"] = Field(description="Kind of change")
+    job_posting: JobPosting = Field(description="Current (or removed) job posting")
+    previous: Optional[JobPosting] = Field(
+        default=None, description="Job posting before the change, for changed jobs"
+    )
+
+
 class ExtractResult(BaseModel):
     """Result from extract step."""
 
     extracted_jobs: List[JobPosting] = Field(
         description="List of extracted job postings"
     )
+    stats: ExtractionStats = Field(
+        description="Counters for the extraction fan-out",
+        default_factory=ExtractionStats,
+    )
+    events: List[JobEvent] = Field(
+        description="Changes since the previous run, in incremental mode",
+        default_factory=list,
+    )
+
+
+class PageState(BaseModel):
+    """Stored state of one crawled page."""
+
+    content_hash: str = Field(description="Hash of the normalized page content")
+    job_postings: List[JobPosting] = Field(
+        description="Job postings extracted from the page", default_factory=list
+    )
+
+
+class CompanyState(BaseModel):
+    """Stored state of a company from its previous incremental run."""
+
+    company_name: str = Field(description="Name of the company")
+    domain: str = Field(description="Domain selected for crawling")
+    pages: Dict[str, PageState] = Field(
+        description="Crawled pages keyed by URL", default_factory=dict
+    )
+    updated_at: float = Field(description="Time of the run (seconds since epoch)")
 
 
 class AgentState(BaseModel):
     """State of the agent throughout the workflow."""
 
     company_name: str = Field(description="Name of the company to search for")
+    run_id: Optional[str] = Field(
+        default=None, description="Id of the checkpointed run, if any"
+    )
     domain_search_result: Optional[DomainSearchResult] = None
     crawl_result: Optional[CrawlResult] = None
     extract_result: Optional[ExtractResult] = None
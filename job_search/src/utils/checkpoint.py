@@ -0,0 +1,285 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.models.schema import AgentState, CrawlResult
+from src.utils.config import CHECKPOINT_PATH
+from src.utils.content_store import iter_loaded_contents, spill_contents
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Checkpoint")
+
+
+class CheckpointStore:
+    """
+    SQLite store of node outputs, so interrupted runs can be resumed.
+
+    Each run has an id, and the output of every node that finished without
+    an error is stored per ``(run_id, company_name, node)``. Page contents are
+    stored once per distinct content in a compressed, hash-keyed blob table.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH):
+        """
+        Open (or create) the checkpoint file.
+
+        Args:
+            path (str): Path of the SQLite file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                companies TEXT NOT NULL,
+                options TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS node_outputs (
+                run_id TEXT NOT NULL,
+                company_name TEXT NOT NULL,
+                node TEXT NOT NULL,
+                output TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_id, company_name, node)
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                content BLOB NOT NULL
+            );
+            """)
+
+    def create_run(self, companies: List[str], options: Dict[str, Any]) -> str:
+        """
+        Register a new run.
+
+        Args:
+            companies (List[str]): Companies the run searches for
+            options (Dict[str, Any]): Command line options needed to resume it
+
+        Returns:
+            str: Id of the run
+        """
+        run_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    json.dumps(companies),
+                    json.dumps(options),
+                    "running",
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        return run_id
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a registered run.
+
+        Args:
+            run_id (str): Id of the run
+
+        Returns:
+            Optional[Dict[str, Any]]: The run's ``companies``, ``options`` and
+                ``status``, or None if there is no such run
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT companies, options, status FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "companies": json.loads(row[0]),
+            "options": json.loads(row[1]),
+            "status": row[2],
+        }
+
+    def finish_run(self, run_id: str) -> None:
+        """Mark a run as completed."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = 'completed' WHERE run_id = ?", (run_id,)
+            )
+            self._conn.commit()
+
+    def _put_blob(self, content: str) -> str:
+        """Store a page content once and return its hash."""
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        self._conn.execute(
+            "INSERT OR IGNORE INTO blobs VALUES (?, ?)",
+            (digest, zlib.compress(content.encode("utf-8"))),
+        )
+        return digest
+
+    def _get_blob(self, digest: str) -> str:
+        """Load a page content by hash."""
+        (content,) = self._conn.execute(
+            "SELECT content FROM blobs WHERE hash = ?", (digest,)
+        ).fetchone()
+        return zlib.decompress(content).decode("utf-8")
+
+    def save_output(
+        self, run_id: str, company_name: str, node: str, output: Dict[str, Any]
+    ) -> None:
+        """
+        Store the state update returned by a node.
+
+        Args:
+            run_id (str): Id of the run
+            company_name (str): Company the node ran for
+            node (str): Name of the node
+            output (Dict[str, Any]): State update returned by the node
+        """
+        with self._lock:
+            serialized = {}
+            for key, value in output.items():
+                if isinstance(value, CrawlResult):
+                    # Spilled page bodies only live as long as the process
+                    raw_content = {
+                        url: self._put_blob(content)
+                        for url, content in iter_loaded_contents(value)
+                    }
+                    value = value.model_dump(exclude={"content_handles"})
+                    value["raw_content"] = raw_content
+                elif isinstance(value, BaseModel):
+                    value = value.model_dump()
+                serialized[key] = value
+            self._conn.execute(
+                "INSERT OR REPLACE INTO node_outputs VALUES (?, ?, ?, ?, ?)",
+                (run_id, company_name, node, json.dumps(serialized), time.time()),
+            )
+            self._conn.commit()
+
+    def load_output(
+        self, run_id: str, company_name: str, node: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load the stored state update of a node that already finished.
+
+        Args:
+            run_id (str): Id of the run
+            company_name (str): Company the node ran for
+            node (str): Name of the node
+
+        Returns:
+            Optional[Dict[str, Any]]: The state update, or None if the node has
+                not finished in this run
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM node_outputs "
+                "WHERE run_id = ? AND company_name = ? AND node = ?",
+                (run_id, company_name, node),
+            ).fetchone()
+            if row is None:
+                return None
+            output = json.loads(row[0])
+            crawl_result = output.get("crawl_result")
+            if crawl_result and crawl_result.get("raw_content"):
+                # Page bodies are spilled to this process's content store again
+                crawl_result.update(
+                    spill_contents(
+                        (url, self._get_blob(digest))
+                        for url, digest in crawl_result["raw_content"].items()
+                    )
+                )
+        return {
+            key: TypeAdapter(AgentState.model_fields[key].annotation).validate_python(
+                value
+            )
+            for key, value in output.items()
+        }
+
+
+# Process-wide store shared by every checkpointed run in the process
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Get the shared checkpoint store."""
+    global _checkpoint_store
+    with _checkpoint_store_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = CheckpointStore()
+        return _checkpoint_store
+
+
+def checkpointed(
+    node: str, func: Callable[[AgentState], Dict[str, Any]]
+) -> Callable[[AgentState], Dict[str, Any]]:
+    """
+    Wrap a graph node so its output is checkpointed in runs with a ``run_id``.
+
+    A node that already finished in the run returns its stored output instead
+    of running again, so resuming a run only executes unfinished nodes.
+    Outputs carrying an error are not stored, so failed nodes are retried.
+
+    Args:
+        node (str): Name of the node in the graph
+        func (Callable[[AgentState], Dict[str, Any]]): The node function, or
+            a coroutine function for async nodes
+
+    Returns:
+        Callable[[AgentState], Dict[str, Any]]: The checkpointed node function
+    """
+
+    def load(state: AgentState) -> Optional[Dict[str, Any]]:
+        output = get_checkpoint_store().load_output(
+            state.run_id, state.company_name, node
+        )
+        if output is not None:
+            logger.info(f"Replaying {node} for {state.company_name}")
+        return output
+
+    def save(state: AgentState, output: Dict[str, Any]) -> None:
+        if not output.get("error"):
+            get_checkpoint_store().save_output(
+                state.run_id, state.company_name, node, output
+            )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(state: AgentState) -> Dict[str, Any]:
+            if state.run_id is None:
+                return await func(state)
+            # SQLite reads, commits and page compression run off the event loop
+            output = await asyncio.to_thread(load, state)
+            if output is None:
+                output = await func(state)
+                await asyncio.to_thread(save, state, output)
+            return output
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state: AgentState) -> Dict[str, Any]:
+        if state.run_id is None:
+            return func(state)
+        output = load(state)
+        if output is None:
+            output = func(state)
+            save(state, output)
+        return output
+
+    return wrapper
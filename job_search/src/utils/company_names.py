@@ -0,0 +1,14 @@
+def normalize_company_name(company_name: str) -> str:
+    """
+    Normalize a company name for use as a storage key.
+
+    Case and spacing differences ("Acme  Corp", "acme corp") map to the same
+    key, so they share cached and stored state.
+
+    Args:
+        company_name (str): Name of the company
+
+    Returns:
+        str: Lowercased name with single spaces
+    """
+    return " ".join(company_name.lower().split())
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from src.models.schema import CompanyState
+from src.utils.company_names import normalize_company_name
+from src.utils.config import COMPANY_STATE_PATH
+from src.utils.extraction_cache import normalize_content
+
+
+def content_hash(content: str) -> str:
+    """Hash normalized page content, ignoring formatting-only changes."""
+    return hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+
+
+class CompanyStateStore:
+    """
+    SQLite store of each company's state from its previous incremental run.
+
+    One row per company holds the selected domain and, per crawled page, the
+    content hash and the job postings extracted from it.
+    """
+
+    def __init__(self, path: str = COMPANY_STATE_PATH):
+        """
+        Open (or create) the state file.
+
+        Args:
+            path (str): Path of the SQLite file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                company_name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """)
+
+    def get(self, company_name: str) -> Optional[CompanyState]:
+        """
+        Load the stored state of a company.
+
+        Args:
+            company_name (str): Name of the company
+
+        Returns:
+            Optional[CompanyState]: The stored state, or None on the first run
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM companies WHERE company_name = ?",
+                (normalize_company_name(company_name),),
+            ).fetchone()
+        if row is None:
+            return None
+        return CompanyState.model_validate_json(row[0])
+
+    def set(self, company_state: CompanyState) -> None:
+        """
+        Replace the stored state of a company.
+
+        Args:
+            company_state (CompanyState): State of the latest run
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO companies VALUES (?, ?, ?)",
+                (
+                    normalize_company_name(company_state.company_name),
+                    company_state.model_dump_json(),
+                    company_state.updated_at,
+                ),
+            )
+            self._conn.commit()
+
+
+# Process-wide store shared by every incremental run in the process
+_company_state_store: Optional[CompanyStateStore] = None
+_company_state_store_lock = threading.Lock()
+
+
+def get_company_state_store() -> CompanyStateStore:
+    """Get the shared company state store."""
+    global _company_state_store
+    with _company_state_store_lock:
+        if _company_state_store is None:
+            _company_state_store = CompanyStateStore()
+        return _company_state_store
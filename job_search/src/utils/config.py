@@ -1,7 +1,6 @@
 import os
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 # Load environment variables
 load_dotenv()
@@ -10,27 +9,115 @@ load_dotenv()
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Tavily API endpoint
+TAVILY_API_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com")
+
 # Model configuration
 DEFAULT_MODEL = "gpt-4o"
 DEFAULT_TEMPERATURE = 0.0
-
-
-# Create OpenAI model instances
-def get_llm(model_name=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE):
-    """Get an OpenAI LLM instance with the specified parameters."""
-    return ChatOpenAI(
-        model=model_name,
-        temperature=temperature,
-        api_key=OPENAI_API_KEY,
-        request_timeout=60,
-        streaming=False,
-    )
-
+DEFAULT_PROVIDER = "openai"
+LLM_REQUEST_TIMEOUT = 60  # Seconds per LLM call
 
 # Crawl configuration
 DEFAULT_CRAWL_LIMIT = 100
 DEFAULT_CRAWL_FORMATS = ["links"]
 
+# Adaptive crawl configuration
+ADAPTIVE_CRAWL_ENABLED = True  # Start cheap, escalate the crawl on job-page yield
+ADAPTIVE_CRAWL_LEVELS = [  # Scopes (limit, max_depth, max_breadth), cheapest first
+    (20, 1, 20),
+    (50, 2, 50),
+    (DEFAULT_CRAWL_LIMIT, 2, 100),
+]
+ADAPTIVE_CRAWL_MIN_YIELD = 0.2  # Job-page fraction of a capped crawl to widen it
+ADAPTIVE_CRAWL_THIN_FRACTION = 0.5  # Thin job-URL pages fraction to use "advanced"
+
+# Split crawl configuration
+CRAWL_SPLIT_ENABLED = True  # Crawl the sections of large sites in parallel
+CRAWL_SPLIT_MIN_LIMIT = 50  # Crawls with a smaller page limit are not split
+CRAWL_SPLIT_DISCOVERY = (20, 1, 20)  # Scope of the shallow discovery crawl
+CRAWL_SPLIT_MAX_SECTIONS = 6  # Parallel sub-crawls per site
+CRAWL_SPLIT_MIN_SECTION_PAGES = 2  # Discovered pages for a path prefix to be a section
+
+# Streaming pipeline configuration
+STREAMING_PIPELINE = False  # Overlap crawling and extraction (--stream)
+PIPELINE_QUEUE_SIZE = 32  # Crawled pages buffered ahead of extraction
+
 # Extract configuration
 DEFAULT_EXTRACT_DEPTH = "advanced"
-MAX_CONTENT_CHARS = 8000  # Maximum characters to use for content extraction
+MAX_CONTENT_TOKENS = 800  # Token budget for page content sent to the LLM
+EXTRACTION_MODE = "single"  # "single" posting per page, or "multi" postings per page
+MULTI_MAX_CONTENT_TOKENS = 3000  # Token budget per page in multi mode (listings)
+MULTI_BATCH_TOKENS = 4000  # Page content tokens packed into one multi-mode request
+MULTI_BATCH_MAX_PAGES = 8  # Pages packed into one multi-mode request
+
+# HTTP transport configuration
+HTTP_CONNECT_TIMEOUT = 10  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = 180  # Seconds to wait for a response (crawls are slow)
+HTTP_MAX_RETRIES = 3  # Retries on 429/5xx and connection errors
+HTTP_BACKOFF_BASE = 0.5  # Base delay in seconds for exponential backoff
+HTTP_BACKOFF_MAX = 30  # Upper bound for a single backoff delay
+HTTP_MAX_CONCURRENCY_PER_HOST = 8  # Concurrent in-flight requests per host
+
+# Batch configuration
+BATCH_CONCURRENCY = 10  # Companies processed concurrently in batch mode
+
+# LLM rate limiting for entity extraction
+LLM_REQUESTS_PER_MINUTE = 500  # Provider request quota
+LLM_TOKENS_PER_MINUTE = 30000  # Provider token quota
+LLM_MAX_CONCURRENCY = 16  # In-flight extraction calls per company
+LLM_MAX_RETRIES = 5  # Retries on rate-limit errors
+LLM_COMPLETION_TOKENS = 300  # Expected completion size of one extraction
+
+# Local cache configuration
+CACHE_DIR = os.getenv(
+    "JOB_SEARCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache"),
+)
+EXTRACTION_CACHE_ENABLED = True  # Reuse extractions of unchanged pages
+EXTRACTION_CACHE_PATH = os.path.join(CACHE_DIR, "extraction_cache.sqlite")
+EXTRACTION_CACHE_TTL_DAYS = 30  # Entries older than this are re-extracted
+EXTRACTION_CACHE_MAX_ENTRIES = 100_000  # LRU entries beyond this are evicted
+DOMAIN_CACHE_ENABLED = True  # Reuse each company's selected careers domain
+DOMAIN_CACHE_PATH = os.path.join(CACHE_DIR, "domain_cache.sqlite")
+DOMAIN_CACHE_TTL_DAYS = 30  # Selected domains older than this are looked up again
+DOMAIN_CACHE_NEGATIVE_TTL_HOURS = 6  # Failed lookups are retried after this
+COMPANY_STATE_PATH = os.path.join(CACHE_DIR, "company_state.sqlite")  # --incremental
+CHECKPOINT_PATH = os.path.join(CACHE_DIR, "checkpoints.sqlite")  # --checkpoint
+CRAWL_PROFILE_PATH = os.path.join(CACHE_DIR, "crawl_profiles.sqlite")  # Adaptive crawl
+CRAWL_PROFILE_TTL_DAYS = 30  # Learned crawl settings older than this are probed again
+CONTENT_STORE_ENABLED = True  # Keep crawled page bodies on disk, not in the state
+CONTENT_STORE_DIR = os.path.join(CACHE_DIR, "content")  # Removed at exit
+
+# Result output configuration
+RESULT_SINK_BUFFER_ROWS = 100  # Result rows buffered before they are written
+RESULT_SINK_BUFFER_BYTES = 1024 * 1024  # Serialized bytes buffered before writing
+
+# Instrumentation configuration
+METRICS_MAX_SAMPLES = 10_000  # Samples kept per metric series for percentiles
+METRICS_HOST = "127.0.0.1"  # Interface of the Prometheus endpoint (local only)
+
+# Page pre-filter configuration
+PAGE_FILTER_ENABLED = True  # Drop non-job pages before the LLM extractor
+PAGE_FILTER_MIN_SCORE = 0.5  # Pages scoring below this are not extracted
+
+# Duplicate page configuration
+PAGE_DEDUP_ENABLED = True  # Collapse duplicate pages before the LLM extractor
+PAGE_DEDUP_MIN_SIMILARITY = 0.9  # Estimated shingle similarity of near-duplicates
+PAGE_DEDUP_IGNORED_PARAMS = {  # Query parameters that do not change the page
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "referrer",
+    "source",
+    "src",
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "lang",
+    "locale",
+    "hl",
+}
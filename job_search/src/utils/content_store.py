@@ -0,0 +1,184 @@
+import atexit
+import os
+import shutil
+import threading
+import uuid
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from src.models.schema import ContentHandle, CrawlResult
+from src.utils.config import CONTENT_STORE_DIR, CONTENT_STORE_ENABLED
+
+# A page body held in memory, or a handle to one spilled to disk
+PageContent = Union[str, ContentHandle]
+
+# Directory of this process's content files, removed when the process exits
+_process_dir = os.path.join(CONTENT_STORE_DIR, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+
+class ContentStore:
+    """
+    Append-only file of zlib-compressed page bodies.
+
+    Each crawl writes its pages to its own file and keeps only small
+    ``ContentHandle`` objects in the agent state, so the state LangGraph copies
+    between nodes stays the same size however many pages were crawled. Bodies
+    are read back one at a time with positional reads, which are safe to run
+    from several threads at once.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Create a new content file.
+
+        Args:
+            path (Optional[str]): Path of the file (a new file in this
+                process's content directory if not provided)
+        """
+        if path is None:
+            os.makedirs(_process_dir, exist_ok=True)
+            path = os.path.join(_process_dir, f"{uuid.uuid4().hex}.blob")
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._size = 0
+
+    def put(self, content: str) -> ContentHandle:
+        """
+        Append a page body to the file.
+
+        Args:
+            content (str): Page body
+
+        Returns:
+            ContentHandle: Handle to load the body with ``load_content``
+        """
+        data = zlib.compress(content.encode("utf-8"))
+        with self._lock:
+            offset = self._size
+            self._file.write(data)
+            self._size += len(data)
+        return ContentHandle(path=self.path, offset=offset, length=len(data))
+
+    def close(self) -> None:
+        """Flush the file; handles stay readable until it is released."""
+        with self._lock:
+            self._file.close()
+
+
+def load_content(content: PageContent) -> str:
+    """
+    Load a page body, reading it from disk if it was spilled.
+
+    Args:
+        content (PageContent): Page body, or a handle to it
+
+    Returns:
+        str: Page body
+    """
+    if isinstance(content, str):
+        return content
+    fd = os.open(content.path, os.O_RDONLY)
+    try:
+        data = os.pread(fd, content.length, content.offset)
+    finally:
+        os.close(fd)
+    return zlib.decompress(data).decode("utf-8")
+
+
+def spill_contents(pages: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Build the content fields of a ``CrawlResult`` from page bodies.
+
+    Args:
+        pages (Iterable[Tuple[str, str]]): ``(url, page body)`` pairs
+
+    Returns:
+        Dict[str, Any]: ``raw_content`` and ``content_handles``; bodies are
+            only spilled if the content store is enabled, and empty ones never
+    """
+    fields: Dict[str, Any] = {"raw_content": {}, "content_handles": {}}
+    store = ContentStore() if CONTENT_STORE_ENABLED else None
+    try:
+        for url, content in pages:
+            if store is not None and content:
+                fields["content_handles"][url] = store.put(content)
+            else:
+                fields["raw_content"][url] = content
+    finally:
+        if store is not None:
+            store.close()
+    return fields
+
+
+def page_contents(crawl_result: CrawlResult) -> Dict[str, PageContent]:
+    """
+    Get the page bodies of a crawl, as strings or handles to spilled bodies.
+
+    Args:
+        crawl_result (CrawlResult): Result of the crawl
+
+    Returns:
+        Dict[str, PageContent]: Page bodies (or handles) keyed by URL, in
+            crawl order
+    """
+    contents = {**crawl_result.raw_content, **crawl_result.content_handles}
+    return {url: contents[url] for url in crawl_result.links if url in contents}
+
+
+def iter_loaded_contents(crawl_result: CrawlResult) -> Iterator[Tuple[str, str]]:
+    """
+    Load the page bodies of a crawl one at a time.
+
+    Args:
+        crawl_result (CrawlResult): Result of the crawl
+
+    Yields:
+        Tuple[str, str]: ``(url, page body)`` pairs
+    """
+    for url, content in page_contents(crawl_result).items():
+        yield url, load_content(content)
+
+
+def dump_crawl_result(crawl_result: CrawlResult) -> Dict[str, Any]:
+    """
+    Serialize a crawl result with its page bodies loaded back into ``raw_content``.
+
+    Args:
+        crawl_result (CrawlResult): Result of the crawl
+
+    Returns:
+        Dict[str, Any]: JSON-serializable crawl result
+    """
+    dumped = crawl_result.model_dump(exclude={"content_handles"})
+    dumped["raw_content"] = dict(iter_loaded_contents(crawl_result))
+    return dumped
+
+
+def release_contents(
+    crawl_result: Optional[CrawlResult], keep: Optional[CrawlResult] = None
+) -> None:
+    """
+    Delete the content files of a crawl once its bodies are no longer needed.
+
+    Args:
+        crawl_result (Optional[CrawlResult]): Result of the crawl
+        keep (Optional[CrawlResult]): Result whose content files must be kept,
+            e.g. a merged result reusing some of the crawl's pages
+    """
+    if crawl_result is None:
+        return
+    paths = {handle.path for handle in crawl_result.content_handles.values()}
+    if keep is not None:
+        paths -= {handle.path for handle in keep.content_handles.values()}
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+@atexit.register
+def _remove_process_dir() -> None:
+    """Delete this process's content files."""
+    shutil.rmtree(_process_dir, ignore_errors=True)
@@ -0,0 +1,162 @@
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from src.utils.config import DEFAULT_MODEL, MAX_CONTENT_TOKENS
+from src.utils.rate_limiter import estimate_tokens
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Content Window")
+
+# Lines that are navigation, images or link lists rather than page text
+_link_only_pattern = re.compile(r"^[\s*\-+|>#]*!?\[[^\]]*\]\([^)]*\)[\s|]*$")
+_boilerplate_pattern = re.compile(
+    r"\b(cookies?|privacy policy|terms of (use|service)|all rights reserved|"
+    r"skip to (main )?content|sign in|log in|subscribe|newsletter|copyright|©)",
+    re.IGNORECASE,
+)
+
+# Terms that mark the job-relevant parts of a posting
+_relevance_pattern = re.compile(
+    r"\b(responsibilit\w*|requirements?|qualifications?|experience|"
+    r"what you('|’)?ll (do|bring)|what you will|about the (role|job|team)|"
+    r"benefits?|perks|salary|compensation|location|remote|hybrid|on-?site|"
+    r"full[- ]time|part[- ]time|contract|apply|equal opportunity|insurance|"
+    r"vacation|pto|parental|equity|stock|bonus|401k|pension)\b",
+    re.IGNORECASE,
+)
+
+# Blocks longer than this many lines are split so they can be ranked separately
+MAX_BLOCK_LINES = 12
+
+# The title block of the page is always worth keeping
+TITLE_BONUS = 3.0
+
+# Blocks are only cut to fit the budget if at least this many tokens remain
+MIN_PARTIAL_BLOCK_TOKENS = 50
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model: str = DEFAULT_MODEL) -> Optional[Any]:
+    """
+    Get the model's tiktoken encoding.
+
+    Returns None when the tokenizer cannot be loaded (e.g. its vocabulary file
+    cannot be downloaded), in which case token counts are estimated.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        logger.warning(f"Tokenizer for {model} unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text with the model's tokenizer."""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode_ordinary(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text down to at most ``max_tokens`` tokens."""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return text[: max_tokens * 4]
+    return tokenizer.decode(tokenizer.encode_ordinary(text)[:max_tokens])
+
+
+def split_blocks(content: str) -> List[Tuple[int, str, float]]:
+    """
+    Split page content into scored text blocks in a single pass over its lines.
+
+    Navigation, link-only, repeated and legal boilerplate lines are dropped.
+    The remaining lines are grouped into blocks at blank lines and headings,
+    and each block is scored by its density of job-relevant terms.
+
+    Args:
+        content (str): Raw content of the page
+
+    Returns:
+        List[Tuple[int, str, float]]: ``(position, text, score)`` per block
+    """
+    blocks = []
+    seen_lines = set()
+    current: List[str] = []
+    current_hits = 0
+    seen_heading = False
+
+    def flush() -> None:
+        nonlocal current, current_hits, seen_heading
+        if current:
+            text = "\n".join(current)
+            score = current_hits / (1 + len(text) / 500)
+            # The page title and the first heading usually name the job
+            if not blocks:
+                score += TITLE_BONUS
+            if text.startswith("#") and not seen_heading:
+                score += TITLE_BONUS
+                seen_heading = True
+            blocks.append((len(blocks), text, score))
+        current = []
+        current_hits = 0
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+        if (
+            stripped in seen_lines
+            or _link_only_pattern.match(stripped)
+            or (len(stripped) < 200 and _boilerplate_pattern.search(stripped))
+        ):
+            continue
+        seen_lines.add(stripped)
+        if stripped.startswith("#") or len(current) >= MAX_BLOCK_LINES:
+            flush()
+        current.append(stripped)
+        current_hits += len(_relevance_pattern.findall(stripped))
+    flush()
+
+    return blocks
+
+
+def window_content(content: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Choose the most job-relevant spans of a page within a token budget.
+
+    Pages that already fit the budget are returned unchanged. Longer pages
+    are stripped of boilerplate, and their blocks are picked by relevance
+    until the budget is spent. The picked blocks keep their original order.
+
+    Args:
+        content (str): Raw content of the page
+        max_tokens (Optional[int]): Token budget (defaults to MAX_CONTENT_TOKENS)
+
+    Returns:
+        str: Content that fits in ``max_tokens`` tokens
+    """
+    max_tokens = max_tokens or MAX_CONTENT_TOKENS
+    if count_tokens(content) <= max_tokens:
+        return content
+
+    blocks = split_blocks(content)
+    selected = []
+    remaining = max_tokens
+    for position, text, _ in sorted(blocks, key=lambda block: (-block[2], block[0])):
+        if remaining <= 0:
+            break
+        tokens = count_tokens(text) + 1
+        if tokens > remaining:
+            if remaining < MIN_PARTIAL_BLOCK_TOKENS:
+                continue
+            text = truncate_to_tokens(text, remaining)
+            tokens = remaining
+        selected.append((position, text))
+        remaining -= tokens
+
+    return "\n\n".join(text for _, text in sorted(selected))
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from src.models.schema import CrawlProfile, CrawlSettings, CrawlYield
+from src.utils.config import (
+    ADAPTIVE_CRAWL_LEVELS,
+    ADAPTIVE_CRAWL_MIN_YIELD,
+    ADAPTIVE_CRAWL_THIN_FRACTION,
+    CRAWL_PROFILE_PATH,
+    CRAWL_PROFILE_TTL_DAYS,
+    PAGE_FILTER_MIN_SCORE,
+)
+from src.utils.page_classifier import classify_page, content_score, url_score
+
+# URL score of the strong job posting patterns (job ids, ATS boards)
+JOB_URL_SCORE = 2.5
+
+
+def profile_domain(url: str) -> str:
+    """Key crawl profiles by host, so every start URL on a site shares one."""
+    host = urlparse(url).netloc.lower() or url.lower()
+    return host.removeprefix("www.")
+
+
+class CrawlProfileStore:
+    """
+    SQLite store of the crawl settings learned for each careers site.
+
+    The adaptive crawl starts a known site at the scope and extraction depth
+    that its previous crawls settled on, instead of probing it again from the
+    cheapest settings. Profiles older than ``ttl_days`` are probed again.
+    """
+
+    def __init__(
+        self, path: str = CRAWL_PROFILE_PATH, ttl_days: float = CRAWL_PROFILE_TTL_DAYS
+    ):
+        """
+        Open (or create) the profile file.
+
+        Args:
+            path (str): Path of the SQLite file
+            ttl_days (float): Profiles older than this are ignored
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                domain TEXT PRIMARY KEY,
+                profile TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """)
+
+    def get(self, url: str) -> Optional[CrawlProfile]:
+        """
+        Load the learned crawl settings of a site.
+
+        Args:
+            url (str): Any URL on the site
+
+        Returns:
+            Optional[CrawlProfile]: The learned settings, or None if the site
+                has not been crawled recently
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile FROM profiles WHERE domain = ? AND updated_at >= ?",
+                (profile_domain(url), time.time() - self.ttl_seconds),
+            ).fetchone()
+        if row is None:
+            return None
+        return CrawlProfile.model_validate_json(row[0])
+
+    def set(self, profile: CrawlProfile) -> None:
+        """
+        Store the learned crawl settings of a site.
+
+        Args:
+            profile (CrawlProfile): Settings learned from the latest crawl
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?)",
+                (profile.domain, profile.model_dump_json(), profile.updated_at),
+            )
+            self._conn.commit()
+
+
+# Process-wide store shared by every crawl in the process
+_crawl_profile_store: Optional[CrawlProfileStore] = None
+_crawl_profile_store_lock = threading.Lock()
+
+
+def get_crawl_profile_store() -> CrawlProfileStore:
+    """Get the shared crawl profile store."""
+    global _crawl_profile_store
+    with _crawl_profile_store_lock:
+        if _crawl_profile_store is None:
+            _crawl_profile_store = CrawlProfileStore()
+        return _crawl_profile_store
+
+
+def level_settings(level: int, extract_depth: str) -> CrawlSettings:
+    """
+    Build the crawl settings of a scope in ``ADAPTIVE_CRAWL_LEVELS``.
+
+    Args:
+        level (int): Index of the crawl scope
+        extract_depth (str): ``"basic"`` or ``"advanced"``
+
+    Returns:
+        CrawlSettings: Settings of the crawl
+    """
+    limit, max_depth, max_breadth = ADAPTIVE_CRAWL_LEVELS[level]
+    return CrawlSettings(
+        limit=limit,
+        max_depth=max_depth,
+        max_breadth=max_breadth,
+        extract_depth=extract_depth,
+    )
+
+
+def record_page(crawl_yield: CrawlYield, url: str, content: Optional[str]) -> None:
+    """
+    Count a crawled page towards the yield of its crawl.
+
+    Args:
+        crawl_yield (CrawlYield): Counters updated in place
+        url (str): URL of the page
+        content (Optional[str]): Raw content of the page
+    """
+    crawl_yield.pages += 1
+    keep, _ = classify_page(url, content, PAGE_FILTER_MIN_SCORE)
+    crawl_yield.job_pages += keep
+    if url_score(url) >= JOB_URL_SCORE:
+        crawl_yield.job_url_pages += 1
+        # A posting URL whose content has no posting vocabulary was extracted
+        # too shallowly (e.g. the description is rendered into a widget)
+        crawl_yield.thin_job_url_pages += not content or content_score(content) <= 0
+
+
+def escalate(
+    level: int, extract_depth: str, crawl_yield: CrawlYield
+) -> Optional[Tuple[int, str]]:
+    """
+    Decide whether a crawl's yield justifies a larger or deeper crawl.
+
+    The scope is widened when the crawl hit its page limit and enough of its
+    pages are job postings, so more postings are likely beyond the limit.
+    Advanced extraction is used when most posting URLs came back without
+    posting content.
+
+    Args:
+        level (int): Index of the crawl scope that was run
+        extract_depth (str): Extraction depth that was run
+        crawl_yield (CrawlYield): Yield of the crawl
+
+    Returns:
+        Optional[Tuple[int, str]]: Scope index and extraction depth of the
+            next crawl, or None if the crawl is good enough
+    """
+    limit = ADAPTIVE_CRAWL_LEVELS[level][0]
+    widen = (
+        level + 1 < len(ADAPTIVE_CRAWL_LEVELS)
+        and crawl_yield.pages >= limit
+        and crawl_yield.job_pages >= ADAPTIVE_CRAWL_MIN_YIELD * crawl_yield.pages
+    )
+    deepen = (
+        extract_depth == "basic"
+        and crawl_yield.job_url_pages > 0
+        and crawl_yield.thin_job_url_pages
+        >= ADAPTIVE_CRAWL_THIN_FRACTION * crawl_yield.job_url_pages
+    )
+    if not widen and not deepen:
+        return None
+    return level + widen, "advanced" if deepen else extract_depth
+
+
+def learn_profile(
+    url: str, level: int, extract_depth: str, crawl_yield: CrawlYield
+) -> CrawlProfile:
+    """
+    Build the profile a site's next crawl starts from.
+
+    The scope steps down while the site would fit a smaller crawl, so sites
+    that shrink get cheaper again; growing sites escalate on their own.
+
+    Args:
+        url (str): Start URL of the crawl
+        level (int): Index of the last crawl scope that was run
+        extract_depth (str): Extraction depth of the last crawl
+        crawl_yield (CrawlYield): Yield of the last crawl
+
+    Returns:
+        CrawlProfile: Learned settings of the site
+    """
+    while level > 0 and crawl_yield.pages < ADAPTIVE_CRAWL_LEVELS[level - 1][0]:
+        level -= 1
+    return CrawlProfile(
+        domain=profile_domain(url),
+        level=level,
+        extract_depth=extract_depth,
+        last_yield=crawl_yield,
+        updated_at=time.time(),
+    )
@@ -0,0 +1,129 @@
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.models.schema import CrawlSection
+from src.utils.config import CRAWL_SPLIT_MAX_SECTIONS, CRAWL_SPLIT_MIN_SECTION_PAGES
+
+
+def registrable_domain(host: str) -> str:
+    """
+    Approximate the registrable domain of a host (``jobs.acme.co.uk`` -> ``acme.co.uk``).
+
+    Args:
+        host (str): Host name
+
+    Returns:
+        str: The last two labels, or three for two-letter country domains with
+            a short second level (``co.uk``, ``com.au``)
+    """
+    labels = host.lower().split(".")
+    if len(labels) > 2 and len(labels[-1]) == 2 and len(labels[-2]) <= 3:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _section_key(
+    start_host: str, start_segments: List[str], url: str
+) -> Optional[Tuple[str, str]]:
+    """
+    Find the section a crawled URL belongs to.
+
+    Args:
+        start_host (str): Host of the start URL
+        start_segments (List[str]): Path segments of the start URL
+        url (str): Crawled URL
+
+    Returns:
+        Optional[Tuple[str, str]]: ``("path", prefix)`` for a path section on
+            the start host, ``("domain", host)`` for a sibling subdomain, or
+            None if the URL is not below a section
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host == start_host:
+        segments = [segment for segment in parsed.path.split("/") if segment]
+        base = start_segments
+        if segments[: len(base)] != base:
+            # Outside the start path, sections start at the site root
+            base = []
+        rest = segments[len(base) :]
+        # Only pages below a prefix make it a section, not the prefix page itself
+        if len(rest) < 2:
+            return None
+        return "path", "/" + "/".join(base + rest[:1])
+    if host.removeprefix("www.") != start_host.removeprefix("www.") and (
+        registrable_domain(host) == registrable_domain(start_host)
+    ):
+        return "domain", host
+    return None
+
+
+def find_sections(
+    start_url: str,
+    urls: Iterable[str],
+    budget: int,
+    max_sections: int = CRAWL_SPLIT_MAX_SECTIONS,
+    min_pages: int = CRAWL_SPLIT_MIN_SECTION_PAGES,
+) -> List[CrawlSection]:
+    """
+    Find the sections of a careers site in the URLs of a shallow crawl.
+
+    Sections are path prefixes below the start URL (``/careers/engineering``)
+    and subdomains of the same site (``de.jobs.acme.com``). The page budget is
+    shared in proportion to the pages discovered in each section; each
+    sub-crawl's limit also covers the discovered pages it will find again.
+
+    Args:
+        start_url (str): URL the discovery crawl started from
+        urls (Iterable[str]): URLs found by the discovery crawl
+        budget (int): New pages the sub-crawls may crawl in total
+        max_sections (int): Maximum number of sections, largest first
+        min_pages (int): Discovered pages needed for a section
+
+    Returns:
+        List[CrawlSection]: The sections, or an empty list if the site has
+            fewer than two
+    """
+    start = urlparse(start_url)
+    start_host = start.netloc.lower()
+    start_segments = [segment for segment in start.path.split("/") if segment]
+    scheme = start.scheme or "https"
+
+    counts: Counter = Counter()
+    for url in urls:
+        key = _section_key(start_host, start_segments, url)
+        if key is not None:
+            counts[key] += 1
+    top = [
+        (key, pages)
+        for key, pages in counts.most_common(max_sections)
+        if pages >= min_pages
+    ]
+    if len(top) < 2 or budget <= 0:
+        return []
+
+    total = sum(pages for _, pages in top)
+    shares = [budget * pages // total for _, pages in top]
+    # The largest section gets the pages lost to rounding
+    shares[0] += budget - sum(shares)
+    sections = []
+    for ((kind, value), pages), share in zip(top, shares):
+        limit = pages + share
+        if kind == "path":
+            section = CrawlSection(
+                url=f"{scheme}://{start_host}{value}",
+                select_paths=[rf"^{re.escape(value)}(/.*)?$"],
+                discovered_pages=pages,
+                limit=limit,
+            )
+        else:
+            section = CrawlSection(
+                url=f"{scheme}://{value}/",
+                select_domains=[rf"^{re.escape(value)}$"],
+                discovered_pages=pages,
+                limit=limit,
+            )
+        sections.append(section)
+    return sections
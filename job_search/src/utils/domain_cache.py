@@ -0,0 +1,214 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.models.schema import DomainSearchResult
+from src.utils.company_names import normalize_company_name
+from src.utils.config import (
+    DOMAIN_CACHE_ENABLED,
+    DOMAIN_CACHE_NEGATIVE_TTL_HOURS,
+    DOMAIN_CACHE_PATH,
+    DOMAIN_CACHE_TTL_DAYS,
+)
+
+# Hosts that are obviously a careers site
+_careers_host_pattern = re.compile(r"^(careers?|jobs)\.")
+_non_alphanumeric_pattern = re.compile(r"[^a-z0-9]+")
+
+# Applicant tracking systems and where their hosts name the company: the
+# first path segment (boards.greenhouse.io/wiz) or subdomain
+# (wiz.wd5.myworkdayjobs.com)
+_ATS_COMPANY_LOCATIONS = {
+    "greenhouse.io": "path",
+    "lever.co": "path",
+    "myworkdayjobs.com": "subdomain",
+}
+
+
+def _compact(text: str) -> str:
+    """Lowercase a name and drop everything but letters and digits."""
+    return _non_alphanumeric_pattern.sub("", text.lower())
+
+
+def match_careers_url(company_name: str, urls: List[str]) -> Optional[str]:
+    """
+    Pick the top search result if it is obviously the company's careers site.
+
+    The top URL must be on a careers host named after the company: a host
+    label of ``careers.X`` or ``jobs.X``, the board of a Greenhouse or Lever
+    URL (its first path segment), or the subdomain of a Workday board. The
+    rest of the path is never matched, so a job board listing the company
+    (``jobs.example.com/jobs/wiz``) is left to the LLM domain selector.
+
+    Args:
+        company_name (str): Name of the company
+        urls (List[str]): Search results, best first
+
+    Returns:
+        Optional[str]: The top URL, or None if the LLM should decide
+    """
+    compact_name = _compact(company_name)
+    if not urls or not compact_name:
+        return None
+    url = urls[0]
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    labels = host.split(".")
+
+    for ats_host, location in _ATS_COMPANY_LOCATIONS.items():
+        if host == ats_host or host.endswith("." + ats_host):
+            if location == "path":
+                segments = [s for s in parsed.path.split("/") if s]
+                candidates = segments[:1]
+            else:
+                candidates = labels[:1]
+            if any(_compact(candidate) == compact_name for candidate in candidates):
+                return url
+            return None
+
+    if not _careers_host_pattern.search(host):
+        return None
+    # Every label but the careers label and the top-level domain
+    if any(_compact(label) == compact_name for label in labels[1:-1]):
+        return url
+    return None
+
+
+class DomainCache:
+    """
+    SQLite cache of each company's domain search result.
+
+    Successful lookups are kept for ``ttl_days``. Failed lookups are cached
+    too, for a shorter ``negative_ttl_hours``, so companies without a careers
+    site are not searched again on every run.
+    """
+
+    def __init__(
+        self,
+        path: str = DOMAIN_CACHE_PATH,
+        ttl_days: float = DOMAIN_CACHE_TTL_DAYS,
+        negative_ttl_hours: float = DOMAIN_CACHE_NEGATIVE_TTL_HOURS,
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path (str): Path of the SQLite file
+            ttl_days (float): Successful lookups older than this are misses
+            negative_ttl_hours (float): Failed lookups older than this are misses
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.negative_ttl_seconds = negative_ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS domains (
+                company_name TEXT PRIMARY KEY,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL
+            )
+            """)
+
+    def get(
+        self, company_name: str
+    ) -> Tuple[Optional[DomainSearchResult], Optional[str]]:
+        """
+        Look up the cached domain search of a company.
+
+        Args:
+            company_name (str): Name of the company
+
+        Returns:
+            Tuple[Optional[DomainSearchResult], Optional[str]]: The cached result,
+                or the cached error of a failed lookup; both None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, error, created_at FROM domains WHERE company_name = ?",
+                (normalize_company_name(company_name),),
+            ).fetchone()
+            if row is not None:
+                result, error, created_at = row
+                ttl = self.ttl_seconds if result else self.negative_ttl_seconds
+                if created_at >= now - ttl:
+                    self.hits += 1
+                    if result:
+                        return DomainSearchResult.model_validate_json(result), None
+                    return None, error
+            self.misses += 1
+        return None, None
+
+    def set_result(self, company_name: str, result: DomainSearchResult) -> None:
+        """
+        Store a successful domain search.
+
+        Args:
+            company_name (str): Name of the company
+            result (DomainSearchResult): Result of the domain search
+        """
+        self._set(company_name, result.model_dump_json(), None)
+
+    def set_error(self, company_name: str, error: str) -> None:
+        """
+        Store a failed domain search.
+
+        Args:
+            company_name (str): Name of the company
+            error (str): Error the lookup failed with
+        """
+        self._set(company_name, None, error)
+
+    def _set(
+        self, company_name: str, result: Optional[str], error: Optional[str]
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO domains VALUES (?, ?, ?, ?)",
+                (
+                    normalize_company_name(company_name),
+                    result,
+                    error,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache hits and misses.
+
+        Returns:
+            Dict[str, Any]: Cache counters for the process
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Process-wide cache shared by every domain search in the process
+_domain_cache: Optional[DomainCache] = None
+_domain_cache_lock = threading.Lock()
+
+
+def get_domain_cache() -> Optional[DomainCache]:
+    """Get the shared domain cache, or None if caching is disabled."""
+    global _domain_cache
+    if not DOMAIN_CACHE_ENABLED:
+        return None
+    with _domain_cache_lock:
+        if _domain_cache is None:
+            _domain_cache = DomainCache()
+        return _domain_cache
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+# Process-wide event loop running in a background thread
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared background event loop, starting it on first use.
+
+    Async clients with pooled connections (see ``src.utils.transport``) are
+    bound to the loop they are used in, so every async LLM call in the process
+    runs on this one loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="shared-event-loop", daemon=True
+            )
+            thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the shared event loop and block until it completes.
+
+    Unlike ``asyncio.run`` this does not create a new loop per call, and it also
+    works when the caller is already inside a running loop (e.g. notebooks).
+
+    Args:
+        coro (Coroutine): Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    loop = get_event_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        raise RuntimeError("run_sync cannot be called from the shared event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def run_on_shared_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Await a coroutine on the shared event loop from any event loop.
+
+    Lets callers on their own loop (``agent.ainvoke`` in a notebook or an
+    async server) use the pooled async clients, which are bound to the shared
+    loop. Cancelling the caller cancels the coroutine.
+
+    Args:
+        coro (Coroutine): Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    loop = get_event_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
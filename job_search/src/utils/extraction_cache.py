@@ -0,0 +1,223 @@
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from src.models.schema import JobPosting
+from src.utils.config import (
+    EXTRACTION_CACHE_ENABLED,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_PATH,
+    EXTRACTION_CACHE_TTL_DAYS,
+)
+
+# Evict expired and excess entries after this many writes
+EVICTION_INTERVAL = 500
+
+# Write the access times of cache hits after this many hits
+ACCESS_FLUSH_INTERVAL = 500
+
+_whitespace_pattern = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """Collapse whitespace so formatting-only changes still hit the cache."""
+    return _whitespace_pattern.sub(" ", content).strip()
+
+
+class ExtractionCache:
+    """
+    Content-addressed SQLite cache of parsed job postings.
+
+    Entries are keyed by a hash of the prompt version, model, URL and
+    normalized page content, so any change to one of them is a miss.
+
+    Lookups only read. The access times used for LRU eviction are kept in
+    memory and written in one transaction with the next write, eviction or
+    ``flush``, so a hit costs no commit. The methods block on SQLite; call
+    them from an event loop with ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        path: str = EXTRACTION_CACHE_PATH,
+        ttl_days: float = EXTRACTION_CACHE_TTL_DAYS,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Open (or create) the cache file and evict stale entries.
+
+        Args:
+            path (str): Path of the SQLite file
+            ttl_days (float): Entries older than this are treated as misses
+            max_entries (int): Least recently used entries beyond this are evicted
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._accessed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                job_posting TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS extractions_accessed_at "
+            "ON extractions (accessed_at)"
+        )
+        self.evict()
+
+    @staticmethod
+    def make_key(prompt_version: str, model: str, url: str, content: str) -> str:
+        """
+        Build the cache key of one extraction.
+
+        Args:
+            prompt_version (str): Version of the extraction prompt
+            model (str): Model used for the extraction
+            url (str): URL of the page
+            content (str): Raw content of the page
+
+        Returns:
+            str: Hex digest identifying the extraction
+        """
+        digest = hashlib.sha256()
+        for part in (prompt_version, model, url, normalize_content(content)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str, model: Type[BaseModel] = JobPosting) -> Optional[BaseModel]:
+        """
+        Look up a cached extraction.
+
+        Args:
+            key (str): Cache key from ``make_key``
+            model (Type[BaseModel]): Schema the extraction was stored with
+
+        Returns:
+            Optional[BaseModel]: The cached extraction, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_posting FROM extractions WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._accessed_at[key] = now
+            self.hits += 1
+            flush = len(self._accessed_at) >= ACCESS_FLUSH_INTERVAL
+        if flush:
+            self.flush()
+        return model.model_validate_json(row[0])
+
+    def set(self, key: str, job_posting: BaseModel) -> None:
+        """
+        Store an extraction, evicting stale entries periodically.
+
+        Args:
+            key (str): Cache key from ``make_key``
+            job_posting (BaseModel): Parsed job posting (or posting list) to store
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                (key, job_posting.model_dump_json(), now, now),
+            )
+            self._accessed_at.pop(key, None)
+            self._write_access_times()
+            self._conn.commit()
+            self._writes += 1
+            evict = self._writes % EVICTION_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    def flush(self) -> None:
+        """Write the access times of the hits since the last write."""
+        with self._lock:
+            if self._accessed_at:
+                self._write_access_times()
+                self._conn.commit()
+
+    def _write_access_times(self) -> None:
+        """Update the pending access times (the caller holds the lock and commits)."""
+        self._conn.executemany(
+            "UPDATE extractions SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._accessed_at.items()],
+        )
+        self._accessed_at.clear()
+
+    def evict(self) -> None:
+        """Delete expired entries and the least recently used excess entries."""
+        with self._lock:
+            self._write_access_times()
+            self._conn.execute(
+                "DELETE FROM extractions WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM extractions WHERE key IN (
+                    SELECT key FROM extractions
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache hits, misses, hit rate and size.
+
+        Returns:
+            Dict[str, Any]: Cache counters for the process
+        """
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM extractions"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+# Process-wide cache shared by every extraction in the process
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the shared extraction cache, or None if caching is disabled."""
+    global _extraction_cache
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+            # Keep the recency of the hits for the next run's eviction
+            atexit.register(_extraction_cache.flush)
+        return _extraction_cache
@@ -0,0 +1,111 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List
+
+# Skip separators between array items
+_separator_pattern = re.compile(r"[\s,]*")
+
+
+class JsonArrayParser:
+    """
+    Incremental parser of a top-level JSON array in a response body.
+
+    Each item is decoded as soon as it is complete, so consumers can start
+    working on the first items while the rest of the response is still being
+    received, and the full document is never held in memory at once.
+    """
+
+    def __init__(self, key: str):
+        """
+        Create a parser.
+
+        Args:
+            key (str): Key of the array to stream, e.g. ``"results"``
+        """
+        self.key = key
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buffer = ""
+        self._in_array = False
+        # Buffer length at the last failed decode; retry only once more data arrived
+        self._pending_length = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the body.
+
+        Args:
+            chunk (bytes): Raw response body chunk
+
+        Returns:
+            List[Any]: Array items completed by the chunk, in order
+        """
+        items = []
+        if self.done:
+            return items
+        self._buffer += self._utf8_decoder.decode(chunk)
+
+        if not self._in_array:
+            match = self._array_start.search(self._buffer)
+            if not match:
+                return items
+            self._buffer = self._buffer[match.end() :]
+            self._in_array = True
+
+        if len(self._buffer) <= self._pending_length:
+            return items
+
+        position = 0
+        while True:
+            position = _separator_pattern.match(self._buffer, position).end()
+            if position >= len(self._buffer):
+                break
+            if self._buffer[position] == "]":
+                self.done = True
+                self._buffer = ""
+                return items
+            try:
+                item, position = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                # The item is not complete yet
+                break
+            items.append(item)
+
+        self._buffer = self._buffer[position:]
+        self._pending_length = len(self._buffer)
+        return items
+
+    def close(self) -> None:
+        """
+        Check that the body did not end inside the array.
+
+        Raises:
+            ValueError: If the array was not closed
+        """
+        if self._in_array and not self.done:
+            raise ValueError(f'Truncated JSON array "{self.key}" in response')
+
+
+async def aiter_json_array_items(
+    chunks: AsyncIterable[bytes], key: str
+) -> AsyncIterator[Any]:
+    """
+    Incrementally yield the items of a top-level JSON array from an async body.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Raw response body chunks
+        key (str): Key of the array to stream, e.g. ``"results"``
+
+    Yields:
+        Any: Decoded array items, in order
+    """
+    parser = JsonArrayParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.done:
+            return
+    parser.close()
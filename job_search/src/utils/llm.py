@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from langchain_openai import ChatOpenAI
+
+from src.utils.config import (
+    DEFAULT_MODEL,
+    DEFAULT_PROVIDER,
+    DEFAULT_TEMPERATURE,
+    LLM_REQUEST_TIMEOUT,
+    OPENAI_API_KEY,
+)
+from src.utils.metrics import LLMMetricsCallbackHandler
+from src.utils.transport import get_transport
+
+# Process-wide LLM clients keyed by (provider, model, temperature, max_retries)
+_llm_registry: Dict[Tuple[str, str, float, int], ChatOpenAI] = {}
+_llm_registry_lock = threading.Lock()
+_llm_registry_stats = {"constructions": 0, "hits": 0, "construction_seconds": 0.0}
+
+# Records latency and token usage of every call made by the shared clients
+_llm_metrics_handler = LLMMetricsCallbackHandler()
+
+
+def get_llm(
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = DEFAULT_TEMPERATURE,
+    provider: str = DEFAULT_PROVIDER,
+    max_retries: int = 2,
+) -> ChatOpenAI:
+    """
+    Get a shared LLM client with the specified parameters.
+
+    Clients are constructed once per (provider, model, temperature, max_retries)
+    and reused for the life of the process. Async calls share the HTTP
+    transport's LLM connection pool, which is separate from the pools of Tavily
+    requests, so they must run on the shared event loop (see
+    ``src.utils.event_loop``).
+
+    Args:
+        model_name (str): Model to use
+        temperature (float): Sampling temperature
+        provider (str): Model provider (only "openai" is supported)
+        max_retries (int): Retries done by the client itself; pass 0 when the
+            caller handles retries
+
+    Returns:
+        ChatOpenAI: The shared LLM client
+    """
+    if provider != "openai":
+        raise ValueError(f"Unsupported provider: {provider}. Use 'openai'")
+
+    key = (provider, model_name, temperature, max_retries)
+    with _llm_registry_lock:
+        if key in _llm_registry:
+            _llm_registry_stats["hits"] += 1
+            return _llm_registry[key]
+
+        start = time.perf_counter()
+        llm = ChatOpenAI(
+            model=model_name,
+            temperature=temperature,
+            api_key=OPENAI_API_KEY,
+            request_timeout=LLM_REQUEST_TIMEOUT,
+            streaming=False,
+            max_retries=max_retries,
+            http_async_client=get_transport().async_client(),
+            callbacks=[_llm_metrics_handler],
+        )
+        _llm_registry_stats["constructions"] += 1
+        _llm_registry_stats["construction_seconds"] += time.perf_counter() - start
+        _llm_registry[key] = llm
+        return llm
+
+
+def get_llm_stats() -> Dict[str, Any]:
+    """
+    Report LLM client reuse and connection reuse for the process.
+
+    Returns:
+        Dict[str, Any]: Client constructions, registry hits, time spent
+            constructing clients and the transport's connection counters
+    """
+    with _llm_registry_lock:
+        stats = dict(_llm_registry_stats)
+    stats["construction_seconds"] = round(stats["construction_seconds"], 4)
+    stats.update(get_transport().connection_stats())
+    return stats
@@ -0,0 +1,355 @@
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.utils.config import METRICS_HOST, METRICS_MAX_SAMPLES
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Metrics")
+
+# Quantiles reported by summaries, --profile and the Prometheus endpoint
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Prefix of the metric names on the Prometheus endpoint
+PROMETHEUS_PREFIX = "job_search_"
+
+# A metric name and its sorted label pairs
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _Series:
+    """Count, sum and a bounded reservoir of samples of one metric series."""
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total = 0.0
+        self.samples: List[float] = []
+        self.max_samples = max_samples
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample in bounded memory
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = value
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRecorder:
+    """
+    Thread-safe recorder of timings, sizes and counts.
+
+    Observations (latencies, token counts) keep a bounded sample for
+    percentiles; counters (bytes received) keep a running total. Every
+    observation can also be appended to a JSONL file as it is recorded.
+    """
+
+    def __init__(self, max_samples: int = METRICS_MAX_SAMPLES):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            max_samples (int): Samples kept per series for percentiles
+        """
+        self.max_samples = max_samples
+        self._observations: Dict[SeriesKey, _Series] = {}
+        self._counters: Dict[SeriesKey, float] = {}
+        self._lock = threading.Lock()
+        self._jsonl = None
+
+    def open_jsonl(self, path: str) -> None:
+        """
+        Append every observation and counter increment to a JSONL file.
+
+        Args:
+            path (str): Path of the JSONL file
+        """
+        with self._lock:
+            self._jsonl = open(path, "a", buffering=1)
+
+    def _write(self, kind: str, name: str, value: float, labels: Dict[str, str]):
+        if self._jsonl is not None:
+            self._jsonl.write(
+                json.dumps(
+                    {
+                        "ts": time.time(),
+                        "type": kind,
+                        "metric": name,
+                        "value": value,
+                        "labels": labels,
+                    }
+                )
+                + "\n"
+            )
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Record one observation, e.g. a latency in seconds or a token count.
+
+        Args:
+            name (str): Metric name
+            value (float): Observed value
+            **labels (str): Labels of the series, e.g. ``node="web crawl"``
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self._observations:
+                self._observations[key] = _Series(self.max_samples)
+            self._observations[key].add(value)
+            self._write("observation", name, value, labels)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Add to a counter, e.g. bytes received.
+
+        Args:
+            name (str): Metric name
+            value (float): Amount to add
+            **labels (str): Labels of the series
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._write("counter", name, value, labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the wall time of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize every series.
+
+        Returns:
+            Dict[str, Any]: ``observations`` as rows with count, sum and
+                p50/p95/p99 per series, and ``counters`` as rows with totals
+        """
+        with self._lock:
+            observations = [
+                {
+                    "metric": name,
+                    "labels": dict(labels),
+                    "count": series.count,
+                    "sum": series.total,
+                    **{f"p{int(q * 100)}": series.quantile(q) for q in QUANTILES},
+                }
+                for (name, labels), series in sorted(self._observations.items())
+            ]
+            counters = [
+                {"metric": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {"observations": observations, "counters": counters}
+
+    def prometheus_text(self) -> str:
+        """
+        Render every series in the Prometheus text exposition format.
+
+        Observations are exposed as summaries with p50/p95/p99 quantiles.
+
+        Returns:
+            str: Metrics page
+        """
+
+        def format_labels(labels: Dict[str, str], **extra: str) -> str:
+            pairs = {**labels, **extra}
+            if not pairs:
+                return ""
+            return (
+                "{"
+                + ",".join(
+                    f'{k}="{str(v).replace(chr(34), chr(39))}"'
+                    for k, v in pairs.items()
+                )
+                + "}"
+            )
+
+        summary = self.summary()
+        lines = []
+        typed = set()
+        for row in summary["observations"]:
+            name = PROMETHEUS_PREFIX + row["metric"]
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            for q in QUANTILES:
+                labels = format_labels(row["labels"], quantile=str(q))
+                lines.append(f"{name}{labels} {row[f'p{int(q * 100)}']}")
+            lines.append(f"{name}_sum{format_labels(row['labels'])} {row['sum']}")
+            lines.append(f"{name}_count{format_labels(row['labels'])} {row['count']}")
+        for row in summary["counters"]:
+            name = PROMETHEUS_PREFIX + row["metric"] + "_total"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{format_labels(row['labels'])} {row['value']}")
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(
+        self, port: int, host: str = METRICS_HOST
+    ) -> ThreadingHTTPServer:
+        """
+        Serve the Prometheus text page on ``/metrics`` from a daemon thread.
+
+        Args:
+            port (int): Port to listen on (0 picks a free port)
+            host (str): Interface to bind; the default only accepts local
+                connections, ``0.0.0.0`` exposes the metrics to the network
+
+        Returns:
+            ThreadingHTTPServer: The running server
+        """
+        recorder = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = recorder.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(
+            f"Serving metrics on {server.server_address[0]}:{server.server_address[1]}"
+        )
+        return server
+
+    def format_profile(self) -> str:
+        """
+        Format a p50/p95/p99 breakdown of every series for ``--profile``.
+
+        Returns:
+            str: Table of timings and token counts, then counter totals
+        """
+        summary = self.summary()
+        lines = [
+            f"{'Metric':<34}{'Labels':<34}{'Count':>7}"
+            f"{'p50':>10}{'p95':>10}{'p99':>10}{'Total':>12}"
+        ]
+        for row in summary["observations"]:
+            labels = ",".join(f"{k}={v}" for k, v in row["labels"].items())
+            lines.append(
+                f"{row['metric']:<34}{labels[:33]:<34}{row['count']:>7}"
+                f"{row['p50']:>10.3f}{row['p95']:>10.3f}{row['p99']:>10.3f}"
+                f"{row['sum']:>12.2f}"
+            )
+        for row in summary["counters"]:
+            labels = ",".join(f"{k}={v}" for k, v in row["labels"].items())
+            lines.append(f"{row['metric']:<34}{labels[:33]:<34}{row['value']:>7,.0f}")
+        return "\n".join(lines)
+
+
+# Process-wide recorder shared by every instrumented component
+_metrics = MetricsRecorder()
+
+
+def get_metrics() -> MetricsRecorder:
+    """Get the shared metrics recorder."""
+    return _metrics
+
+
+def instrumented(node: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a graph node so its wall time is recorded as ``node_seconds``.
+
+    Args:
+        node (str): Name of the node in the graph
+        func (Callable[..., Any]): The node function, or a coroutine function
+            for async nodes
+
+    Returns:
+        Callable[..., Any]: The timed node function
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(state: Any) -> Any:
+            with get_metrics().timer("node_seconds", node=node):
+                return await func(state)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state: Any) -> Any:
+        with get_metrics().timer("node_seconds", node=node):
+            return func(state)
+
+    return wrapper
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """Record the latency and prompt/completion tokens of every LLM call."""
+
+    def __init__(self):
+        self._start_times: Dict[UUID, float] = {}
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs
+    ) -> None:
+        self._start_times[run_id] = time.perf_counter()
+
+    def on_llm_start(
+        self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs
+    ) -> None:
+        self._start_times[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        metrics = get_metrics()
+        start = self._start_times.pop(run_id, None)
+        if start is not None:
+            metrics.observe("llm_call_seconds", time.perf_counter() - start)
+
+        usage: Optional[Dict[str, Any]] = None
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None and message.usage_metadata:
+                    usage = {
+                        "prompt_tokens": message.usage_metadata["input_tokens"],
+                        "completion_tokens": message.usage_metadata["output_tokens"],
+                    }
+        if usage is None and response.llm_output:
+            usage = response.llm_output.get("token_usage")
+        if usage:
+            metrics.observe("llm_prompt_tokens", usage.get("prompt_tokens") or 0)
+            metrics.observe(
+                "llm_completion_tokens", usage.get("completion_tokens") or 0
+            )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._start_times.pop(run_id, None)
+        get_metrics().increment("llm_errors", error=type(error).__name__)
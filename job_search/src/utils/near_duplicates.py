@@ -0,0 +1,179 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from src.utils.config import PAGE_DEDUP_IGNORED_PARAMS, PAGE_DEDUP_MIN_SIMILARITY
+from src.utils.crawl_profiles import JOB_URL_SCORE
+from src.utils.page_classifier import url_score
+
+# Words per shingle of the page content
+SHINGLE_SIZE = 3
+
+# MinHash signature length, split into LSH bands of equal rows. Pages with a
+# shingle similarity of 0.9 share a band with probability 0.99, pages at 0.5
+# with probability 0.03, so few candidates need checking
+MINHASH_BANDS = 8
+MINHASH_ROWS = 8
+
+_SIGNATURE_SIZE = MINHASH_BANDS * MINHASH_ROWS
+_MASK = (1 << 64) - 1
+_EMPTY_BIN = 1 << 64
+_word_pattern = re.compile(r"\w+")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to the form shared by every variant of the same page.
+
+    The scheme, ``www.`` prefix, fragment and trailing slash are dropped, and
+    so are tracking and locale query parameters (``PAGE_DEDUP_IGNORED_PARAMS``
+    and ``utm_*``). The remaining parameters are sorted.
+
+    Args:
+        url (str): Crawled URL
+
+    Returns:
+        str: Canonical form of the URL
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower().removeprefix("www.")
+    path = parsed.path.rstrip("/")
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if name.lower() not in PAGE_DEDUP_IGNORED_PARAMS
+        and not name.lower().startswith("utm_")
+    )
+    return host + path + (f"?{urlencode(query)}" if query else "")
+
+
+def minhash_signature(content: str) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a page's word shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once, its hash picks
+    one of the signature's bins, and each bin keeps its minimum. Empty bins
+    (short pages) borrow the value of the next filled bin. Shingles are hashed
+    with the built-in hash, so signatures are only comparable within one
+    process.
+
+    Args:
+        content (str): Page body
+
+    Returns:
+        Tuple[int, ...]: ``MINHASH_BANDS * MINHASH_ROWS`` minimum hashes
+    """
+    words = _word_pattern.findall(content.lower())
+    shingles = {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    }
+    signature = [_EMPTY_BIN] * _SIGNATURE_SIZE
+    for shingle in shingles:
+        value = hash(shingle) & _MASK
+        index = value % _SIGNATURE_SIZE
+        if value < signature[index]:
+            signature[index] = value
+
+    # Densify, walking backwards twice so every empty bin sees a filled one
+    filled = None
+    for index in [*reversed(range(_SIGNATURE_SIZE))] * 2:
+        if signature[index] < _EMPTY_BIN:
+            filled = signature[index]
+        elif filled is not None:
+            signature[index] = filled | _EMPTY_BIN
+    return tuple(signature)
+
+
+def similarity(signature: Tuple[int, ...], other: Tuple[int, ...]) -> float:
+    """Estimate the shingle Jaccard similarity of two pages from their signatures."""
+    return sum(a == b for a, b in zip(signature, other)) / len(signature)
+
+
+class DuplicateIndex:
+    """
+    Index of crawled pages that finds duplicates of each page as it is added.
+
+    Pages are duplicates if their canonical URLs are equal (tracking or
+    locale parameters, trailing slashes), their bodies are identical, or
+    their bodies are near-duplicates (mirrored ATS pages). Near-duplicates
+    are found with MinHash signatures and locality-sensitive hashing: only
+    pages sharing a band of their signature are compared, so adding a page
+    takes roughly constant time however many pages were added before.
+
+    Near-duplicate posting URLs on the same host are kept, since sites that
+    render every posting from one template (e.g. the same role in several
+    cities) have distinct postings with nearly identical bodies.
+    """
+
+    def __init__(self, min_similarity: float = PAGE_DEDUP_MIN_SIMILARITY):
+        """
+        Create an empty index.
+
+        Args:
+            min_similarity (float): Estimated shingle similarity above which
+                two bodies are duplicates
+        """
+        self.min_similarity = min_similarity
+        self._urls: Dict[str, str] = {}
+        self._bodies: Dict[bytes, str] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._hosts: Dict[str, str] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+
+    def add(self, url: str, content: Optional[str]) -> Optional[str]:
+        """
+        Add a page, unless it duplicates a page already in the index.
+
+        Args:
+            url (str): URL of the page
+            content (Optional[str]): Page body
+
+        Returns:
+            Optional[str]: URL of the page it duplicates, or None if the page
+                was added
+        """
+        canonical_url = canonicalize_url(url)
+        if canonical_url in self._urls:
+            return self._urls[canonical_url]
+        if not content:
+            self._urls[canonical_url] = url
+            return None
+
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        if digest in self._bodies:
+            return self._bodies[digest]
+
+        signature = minhash_signature(content)
+        bands = [
+            (band, signature[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS])
+            for band in range(MINHASH_BANDS)
+        ]
+        host = canonical_url.split("/", 1)[0]
+        is_posting_url = url_score(url) >= JOB_URL_SCORE
+        candidates = {
+            candidate for key in bands for candidate in self._buckets.get(key, ())
+        }
+        best, best_similarity = None, self.min_similarity
+        for candidate in candidates:
+            if (
+                is_posting_url
+                and self._hosts[candidate] == host
+                and url_score(candidate) >= JOB_URL_SCORE
+            ):
+                continue
+            candidate_similarity = similarity(signature, self._signatures[candidate])
+            if candidate_similarity >= best_similarity:
+                best, best_similarity = candidate, candidate_similarity
+        if best is not None:
+            return best
+
+        self._urls[canonical_url] = url
+        self._bodies[digest] = url
+        self._signatures[url] = signature
+        self._hosts[url] = host
+        for key in bands:
+            self._buckets[key].append(url)
+        return None
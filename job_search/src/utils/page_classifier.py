@@ -0,0 +1,189 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+# URL patterns of job posting pages and their weight in the URL score
+JOB_URL_PATTERNS = [
+    (re.compile(r"/(job|jobs|position|positions|opening|openings|vacancy)/[^/?#]+"), 2.5),
+    (re.compile(r"[?&](gh_jid|jobid|job_id|jid|req|requisition)="), 2.5),
+    (re.compile(r"(boards\.greenhouse\.io|jobs\.lever\.co|myworkdayjobs\.com|jobs\.ashbyhq\.com|smartrecruiters\.com|workable\.com)/."), 2.5),
+    (re.compile(r"/(careers?|jobs)/[^/?#]+"), 1.0),
+    (re.compile(r"/apply\b"), 1.0),
+]
+
+# URL patterns of pages that are never job postings
+NON_JOB_URL_PATTERNS = [
+    (re.compile(r"/(privacy|cookies?|terms|legal|gdpr|accessibility|security)(-|/|$|\?)"), -3.0),
+    (re.compile(r"/(blog|news|press|events|webinars?|podcast|resources)(/|$|\?)"), -2.0),
+    (re.compile(r"/(about|contact|login|signin|signup|investors|customers|pricing)(/|$|\?)"), -1.5),
+    (re.compile(r"/(culture|life|benefits|teams?|locations|students|university)(/|$|\?)"), -1.0),
+]
+
+# Listing pages hold the postings extracted in multi mode, so team and
+# location listings are not penalized and careers index pages count as jobs
+MULTI_JOB_URL_PATTERNS = JOB_URL_PATTERNS + [
+    (re.compile(r"/(careers?|jobs|openings|positions|teams?|locations)(/|$|\?)"), 1.0),
+]
+MULTI_NON_JOB_URL_PATTERNS = NON_JOB_URL_PATTERNS[:-1] + [
+    (re.compile(r"/(culture|life|benefits|students|university)(/|$|\?)"), -1.0),
+]
+
+# Keyword weights, roughly inverse document frequency of each term in job
+# postings (positive) versus other career-site pages (negative)
+KEYWORD_WEIGHTS: Dict[str, float] = {
+    "responsibilities": 2.0,
+    "requirements": 1.5,
+    "qualifications": 2.0,
+    "preferred qualifications": 2.0,
+    "minimum qualifications": 2.0,
+    "years of experience": 2.0,
+    "what you'll do": 2.0,
+    "what you will do": 2.0,
+    "about the role": 2.0,
+    "about the job": 2.0,
+    "you will": 0.5,
+    "apply now": 1.5,
+    "apply for this job": 2.0,
+    "submit application": 1.5,
+    "full-time": 1.5,
+    "full time": 1.0,
+    "part-time": 1.0,
+    "hybrid": 0.8,
+    "remote": 0.5,
+    "salary": 1.0,
+    "compensation": 1.0,
+    "equal opportunity employer": 1.0,
+    "job description": 1.5,
+    "job id": 1.5,
+    "reports to": 1.0,
+    "privacy policy": -1.0,
+    "personal data": -2.0,
+    "cookies": -1.5,
+    "cookie policy": -2.0,
+    "data controller": -2.5,
+    "terms of service": -1.5,
+    "read more": -0.5,
+    "posted by": -1.5,
+    "minute read": -2.0,
+    "subscribe": -1.0,
+    "press release": -2.0,
+    "our values": -0.5,
+    "open positions": -1.0,
+    "view all jobs": -0.5,
+    "search jobs": -0.5,
+}
+
+# In multi mode the listing cues mark the pages to extract instead of
+# penalizing them
+MULTI_KEYWORD_WEIGHTS: Dict[str, float] = {
+    **KEYWORD_WEIGHTS,
+    "open positions": 1.5,
+    "view all jobs": 1.0,
+    "search jobs": 0.5,
+}
+
+# One alternation over every keyword, longest first, so a page is scanned once
+_keyword_pattern = re.compile(
+    r"\b("
+    + "|".join(
+        re.escape(keyword)
+        for keyword in sorted(KEYWORD_WEIGHTS, key=len, reverse=True)
+    )
+    + r")\b"
+)
+
+# Bias and scale of the logistic that maps the raw score to [0, 1]
+SCORE_BIAS = -1.5
+SCORE_SCALE = 0.8
+
+# Only the head of the page carries the posting; the rest is mostly footer
+MAX_SCORED_CHARS = 20_000
+
+
+def url_score(url: str, mode: str = "single") -> float:
+    """
+    Score a URL by matching job and non-job path patterns.
+
+    Args:
+        url (str): URL of the page
+        mode (str): Extraction mode, "single" or "multi" (listings are jobs)
+
+    Returns:
+        float: Sum of the weights of the matching patterns
+    """
+    url = url.lower()
+    multi = mode == "multi"
+    score = 0.0
+    for pattern, weight in MULTI_JOB_URL_PATTERNS if multi else JOB_URL_PATTERNS:
+        if pattern.search(url):
+            score += weight
+            break
+    for pattern, weight in (
+        MULTI_NON_JOB_URL_PATTERNS if multi else NON_JOB_URL_PATTERNS
+    ):
+        if pattern.search(url):
+            score += weight
+            break
+    return score
+
+
+def content_score(content: str, mode: str = "single") -> float:
+    """
+    Score page content by its weighted keyword frequencies.
+
+    Every keyword is counted in a single regex pass. Term frequencies are
+    dampened logarithmically and weighted by ``KEYWORD_WEIGHTS`` (or
+    ``MULTI_KEYWORD_WEIGHTS`` in multi mode), as in TF-IDF.
+
+    Args:
+        content (str): Raw content of the page
+        mode (str): Extraction mode, "single" or "multi" (listings are jobs)
+
+    Returns:
+        float: Weighted keyword score
+    """
+    weights = MULTI_KEYWORD_WEIGHTS if mode == "multi" else KEYWORD_WEIGHTS
+    counts = Counter(_keyword_pattern.findall(content[:MAX_SCORED_CHARS].lower()))
+    return sum(
+        (1 + math.log(count)) * weights[keyword]
+        for keyword, count in counts.items()
+    )
+
+
+def score_page(url: str, content: Optional[str], mode: str = "single") -> float:
+    """
+    Estimate how likely a page is to hold job postings.
+
+    Args:
+        url (str): URL of the page
+        content (Optional[str]): Raw content of the page
+        mode (str): Extraction mode, "single" (one posting per page) or
+            "multi" (listing pages with several postings are kept too)
+
+    Returns:
+        float: Probability-like score in [0, 1]
+    """
+    raw_score = SCORE_BIAS + url_score(url, mode)
+    if content:
+        raw_score += content_score(content, mode)
+    return 1 / (1 + math.exp(-SCORE_SCALE * raw_score))
+
+
+def classify_page(
+    url: str, content: Optional[str], min_score: float, mode: str = "single"
+) -> Tuple[bool, float]:
+    """
+    Decide whether a page should be sent to the LLM extractor.
+
+    Args:
+        url (str): URL of the page
+        content (Optional[str]): Raw content of the page
+        min_score (float): Pages scoring below this are dropped
+        mode (str): Extraction mode, "single" or "multi" (see ``score_page``)
+
+    Returns:
+        Tuple[bool, float]: Whether the page is kept, and its score
+    """
+    score = score_page(url, content, mode)
+    return score >= min_score, score
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from src.utils.config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text from its size.
+
+    Uses the common rule of thumb of ~4 characters per token, which is close
+    enough for budgeting against a tokens-per-minute quota.
+    """
+    return len(text) // 4 + 1
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket scheduler that enforces both requests-per-minute and
+    tokens-per-minute quotas.
+
+    State is guarded by a thread lock and waiting is done with
+    ``asyncio.sleep``, so one limiter can be shared by every event loop and
+    thread in the process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+    ):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            requests_per_minute (int): Maximum requests per minute
+            tokens_per_minute (int): Maximum tokens per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_level = float(requests_per_minute)
+        self._token_level = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Refill both buckets for the time elapsed since the last update."""
+        elapsed = now - self._updated
+        self._updated = now
+        self._request_level = min(
+            self.requests_per_minute,
+            self._request_level + elapsed * self.requests_per_minute / 60,
+        )
+        self._token_level = min(
+            self.tokens_per_minute,
+            self._token_level + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Reserve one request and ``tokens`` tokens if both are available.
+
+        Args:
+            tokens (int): Estimated tokens of the request
+
+        Returns:
+            float: 0 if reserved, otherwise seconds until enough capacity refills
+        """
+        # A request larger than the bucket could never be scheduled
+        tokens = min(tokens, self.tokens_per_minute)
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._request_level >= 1 and self._token_level >= tokens:
+                self._request_level -= 1
+                self._token_level -= tokens
+                return 0.0
+
+            request_wait = (
+                max(0.0, 1 - self._request_level) * 60 / self.requests_per_minute
+            )
+            token_wait = (
+                max(0.0, tokens - self._token_level) * 60 / self.tokens_per_minute
+            )
+            return max(request_wait, token_wait)
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until one request and ``tokens`` tokens are available.
+
+        Args:
+            tokens (int): Estimated tokens of the request
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+# Process-wide limiter shared by every extraction in the process
+_llm_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_llm_rate_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the shared LLM rate limiter, creating it on first use."""
+    global _llm_rate_limiter
+    with _llm_rate_limiter_lock:
+        if _llm_rate_limiter is None:
+            _llm_rate_limiter = TokenBucketRateLimiter()
+        return _llm_rate_limiter
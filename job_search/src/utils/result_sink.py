@@ -0,0 +1,379 @@
+import abc
+import functools
+import gzip
+import inspect
+import json
+import os
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from src.models.schema import AgentState, ExtractResult
+from src.utils.config import RESULT_SINK_BUFFER_BYTES, RESULT_SINK_BUFFER_ROWS
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library
+    orjson = None
+
+# Suffix of a sink's file until it is finalized
+PARTIAL_SUFFIX = ".partial"
+
+
+def dumps(row: Any, indent: bool = False) -> bytes:
+    """
+    Serialize a JSON-compatible value, with orjson if it is installed.
+
+    Args:
+        row (Any): Value to serialize
+        indent (bool): Indent nested values by two spaces
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(row, indent=2 if indent else None, ensure_ascii=False).encode()
+
+
+def write_json_file(path: str, value: Any) -> None:
+    """
+    Write an indented JSON document atomically.
+
+    The document is written next to ``path`` and renamed over it, so readers
+    never see a half-written file.
+
+    Args:
+        path (str): Path of the JSON file
+        value (Any): JSON-compatible value
+    """
+    partial_path = path + PARTIAL_SUFFIX
+    with open(partial_path, "wb") as f:
+        f.write(dumps(value, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial_path, path)
+
+
+class ResultSink(abc.ABC):
+    """
+    Buffered, append-only writer of result rows.
+
+    Rows are buffered up to ``buffer_rows`` rows or ``buffer_bytes`` bytes,
+    then appended to ``<path>.partial``, so memory stays bounded however many
+    rows are written. Closing the sink flushes it and renames the file to
+    ``path``. If the run fails, the rows flushed so far stay in the partial
+    file. Writes are thread-safe.
+
+    Subclasses implement the file format: ``_open``, ``_write_rows`` and
+    ``_close_file``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_rows: int = RESULT_SINK_BUFFER_ROWS,
+        buffer_bytes: int = RESULT_SINK_BUFFER_BYTES,
+    ):
+        """
+        Open the sink's partial file.
+
+        Args:
+            path (str): Path of the finalized file
+            buffer_rows (int): Rows buffered before they are written
+            buffer_bytes (int): Serialized bytes buffered before they are written
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.partial_path = path + PARTIAL_SUFFIX
+        self.buffer_rows = buffer_rows
+        self.buffer_bytes = buffer_bytes
+        self.rows_written = 0
+        self._buffer: List[Any] = []
+        self._buffered_bytes = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._open(self.partial_path)
+
+    @abc.abstractmethod
+    def _open(self, partial_path: str) -> None:
+        """Open the partial file for appending."""
+
+    def _encode(self, row: Dict[str, Any]) -> Any:
+        """Convert a row to its buffered form (row as is by default)."""
+        return row
+
+    def _size(self, item: Any) -> int:
+        """Size of a buffered row in bytes (unknown by default)."""
+        return 0
+
+    @abc.abstractmethod
+    def _write_rows(self, items: List[Any]) -> None:
+        """Append buffered rows to the partial file."""
+
+    @abc.abstractmethod
+    def _close_file(self) -> None:
+        """Flush and close the partial file."""
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Append a row to the sink.
+
+        Args:
+            row (Dict[str, Any]): JSON-compatible row
+        """
+        item = self._encode(row)
+        with self._lock:
+            self._buffer.append(item)
+            self._buffered_bytes += self._size(item)
+            if (
+                len(self._buffer) >= self.buffer_rows
+                or self._buffered_bytes >= self.buffer_bytes
+            ):
+                self._flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows to the partial file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+            self._buffered_bytes = 0
+
+    def close(self, finalize: bool = True) -> None:
+        """
+        Flush and close the sink.
+
+        Args:
+            finalize (bool): Rename the partial file to ``path``; if False it
+                is left in place, marking an incomplete run
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush()
+            self._close_file()
+        if finalize:
+            os.replace(self.partial_path, self.path)
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(finalize=exc_type is None)
+
+
+class JsonlSink(ResultSink):
+    """Sink writing one JSON object per line."""
+
+    def _open(self, partial_path: str) -> None:
+        self._file: IO[bytes] = open(partial_path, "wb")
+
+    def _encode(self, row: Dict[str, Any]) -> bytes:
+        return dumps(row) + b"\n"
+
+    def _size(self, item: bytes) -> int:
+        return len(item)
+
+    def _write_rows(self, items: List[bytes]) -> None:
+        self._file.write(b"".join(items))
+        self._file.flush()
+
+    def _close_file(self) -> None:
+        self._file.close()
+
+
+class GzipJsonlSink(JsonlSink):
+    """
+    Sink writing gzip-compressed JSON lines.
+
+    Every flush ends a deflate block, so a partial file left by a failed run
+    decompresses up to the last flushed row.
+    """
+
+    def _open(self, partial_path: str) -> None:
+        self._file = gzip.open(partial_path, "wb")
+
+
+def import_pyarrow() -> Any:
+    """Import pyarrow, which is only needed for Parquet output."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Writing Parquet requires pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow
+
+
+class ParquetSink(ResultSink):
+    """
+    Sink writing rows to a Parquet file, one row group per flush.
+
+    Requires ``pyarrow``. Rows must be flat records with the same fields
+    (e.g. job postings). The Parquet footer is only written on close, so a
+    failed run leaves an unreadable partial file.
+    """
+
+    def __init__(self, path: str, schema: Optional[Any] = None, **kwargs: Any):
+        """
+        Open the sink's partial file.
+
+        Args:
+            path (str): Path of the finalized file
+            schema (Optional[Any]): ``pyarrow.Schema`` of the rows (inferred
+                from the first flushed rows if not provided)
+            **kwargs (Any): Buffering options of ``ResultSink``
+        """
+        self.schema = schema
+        super().__init__(path, **kwargs)
+
+    def _open(self, partial_path: str) -> None:
+        import_pyarrow()
+        self._writer = None
+
+    def _write_rows(self, items: List[Dict[str, Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(items, schema=self.schema)
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = pq.ParquetWriter(self.partial_path, self.schema)
+        self._writer.write_table(table)
+
+    def _close_file(self) -> None:
+        if self._writer is None:
+            # No rows were written; still write a valid file with the schema
+            self._write_rows([])
+        self._writer.close()
+
+
+def open_result_sink(path: str, **kwargs: Any) -> ResultSink:
+    """
+    Open the sink matching a file's extension.
+
+    Args:
+        path (str): ``.jsonl``, ``.jsonl.gz`` or ``.parquet`` file
+        **kwargs (Any): Buffering options of ``ResultSink``
+
+    Returns:
+        ResultSink: The opened sink
+
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    if path.endswith(".parquet"):
+        return ParquetSink(path, **kwargs)
+    if path.endswith(".gz"):
+        return GzipJsonlSink(path, **kwargs)
+    if path.endswith(".jsonl"):
+        return JsonlSink(path, **kwargs)
+    raise ValueError(
+        f"Unsupported result file {path} (use .jsonl, .jsonl.gz or .parquet)"
+    )
+
+
+def posting_rows(
+    company_name: str, extract_result: Optional[ExtractResult]
+) -> List[Dict[str, Any]]:
+    """
+    Flatten a company's extracted job postings into sink rows.
+
+    Args:
+        company_name (str): Name of the company
+        extract_result (Optional[ExtractResult]): Result of the extraction
+
+    Returns:
+        List[Dict[str, Any]]: One row per job posting
+    """
+    if extract_result is None:
+        return []
+    return [
+        {"company_name": company_name, **job_posting.model_dump()}
+        for job_posting in extract_result.extracted_jobs
+    ]
+
+
+def open_postings_sink(path: str) -> ResultSink:
+    """
+    Open a sink for job posting rows (see ``posting_rows``).
+
+    Args:
+        path (str): ``.jsonl``, ``.jsonl.gz`` or ``.parquet`` file
+
+    Returns:
+        ResultSink: The opened sink
+    """
+    if not path.endswith(".parquet"):
+        return open_result_sink(path)
+    pa = import_pyarrow()
+
+    # Explicit types, so postings without benefits are not inferred as nulls
+    schema = pa.schema(
+        [(field, pa.string()) for field in ("company_name", "title", "location", "url")]
+        + [("benefits", pa.list_(pa.string()))]
+    )
+    return ParquetSink(path, schema=schema)
+
+
+# Process-wide sink receiving job postings as companies are extracted
+_postings_sink: Optional[ResultSink] = None
+
+
+def set_postings_sink(sink: Optional[ResultSink]) -> None:
+    """Send every extracted job posting in the process to ``sink``."""
+    global _postings_sink
+    _postings_sink = sink
+
+
+def get_postings_sink() -> Optional[ResultSink]:
+    """Get the sink receiving job postings, or None if postings are not written."""
+    return _postings_sink
+
+
+def with_postings_sink(
+    func: Callable[[AgentState], Dict[str, Any]],
+) -> Callable[[AgentState], Dict[str, Any]]:
+    """
+    Wrap an extraction node so its job postings are appended to the postings sink.
+
+    Postings are written when the node finishes, after multi-mode postings are
+    deduplicated, so each company's postings are on disk as soon as they are
+    final rather than when the whole run ends.
+
+    Args:
+        func (Callable[[AgentState], Dict[str, Any]]): The node function, or a
+            coroutine function for async nodes
+
+    Returns:
+        Callable[[AgentState], Dict[str, Any]]: The wrapped node function
+    """
+
+    def write_postings(state: AgentState, output: Dict[str, Any]) -> None:
+        sink = get_postings_sink()
+        if sink is not None:
+            for row in posting_rows(state.company_name, output.get("extract_result")):
+                sink.write(row)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(state: AgentState) -> Dict[str, Any]:
+            output = await func(state)
+            write_postings(state, output)
+            return output
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state: AgentState) -> Dict[str, Any]:
+        output = func(state)
+        write_postings(state, output)
+        return output
+
+    return wrapper
@@ -0,0 +1,254 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.utils.config import (
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_CONCURRENCY_PER_HOST,
+    HTTP_MAX_RETRIES,
+    HTTP_READ_TIMEOUT,
+    LLM_MAX_CONCURRENCY,
+    TAVILY_API_KEY,
+    TAVILY_API_URL,
+)
+from src.utils.metrics import get_metrics
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger("Transport")
+
+# Status codes that are worth retrying
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def jittered_backoff(
+    attempt: int,
+    base: float = HTTP_BACKOFF_BASE,
+    cap: float = HTTP_BACKOFF_MAX,
+    retry_after: Optional[str] = None,
+) -> float:
+    """
+    Compute the delay before retry number ``attempt`` (starting at 0).
+
+    Honors a numeric ``Retry-After`` value, otherwise uses exponential backoff
+    with full jitter.
+    """
+    if retry_after:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class HTTPTransport:
+    """
+    Pooled, keep-alive async HTTP transport with timeouts, retries and a
+    per-host connection cap.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_base: float = HTTP_BACKOFF_BASE,
+        backoff_max: float = HTTP_BACKOFF_MAX,
+        max_concurrency_per_host: int = HTTP_MAX_CONCURRENCY_PER_HOST,
+        llm_max_connections: int = LLM_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for a response
+            max_retries (int): Retries on 429/5xx and connection errors
+            backoff_base (float): Base delay in seconds for exponential backoff
+            backoff_max (float): Upper bound for a single backoff delay
+            max_concurrency_per_host (int): Concurrent in-flight requests per host
+            llm_max_connections (int): Connections of the async LLM client
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.llm_max_connections = llm_max_connections
+        self._lock = threading.Lock()
+
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # One async client per host, so each host has its own connection cap
+        self._async_request_clients: Dict[str, httpx.AsyncClient] = {}
+        self._async_requests = 0
+        self._async_connections = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Compute the delay before the next attempt."""
+        return jittered_backoff(
+            attempt, self.backoff_base, self.backoff_max, retry_after
+        )
+
+    async def arequest(
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request, retrying on connection errors, timeouts and 429/5xx.
+
+        Each host has its own connection pool of ``max_concurrency_per_host``
+        connections, separate from the LLM client's, so long streamed crawls
+        never hold the connections LLM calls or other hosts need. Must be
+        awaited on the shared event loop (see ``async_client``).
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            stream (bool): Return once the headers arrived; the caller reads
+                the body and must close the response
+            **kwargs: Extra arguments forwarded to ``httpx.AsyncClient.build_request``
+
+        Returns:
+            httpx.Response: The last response received
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._async_request_clients:
+                self._async_request_clients[host] = self._new_async_client(
+                    self.max_concurrency_per_host
+                )
+            client = self._async_request_clients[host]
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.send(
+                    client.build_request(method, url, **kwargs), stream=stream
+                )
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    return response
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, "
+                    f"retrying in {delay:.2f}s"
+                )
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request with the async client."""
+        return await self.arequest("POST", url, **kwargs)
+
+    async def _count_async_request(self, request: httpx.Request) -> None:
+        """Count a request and trace whether it opens a new connection."""
+        self._async_requests += 1
+        request.extensions["trace"] = self._trace_async_connection
+        request.extensions["start_time"] = time.perf_counter()
+
+    async def _time_async_response(self, response: httpx.Response) -> None:
+        """Record the time to response headers of an async request."""
+        request = response.request
+        get_metrics().observe(
+            "http_request_seconds",
+            time.perf_counter() - request.extensions["start_time"],
+            host=request.url.host,
+            path=request.url.path,
+        )
+
+    async def _trace_async_connection(self, event_name: str, info: Any) -> None:
+        """Count TCP connections opened by the async client."""
+        if event_name == "connection.connect_tcp.complete":
+            self._async_connections += 1
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared, pooled async client of the LLM calls.
+
+        It has the transport's timeouts and ``llm_max_connections`` connections,
+        in a pool of its own, so Tavily requests never take the connections
+        LLM calls need. Pooled connections are bound to the event loop they were opened in, so
+        the client must only be used on the shared loop of
+        ``src.utils.event_loop``.
+        """
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = self._new_async_client(self.llm_max_connections)
+            return self._async_client
+
+    def _new_async_client(self, max_connections: int) -> httpx.AsyncClient:
+        """Create a pooled async client with the transport's timeouts."""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            event_hooks={
+                "request": [self._count_async_request],
+                "response": [self._time_async_response],
+            },
+        )
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """
+        Report requests sent, connections opened and the connection reuse rate.
+
+        Returns:
+            Dict[str, Any]: Counters of the async clients
+        """
+        requests_sent = self._async_requests
+        connections_opened = self._async_connections
+        reuse_rate = 1 - connections_opened / requests_sent if requests_sent else 0.0
+        return {
+            "async_requests": self._async_requests,
+            "async_connections": self._async_connections,
+            "connection_reuse_rate": round(max(reuse_rate, 0.0), 3),
+        }
+
+
+# Process-wide transport shared by all agent nodes
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Get the shared HTTP transport, creating it on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+        return _transport
+
+
+async def atavily_post(
+    endpoint: str, payload: Dict[str, Any], **kwargs: Any
+) -> httpx.Response:
+    """
+    POST a payload to a Tavily API endpoint with the shared async client.
+
+    Args:
+        endpoint (str): API endpoint, e.g. ``"crawl"`` or ``"search"``
+        payload (Dict[str, Any]): JSON body of the request
+        **kwargs: Extra arguments forwarded to the transport (e.g. ``stream``)
+
+    Returns:
+        httpx.Response: The API response
+    """
+    return await get_transport().apost(
+        f"{TAVILY_API_URL}/{endpoint}",
+        headers={"Authorization": f"Bearer {TAVILY_API_KEY}"},
+        json=payload,
+        **kwargs,
+    )
@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+# Add the job_search directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.agent import save_results_to_file
+from src.models.schema import (
+    CrawlResult,
+    DomainSearchResult,
+    ExtractionStats,
+    ExtractResult,
+    JobPosting,
+)
+
+
+@pytest.fixture
+def result():
+    """Final state of a single-company run, as returned by the agent."""
+    url = "https://careers.acme.com/jobs/1"
+    return {
+        "company_name": "Acme",
+        "domain_search_result": DomainSearchResult(
+            query="Acme careers",
+            top_urls=["https://careers.acme.com"],
+            selected_domain="https://careers.acme.com",
+        ),
+        "crawl_result": CrawlResult(
+            domain="https://careers.acme.com",
+            links=[url],
+            raw_content={url: "Backend Engineer - Berlin - Full-time"},
+        ),
+        "extract_result": ExtractResult(
+            extracted_jobs=[
+                JobPosting(
+                    title="Backend Engineer",
+                    location="Berlin",
+                    url=url,
+                    benefits=["Remote days"],
+                )
+            ],
+            stats=ExtractionStats(succeeded=1, llm_calls=1),
+        ),
+        "error": None,
+    }
+
+
+def read_rows(path):
+    if path.endswith(".json"):
+        with open(path) as f:
+            return [json.load(f)]
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("extension", [".json", ".jsonl", ".jsonl.gz"])
+def test_save_results_to_file(tmp_path, result, extension):
+    path = str(tmp_path / f"results{extension}")
+    save_results_to_file(result, path)
+
+    assert not os.path.exists(path + ".partial")
+    (row,) = read_rows(path)
+    assert row["company_name"] == "Acme"
+    assert row["crawl_result"]["duplicate_links"] == {}
+    assert row["extract_result"]["extracted_jobs"][0]["title"] == "Backend Engineer"
+
+
+def test_save_results_to_parquet_is_rejected(tmp_path, result):
+    path = str(tmp_path / "results.parquet")
+    with pytest.raises(ValueError, match="parquet"):
+        save_results_to_file(result, path)
+    assert not os.path.exists(path)